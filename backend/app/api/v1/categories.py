@@ -1,9 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from typing import List
 from uuid import UUID
 from app.domain.finance.dto.category_dto import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.domain.finance.services.category_service import CategoryService
 from app.core.user_context import get_current_user_id
+from app.core.etag import make_etag, conditional_response
+from app.core.config import settings
+from app.core.serialization import rows_response
 
 router = APIRouter()
 category_service = CategoryService()
@@ -17,16 +20,27 @@ async def create_category(category_data: CategoryCreate):
 
 
 @router.get("", response_model=List[CategoryResponse])
-async def get_categories():
-    """Get all categories for current user"""
+async def get_categories(request: Request, response: Response):
+    """Get all categories for current user (supports If-None-Match)"""
     user_id = get_current_user_id()
+    etag = make_etag("categories", await category_service.get_version(user_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    if settings.FAST_SERIALIZATION:
+        rows = await category_service.get_categories(user_id, as_rows=True)
+        return rows_response(rows, CategoryResponse, response)
     return await category_service.get_categories(user_id)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-async def get_category(category_id: UUID):
-    """Get a category by ID"""
+async def get_category(category_id: UUID, request: Request, response: Response):
+    """Get a category by ID (supports If-None-Match)"""
     user_id = get_current_user_id()
+    etag = make_etag("category", category_id, await category_service.get_version(user_id, category_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
     return await category_service.get_category(user_id, category_id)
 
 
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Query, Request, Response
+from typing import Optional
+from datetime import date
+from app.domain.finance.dto.dashboard_dto import DashboardResponse
+from app.domain.finance.services.dashboard_service import DashboardService
+from app.core.user_context import get_current_user_id
+from app.core.etag import make_etag, conditional_response
+
+router = APIRouter()
+dashboard_service = DashboardService()
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Month as YYYY-MM (defaults to current month)")
+):
+    """Get the finance dashboard summary for a month (supports If-None-Match)"""
+    user_id = get_current_user_id()
+    if month:
+        year, month_number = (int(part) for part in month.split("-"))
+    else:
+        today = date.today()
+        year, month_number = today.year, today.month
+    # Upcoming expenses depend on today's date
+    etag = make_etag("dashboard", year, month_number, date.today(), await dashboard_service.get_version(user_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    return await dashboard_service.get_dashboard(user_id, year, month_number)
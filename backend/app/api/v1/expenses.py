@@ -1,48 +1,137 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from typing import List, Optional
 from uuid import UUID
+from datetime import date
 from app.domain.finance.dto.expense_dto import (
     ExpenseCreate,
     ExpenseUpdate,
-    ExpenseResponse
+    ExpenseResponse,
+    ExpenseScheduleItem,
+    ExpenseForecastResponse,
+    ExpenseReconciliationResult
 )
 from app.domain.finance.services.expense_service import ExpenseService
 from app.core.user_context import get_current_user_id
+from app.core.unit_of_work import UnitOfWork, get_unit_of_work
+from app.core.etag import make_etag, conditional_response
+from app.core.config import settings
+from app.core.serialization import rows_response
 
 router = APIRouter()
-expense_service = ExpenseService()
+
+
+def get_expense_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> ExpenseService:
+    """Dependency providing a ExpenseService bound to the request's unit of work"""
+    return ExpenseService(uow)
 
 
 @router.post("", response_model=ExpenseResponse, status_code=201)
-async def create_expense(expense_data: ExpenseCreate):
+async def create_expense(
+    expense_data: ExpenseCreate,
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
     """Create a new expense"""
     user_id = get_current_user_id()
     return await expense_service.create_expense(user_id, expense_data)
 
 
 @router.get("", response_model=List[ExpenseResponse])
-async def get_expenses(is_active: Optional[bool] = Query(None)):
-    """Get all expenses for current user"""
+async def get_expenses(
+    request: Request,
+    response: Response,
+    is_active: Optional[bool] = Query(None),
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
+    """Get all expenses for current user (supports If-None-Match)"""
     user_id = get_current_user_id()
+    etag = make_etag("expenses", is_active, await expense_service.get_version(user_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    if settings.FAST_SERIALIZATION:
+        rows = await expense_service.get_expenses(user_id, is_active, as_rows=True)
+        return rows_response(rows, ExpenseResponse, response)
     return await expense_service.get_expenses(user_id, is_active)
 
 
+@router.get("/schedule", response_model=List[ExpenseScheduleItem])
+async def get_expense_schedule(
+    request: Request,
+    response: Response,
+    months: int = Query(12, description="Number of calendar months to project, the current one included"),
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
+    """Get projected payments of active expenses, overdue installments first (supports If-None-Match)"""
+    user_id = get_current_user_id()
+    today = date.today()
+    etag = make_etag("expense-schedule", months, today, await expense_service.get_version(user_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    if settings.FAST_SERIALIZATION:
+        rows = await expense_service.get_schedule(user_id, months, today, as_rows=True)
+        return rows_response(rows, ExpenseScheduleItem, response)
+    return await expense_service.get_schedule(user_id, months, today)
+
+
+@router.get("/forecast", response_model=ExpenseForecastResponse)
+async def get_expense_forecast(
+    request: Request,
+    response: Response,
+    months: int = Query(12, description="Number of calendar months to project, the current one included"),
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
+    """Get projected expense outflow per month (supports If-None-Match)"""
+    user_id = get_current_user_id()
+    today = date.today()
+    etag = make_etag("expense-forecast", months, today, await expense_service.get_version(user_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    return await expense_service.get_forecast(user_id, months, today)
+
+
+@router.post("/reconcile", response_model=ExpenseReconciliationResult)
+async def reconcile_expense_payments(
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
+    """Recompute installment payment counters from linked transactions, return the corrected expenses"""
+    user_id = get_current_user_id()
+    return await expense_service.reconcile_payments(user_id)
+
+
 @router.get("/{expense_id}", response_model=ExpenseResponse)
-async def get_expense(expense_id: UUID):
-    """Get an expense by ID"""
+async def get_expense(
+    expense_id: UUID,
+    request: Request,
+    response: Response,
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
+    """Get an expense by ID (supports If-None-Match)"""
     user_id = get_current_user_id()
+    etag = make_etag("expense", expense_id, await expense_service.get_version(user_id, expense_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
     return await expense_service.get_expense(user_id, expense_id)
 
 
 @router.put("/{expense_id}", response_model=ExpenseResponse)
-async def update_expense(expense_id: UUID, expense_data: ExpenseUpdate):
+async def update_expense(
+    expense_id: UUID,
+    expense_data: ExpenseUpdate,
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
     """Update an expense"""
     user_id = get_current_user_id()
     return await expense_service.update_expense(user_id, expense_id, expense_data)
 
 
 @router.delete("/{expense_id}", status_code=204)
-async def delete_expense(expense_id: UUID):
+async def delete_expense(
+    expense_id: UUID,
+    expense_service: ExpenseService = Depends(get_expense_service)
+):
     """Delete an expense"""
     user_id = get_current_user_id()
     await expense_service.delete_expense(user_id, expense_id)
@@ -1,7 +1,10 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from app.domain.settings.dto.property_dto import PropertyCreate, PropertyUpdate, PropertyResponse
 from app.domain.settings.services.property_service import PropertyService
+from app.core.etag import make_etag, conditional_response
+from app.core.config import settings
+from app.core.serialization import rows_response
 
 router = APIRouter(prefix="/properties", tags=["properties"])
 
@@ -15,14 +18,21 @@ async def create_property(property_data: PropertyCreate):
 
 
 @router.get("", response_model=List[PropertyResponse])
-async def get_properties(include_deleted: bool = False):
-    """Get all properties (system-wide)"""
+async def get_properties(request: Request, response: Response, include_deleted: bool = False):
+    """Get all properties (system-wide, supports If-None-Match)"""
+    etag = make_etag("properties", include_deleted, await property_service.get_version())
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    if settings.FAST_SERIALIZATION:
+        rows = await property_service.get_properties(include_deleted, as_rows=True)
+        return rows_response(rows, PropertyResponse, response)
     return await property_service.get_properties(include_deleted)
 
 
 @router.get("/{property_id}", response_model=PropertyResponse)
-async def get_property(property_id: str):
-    """Get a specific property"""
+async def get_property(property_id: str, request: Request, response: Response):
+    """Get a specific property (supports If-None-Match)"""
     from uuid import UUID
     try:
         property_uuid = UUID(property_id)
@@ -31,6 +41,10 @@ async def get_property(property_id: str):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid property ID format"
         )
+    etag = make_etag("property", property_uuid, await property_service.get_version(property_uuid))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
     return await property_service.get_property(property_uuid)
 
 
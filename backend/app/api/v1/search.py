@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Query
+from typing import List
+from app.domain.finance.dto.search_dto import SearchEntity, SearchResponse
+from app.domain.finance.services.search_service import SearchService
+from app.core.user_context import get_current_user_id
+
+router = APIRouter()
+search_service = SearchService()
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description='Words, "quoted phrases", OR, and -excluded words'),
+    types: List[SearchEntity] = Query([SearchEntity.transactions, SearchEntity.notes], description="What to search"),
+    domain: str = Query("finance", description="Notes domain"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Full-text search over the current user's transactions (description, notes, payment method) and notes.
+
+    Results are ranked by relevance; pass `next_offset` back as `offset` for the next page.
+    """
+    user_id = get_current_user_id()
+    return await search_service.search(user_id, q, types, domain, limit, offset)
@@ -1,46 +1,222 @@
-from fastapi import APIRouter, Query
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, File, Header, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from datetime import date
-from app.domain.finance.dto.transaction_dto import TransactionCreate, TransactionResponse
+from app.domain.finance.dto.transaction_dto import (
+    TransactionCreate,
+    TransactionResponse,
+    SeriesGranularity,
+    TransactionSeriesPoint,
+    TransactionSuggestion,
+    TransactionTagFacet,
+    ExportFormat,
+    TransactionImportResult
+)
 from app.domain.finance.services.transaction_service import TransactionService
+from app.domain.finance.services.transaction_import_service import TransactionImportService, parse_import_csv
 from app.core.user_context import get_current_user_id
+from app.core.unit_of_work import UnitOfWork, get_unit_of_work
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.etag import make_etag, conditional_response
+from app.core.config import settings
+from app.core.serialization import rows_response
+from app.domain.finance.validations.transaction_validations import validate_date_range
 
 router = APIRouter()
-transaction_service = TransactionService()
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+}
+
+
+def get_transaction_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> TransactionService:
+    """Dependency providing a TransactionService bound to the request's unit of work"""
+    return TransactionService(uow)
+
+
+def get_transaction_import_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> TransactionImportService:
+    """Dependency providing a TransactionImportService bound to the request's unit of work"""
+    return TransactionImportService(uow)
 
 
 @router.post("", response_model=TransactionResponse, status_code=201)
-async def create_transaction(transaction_data: TransactionCreate):
+async def create_transaction(
+    transaction_data: TransactionCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None,
+        max_length=255,
+        description="Client-generated key; a retry with the same key returns the existing transaction (200)"
+    ),
+    transaction_service: TransactionService = Depends(get_transaction_service)
+):
     """Create a new transaction"""
     user_id = get_current_user_id()
-    return await transaction_service.create_transaction(user_id, transaction_data)
+    transaction, created = await transaction_service.create_transaction(user_id, transaction_data, idempotency_key)
+    if not created:
+        response.status_code = 200
+    return transaction
+
+
+@router.post("/import", response_model=TransactionImportResult)
+async def import_transactions(
+    rows: List[Dict[str, Any]] = Body(...),
+    dedupe: bool = Query(True, description="Skip rows already imported (matched by content fingerprint)"),
+    import_service: TransactionImportService = Depends(get_transaction_import_service)
+):
+    """Bulk import transactions from a JSON array of TransactionCreate objects (invalid rows are reported, not loaded)"""
+    user_id = get_current_user_id()
+    return await import_service.import_transactions(user_id, rows, dedupe)
+
+
+@router.post("/import/csv", response_model=TransactionImportResult)
+async def import_transactions_csv(
+    file: UploadFile = File(...),
+    dedupe: bool = Query(True, description="Skip rows already imported (matched by content fingerprint)"),
+    import_service: TransactionImportService = Depends(get_transaction_import_service)
+):
+    """Bulk import transactions from a CSV file with a header row (same columns as the CSV export)"""
+    user_id = get_current_user_id()
+    rows = parse_import_csv(await file.read())
+    return await import_service.import_transactions(user_id, rows, dedupe)
 
 
 @router.get("", response_model=List[TransactionResponse])
 async def get_transactions(
+    request: Request,
+    response: Response,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     category_id: Optional[UUID] = Query(None),
     limit: Optional[int] = Query(None),
     offset: Optional[int] = Query(0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    tags_any: Optional[List[str]] = Query(None, description="Only transactions with at least one of these tags (repeat the parameter)"),
+    tags_all: Optional[List[str]] = Query(None, description="Only transactions with all of these tags (repeat the parameter)"),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+):
+    """Get transactions for current user with optional filters.
+
+    Ordered by date then id (newest first). When `limit` is set and more rows
+    remain, the `X-Next-Cursor` response header holds the cursor for the next page.
+    Supports If-None-Match.
+    """
+    user_id = get_current_user_id()
+    etag = make_etag(
+        "transactions", start_date, end_date, category_id, limit, offset, cursor, tags_any, tags_all,
+        await transaction_service.get_version(user_id)
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    transactions, next_cursor = await transaction_service.get_transactions(
+        user_id, start_date, end_date, category_id, limit, offset, cursor,
+        as_rows=settings.FAST_SERIALIZATION, tags_any=tags_any, tags_all=tags_all
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if settings.FAST_SERIALIZATION:
+        return rows_response(transactions, TransactionResponse, response)
+    return transactions
+
+
+@router.get("/series", response_model=List[TransactionSeriesPoint])
+async def get_transaction_series(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    granularity: SeriesGranularity = Query(SeriesGranularity.month),
+    property_id: Optional[UUID] = Query(None),
+    category_id: Optional[UUID] = Query(None),
+    transaction_service: TransactionService = Depends(get_transaction_service),
 ):
-    """Get all transactions for current user with optional filters"""
+    """Get income/expense totals per day/week/month/year bucket for a date range"""
     user_id = get_current_user_id()
-    return await transaction_service.get_transactions(
-        user_id, start_date, end_date, category_id, limit, offset
+    return await transaction_service.get_series(
+        user_id, granularity, start_date, end_date, property_id, category_id
+    )
+
+
+@router.get("/tags", response_model=List[TransactionTagFacet])
+async def get_tag_facets(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    category_id: Optional[UUID] = Query(None),
+    tags_any: Optional[List[str]] = Query(None, description="Only transactions with at least one of these tags (repeat the parameter)"),
+    tags_all: Optional[List[str]] = Query(None, description="Only transactions with all of these tags (repeat the parameter)"),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+):
+    """Count and income/expense totals per tag for the transactions matching the list filters (supports If-None-Match)"""
+    user_id = get_current_user_id()
+    etag = make_etag(
+        "transaction-tags", start_date, end_date, category_id, tags_any, tags_all,
+        await transaction_service.get_version(user_id)
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    return await transaction_service.get_tag_facets(user_id, start_date, end_date, category_id, tags_any, tags_all)
+
+
+@router.get("/suggest", response_model=List[TransactionSuggestion])
+async def suggest_descriptions(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Description typed so far"),
+    limit: int = Query(8, ge=1, le=20),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+):
+    """Past descriptions for autocomplete, each with the category, property and amount it was last used with"""
+    user_id = get_current_user_id()
+    return await transaction_service.suggest_descriptions(user_id, prefix, limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_transactions(
+    format: ExportFormat = Query(ExportFormat.csv),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    category_id: Optional[UUID] = Query(None),
+    tags_any: Optional[List[str]] = Query(None, description="Only transactions with at least one of these tags (repeat the parameter)"),
+    tags_all: Optional[List[str]] = Query(None, description="Only transactions with all of these tags (repeat the parameter)"),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+):
+    """Export transactions for current user as CSV or NDJSON (streamed, same filters as the list)"""
+    user_id = get_current_user_id()
+    if start_date and end_date:
+        validate_date_range(start_date, end_date)
+    return StreamingResponse(
+        transaction_service.export_transactions(
+            user_id, format, start_date, end_date, category_id, tags_any=tags_any, tags_all=tags_all
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format.value}"'},
     )
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-async def get_transaction(transaction_id: UUID):
-    """Get a transaction by ID"""
+async def get_transaction(
+    transaction_id: UUID,
+    request: Request,
+    response: Response,
+    transaction_service: TransactionService = Depends(get_transaction_service)
+):
+    """Get a transaction by ID (supports If-None-Match)"""
     user_id = get_current_user_id()
+    etag = make_etag("transaction", transaction_id, await transaction_service.get_version(user_id, transaction_id))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
     return await transaction_service.get_transaction(user_id, transaction_id)
 
 
 @router.delete("/{transaction_id}", status_code=204)
-async def delete_transaction(transaction_id: UUID):
+async def delete_transaction(
+    transaction_id: UUID,
+    transaction_service: TransactionService = Depends(get_transaction_service)
+):
     """Soft delete a transaction"""
     user_id = get_current_user_id()
     await transaction_service.delete_transaction(user_id, transaction_id)
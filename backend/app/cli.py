@@ -0,0 +1,153 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli <command> [options]
+"""
+import argparse
+import asyncio
+import json
+from datetime import date
+from pathlib import Path
+from uuid import UUID
+from app.core.config import get_default_user_id
+from app.core.database import dispose_db
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.services.rollup_service import RollupService
+from app.domain.finance.services.expense_materialization_service import ExpenseMaterializationService
+from app.domain.finance.services.expense_service import ExpenseService
+from app.domain.finance.services.archive_service import ArchiveService
+from app.domain.finance.dto.archive_dto import ArchiveEntity
+from app.domain.finance.services.transaction_partition_service import TransactionPartitionService
+from app.domain.finance.services.transaction_import_service import TransactionImportService, parse_import_csv
+
+
+async def rebuild_rollups(args: argparse.Namespace) -> None:
+    """Rebuild the monthly transaction rollup"""
+    uow = UnitOfWork()
+    rows = await RollupService(uow).rebuild(args.user_id)
+    scope = f"user {args.user_id}" if args.user_id else "all users"
+    print(f"Rebuilt transaction rollups for {scope}: {rows} rows")
+
+
+async def import_transactions(args: argparse.Namespace) -> None:
+    """Bulk import transactions from a CSV or JSON file"""
+    path = Path(args.file)
+    file_format = args.format or ("json" if path.suffix.lower() == ".json" else "csv")
+    content = path.read_bytes()
+    rows = json.loads(content) if file_format == "json" else parse_import_csv(content)
+    user_id = args.user_id or get_default_user_id()
+
+    result = await TransactionImportService(UnitOfWork()).import_transactions(user_id, rows, dedupe=not args.no_dedupe)
+    for error in result.errors:
+        print(f"Row {error.row}: {'; '.join(error.errors)}")
+    print(f"Imported {result.imported} transactions ({result.skipped} duplicates skipped, {len(result.errors)} rows rejected)")
+
+
+async def materialize_expenses(args: argparse.Namespace) -> None:
+    """Turn expense payments due up to a date into transactions"""
+    result = await ExpenseMaterializationService(UnitOfWork()).materialize(args.through, args.batch_size)
+    print(
+        f"Materialized expense payments through {result.through}: {result.transactions_created} transactions "
+        f"from {result.expenses_processed} expenses ({result.variable_skipped} variable-amount payments skipped, "
+        f"{result.paid_skipped} already paid)"
+    )
+
+
+async def reconcile_expenses(args: argparse.Namespace) -> None:
+    """Recompute installment payment counters from linked transactions"""
+    result = await ExpenseService(UnitOfWork()).reconcile_payments(args.user_id)
+    for expense in result.expenses:
+        print(
+            f"{expense.id} {expense.name}: payments_completed {expense.previous_payments_completed} -> "
+            f"{expense.payments_completed}, is_active {expense.previous_is_active} -> {expense.is_active}"
+        )
+    scope = f"user {args.user_id}" if args.user_id else "all users"
+    print(f"Reconciled expense payments for {scope}: {result.corrected} expenses corrected")
+
+
+async def archive_deleted(args: argparse.Namespace) -> None:
+    """Move rows soft-deleted longer than the retention window into the archive tables"""
+    result = await ArchiveService(UnitOfWork()).archive(args.retention_days, args.batch_size)
+    moved = ", ".join(f"{count} {entity.value}" for entity, count in result.archived.items())
+    print(f"Archived rows deleted before {result.cutoff:%Y-%m-%d %H:%M}: {moved}")
+
+
+async def restore_archived(args: argparse.Namespace) -> None:
+    """Move archived rows back into the hot tables (undeleted)"""
+    user_id = args.user_id or get_default_user_id()
+    result = await ArchiveService(UnitOfWork()).restore(user_id, args.entity, args.ids)
+    for row_id in result.not_restored:
+        print(f"Not restored: {row_id} (not archived for this user, missing reference or conflicting live row)")
+    print(f"Restored {len(result.restored)} {result.entity.value}")
+
+
+async def maintain_partitions(args: argparse.Namespace) -> None:
+    """Create upcoming finance_transactions partitions and detach expired ones"""
+    result = await TransactionPartitionService(UnitOfWork()).maintain(
+        ahead=args.ahead, detach_after_months=args.detach_after_months
+    )
+    for name in result.created:
+        print(f"Created partition {name}")
+    for name in result.detached:
+        print(f"Detached partition {name} (kept as a standalone table)")
+    print(f"Partitions maintained ({result.interval}ly): {len(result.created)} created, {len(result.detached)} detached")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Nexus maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rollups = commands.add_parser("rebuild-rollups", help="Rebuild the monthly transaction rollup (backfill / drift repair)")
+    rollups.add_argument("--user-id", type=UUID, default=None, help="Only rebuild this user's rollup")
+    rollups.set_defaults(handler=rebuild_rollups)
+
+    imports = commands.add_parser("import-transactions", help="Bulk import transactions from a CSV or JSON file")
+    imports.add_argument("file", help="CSV (with header row) or JSON array of transactions")
+    imports.add_argument("--format", choices=["csv", "json"], default=None, help="File format (default: from the file extension)")
+    imports.add_argument("--user-id", type=UUID, default=None, help="Owner of the imported transactions (default: DEFAULT_USER_ID)")
+    imports.add_argument("--no-dedupe", action="store_true", help="Import rows even if they were imported before")
+    imports.set_defaults(handler=import_transactions)
+
+    materialize = commands.add_parser("materialize-expenses", help="Create transactions for expense payments that are due (what the scheduler runs)")
+    materialize.add_argument("--through", type=date.fromisoformat, default=None, help="Last due date to materialize, YYYY-MM-DD (default: today)")
+    materialize.add_argument("--batch-size", type=int, default=None, help="Expenses per transaction (default: EXPENSE_MATERIALIZATION_BATCH_SIZE)")
+    materialize.set_defaults(handler=materialize_expenses)
+
+    reconcile = commands.add_parser("reconcile-expenses", help="Recompute installment payment counters from linked transactions (drift repair)")
+    reconcile.add_argument("--user-id", type=UUID, default=None, help="Only reconcile this user's expenses")
+    reconcile.set_defaults(handler=reconcile_expenses)
+
+    archive = commands.add_parser("archive-deleted", help="Move long soft-deleted rows into the archive tables")
+    archive.add_argument("--retention-days", type=int, default=None, help="Archive rows deleted more than this many days ago (default: ARCHIVE_RETENTION_DAYS)")
+    archive.add_argument("--batch-size", type=int, default=None, help="Rows per transaction (default: ARCHIVE_BATCH_SIZE)")
+    archive.set_defaults(handler=archive_deleted)
+
+    restore = commands.add_parser("restore-archived", help="Restore archived rows into the hot tables (undeleted)")
+    restore.add_argument("entity", type=ArchiveEntity, choices=list(ArchiveEntity), help="Kind of rows to restore")
+    restore.add_argument("ids", type=UUID, nargs="+", help="Ids of the archived rows")
+    restore.add_argument("--user-id", type=UUID, default=None, help="Owner of the rows (default: DEFAULT_USER_ID)")
+    restore.set_defaults(handler=restore_archived)
+
+    partitions = commands.add_parser("maintain-partitions", help="Create upcoming transaction partitions, detach expired ones")
+    partitions.add_argument("--ahead", type=int, default=None, help="Future partitions to keep created (default: TRANSACTION_PARTITIONS_AHEAD)")
+    partitions.add_argument("--detach-after-months", type=int, default=None, help="Detach partitions that ended this many months ago (default: TRANSACTION_PARTITION_DETACH_AFTER_MONTHS, off)")
+    partitions.set_defaults(handler=maintain_partitions)
+
+    return parser
+
+
+async def run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await dispose_db()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+In-process read-through caches for small, rarely changing tables.
+
+Each named cache is keyed by strings, bounded (least recently used entries
+are evicted) and entries expire after CACHE_TTL_SECONDS. Writers call
+`invalidate()` after their change is committed. Readers take `generation()`
+before querying and pass it to `set()`, so a value read before an
+invalidation is not stored after it. With CACHE_NOTIFY_ENABLED, invalidations are also
+broadcast to the other workers through Postgres LISTEN/NOTIFY; without it,
+other workers see the change once their entry expires.
+"""
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.core.database import get_db, get_async_database_url
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process so it can ignore its own NOTIFY messages
+WORKER_ID = uuid.uuid4().hex
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Bumped by invalidate(): per key, and for the whole cache
+        self._generation = 0
+        self._key_generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry (None on miss or expiry)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def generation(self, key: str) -> tuple:
+        """Marker that changes whenever the key is invalidated (take it before reading the value)"""
+        return (self._generation, self._key_generations.get(key, 0))
+
+    def set(self, key: str, value: Any, generation: Optional[tuple] = None) -> None:
+        """Store an entry, evicting the least recently used one when full.
+
+        With a generation, the value is dropped if the key was invalidated since
+        that generation was taken (the value may predate the invalidating write).
+        """
+        if not settings.CACHE_ENABLED:
+            return
+        if generation is not None and generation != self.generation(key):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one entry, or all entries when key is None"""
+        if key is None:
+            self._entries.clear()
+            self._generation += 1
+            self._key_generations.clear()
+        else:
+            self._entries.pop(key, None)
+            self._key_generations[key] = self._key_generations.get(key, 0) + 1
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def get_cache(name: str) -> TTLCache:
+    """Get (or create) the process-wide cache with a name"""
+    if name not in _caches:
+        _caches[name] = TTLCache(name, settings.CACHE_TTL_SECONDS, settings.CACHE_MAX_ENTRIES)
+    return _caches[name]
+
+
+async def invalidate(name: str, key: Optional[str] = None) -> None:
+    """Invalidate a cache entry (or the whole cache) here and, when enabled, in every other worker"""
+    get_cache(name).invalidate(key)
+    if not settings.CACHE_NOTIFY_ENABLED:
+        return
+    payload = json.dumps({"worker": WORKER_ID, "cache": name, "key": key})
+    try:
+        async with get_db().begin() as conn:
+            await conn.execute(select(func.pg_notify(settings.CACHE_NOTIFY_CHANNEL, payload)))
+    except Exception:
+        # Other workers fall back to the TTL
+        logger.exception("Failed to broadcast cache invalidation for %s", name)
+
+
+class CacheInvalidationListener:
+    """LISTENs for invalidations broadcast by other workers and applies them locally"""
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+
+    async def start(self) -> None:
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.add_listener(self.channel, self._on_notify)
+
+    async def stop(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("worker") == WORKER_ID or message.get("cache") not in _caches:
+            return
+        _caches[message["cache"]].invalidate(message.get("key"))
+
+
+async def start_invalidation_listener() -> Optional[CacheInvalidationListener]:
+    """Start the LISTEN connection when CACHE_NOTIFY_ENABLED (called from the app lifespan)"""
+    if not settings.CACHE_NOTIFY_ENABLED:
+        return None
+    # asyncpg takes a plain postgresql:// DSN
+    dsn = make_url(get_async_database_url()).set(drivername="postgresql").render_as_string(hide_password=False)
+    listener = CacheInvalidationListener(dsn, settings.CACHE_NOTIFY_CHANNEL)
+    try:
+        await listener.start()
+    except Exception:
+        logger.exception("Cache invalidation listener not started; relying on TTL expiry")
+        return None
+    return listener
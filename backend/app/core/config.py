@@ -1,10 +1,49 @@
 from pydantic_settings import BaseSettings
+from typing import Literal, Optional
 from uuid import UUID
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL (asyncpg driver) when not set
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    
+    # In-process caches (categories, properties)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 300.0
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_NOTIFY_ENABLED: bool = False  # Broadcast invalidations to other workers via LISTEN/NOTIFY
+    CACHE_NOTIFY_CHANNEL: str = "nexus_cache_invalidation"
+    
+    # Encode list responses straight from rows with orjson (app/core/serialization.py)
+    FAST_SERIALIZATION: bool = True
+    
+    # Bulk import
+    IMPORT_MAX_ROWS: int = 100000
+    
+    # Description autocomplete (GET /transactions/suggest): only transactions this recent are searched
+    TRANSACTION_SUGGEST_LOOKBACK_DAYS: int = 730
+    
+    # Expense schedule/forecast window limit
+    EXPENSE_PROJECTION_MAX_MONTHS: int = 60
+    
+    # Background scheduler (app/core/scheduler.py): turns due expense payments into transactions
+    SCHEDULER_ENABLED: bool = True
+    EXPENSE_MATERIALIZATION_INTERVAL_SECONDS: float = 3600.0
+    EXPENSE_MATERIALIZATION_BATCH_SIZE: int = 500
+    
+    # Archival of soft-deleted rows into *_archive tables (ArchiveService)
+    ARCHIVE_RETENTION_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_INTERVAL_SECONDS: float = 86400.0
+    
+    # Date-range partitions of finance_transactions (app/core/partitions.py)
+    TRANSACTION_PARTITION_INTERVAL: Literal["year", "month"] = "year"  # Applies to partitions created from now on
+    TRANSACTION_PARTITIONS_AHEAD: int = 2  # Future partitions kept created ahead of today
+    TRANSACTION_PARTITION_DETACH_AFTER_MONTHS: Optional[int] = None  # Detach partitions older than this (off by default)
+    TRANSACTION_PARTITION_INTERVAL_SECONDS: float = 86400.0
     
     # Default User (for local development - no auth)
     DEFAULT_USER_ID: str = "00000000-0000-0000-0000-000000000001"  # Will be set after user creation
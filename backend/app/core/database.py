@@ -1,19 +1,37 @@
 from sqlalchemy import create_engine, MetaData, Table, Column, String, Integer, DateTime, DECIMAL, Boolean, Date, Enum as SQLEnum, ForeignKey, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.sql import func
-import uuid
 from app.core.config import settings
+from app.core.ids import uuid7
 
-# Create engine
+
+def get_async_database_url() -> str:
+    """Get the async driver URL (asyncpg) for the configured database"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+# Create engines
+# The sync engine is kept for schema management (create_tables/drop_tables, Alembic);
+# repositories use the async engine so queries never block the event loop.
 engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+async_engine = create_async_engine(
+    get_async_database_url(),
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
 metadata = MetaData()
 
 # Users table
 users = Table(
     "users",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid7),
     Column("email", String(255), unique=True, nullable=False),
     Column("first_name", String(255), nullable=False),
     Column("last_name", String(255), nullable=False),
@@ -25,7 +43,7 @@ users = Table(
 finance_categories = Table(
     "finance_categories",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid7),
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
     Column("name", String(255), nullable=False),
     Column("type", SQLEnum("income", "expense", name="category_type"), nullable=False),
@@ -39,7 +57,7 @@ finance_categories = Table(
 properties = Table(
     "properties",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid7),
     Column("name", String(255), nullable=False, unique=True),
     Column("is_active", Boolean, default=True, nullable=False),
     Column("is_default", Boolean, default=False, nullable=False),
@@ -52,7 +70,7 @@ properties = Table(
 expenses = Table(
     "expenses",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid7),
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
     Column("property_id", UUID(as_uuid=True), ForeignKey("properties.id"), nullable=False),
     Column("name", String(255), nullable=False),
@@ -65,16 +83,18 @@ expenses = Table(
     Column("payments_completed", Integer, default=0, nullable=False),
     Column("is_active", Boolean, default=True, nullable=False),
     Column("notes", Text, nullable=True),
+    Column("materialized_through", Date, nullable=True),  # Payments due up to this date have been turned into transactions (NULL: since created_at)
     Column("deleted_at", DateTime(timezone=True), nullable=True),
     Column("created_at", DateTime(timezone=True), server_default=func.now()),
     Column("updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
 )
 
-# Notes table (monthly and yearly)
+# Notes table (monthly and yearly); search_vector (migration 0008) is not
+# part of the definition, see finance_transactions
 notes = Table(
     "notes",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid7),
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
     Column("domain", String(50), nullable=False, server_default="finance"),
     Column("year", Integer, nullable=False),
@@ -86,13 +106,18 @@ notes = Table(
 )
 
 # Finance transactions table
+# Partitioned by RANGE (date) (migration 0006, app/core/partitions.py): the
+# primary key and unique indexes include date
+# Like notes, it also has a generated search_vector column (migration 0008),
+# deliberately left out of the definition so that row selects, RETURNING and
+# archive/partition copies never carry it; SearchRepository reads it by name
 finance_transactions = Table(
     "finance_transactions",
     metadata,
-    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+    Column("id", UUID(as_uuid=True), primary_key=True, default=uuid7),
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id"), nullable=False),
     Column("property_id", UUID(as_uuid=True), ForeignKey("properties.id"), nullable=False),
-    Column("date", Date, nullable=False),
+    Column("date", Date, primary_key=True, nullable=False),
     Column("amount", DECIMAL(10, 2), nullable=False),
     Column("description", Text, nullable=True),
     Column("category_id", UUID(as_uuid=True), ForeignKey("finance_categories.id"), nullable=False),
@@ -100,15 +125,62 @@ finance_transactions = Table(
     Column("tags", JSONB, nullable=True),
     Column("payment_method", String(100), nullable=True),
     Column("notes", Text, nullable=True),
+    Column("fingerprint", String(64), nullable=True),  # Content hash for deduplication (covers date), unique per user among non-deleted rows
     Column("created_at", DateTime(timezone=True), server_default=func.now()),
     Column("updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
     Column("deleted_at", DateTime(timezone=True), nullable=True),
+    postgresql_partition_by="RANGE (date)",
 )
 
+# Monthly rollup of finance_transactions per (user, property, category, month),
+# maintained in the same transaction as transaction writes
+finance_transaction_rollups = Table(
+    "finance_transaction_rollups",
+    metadata,
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("property_id", UUID(as_uuid=True), ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", UUID(as_uuid=True), ForeignKey("finance_categories.id", ondelete="CASCADE"), primary_key=True),
+    Column("year_month", Date, primary_key=True),  # First day of the month
+    Column("total_amount", DECIMAL(14, 2), nullable=False, server_default="0"),
+    Column("transaction_count", Integer, nullable=False, server_default="0"),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
+)
+
+# Leases for scheduled jobs: only the holder of an unexpired lease runs the job
+scheduler_leases = Table(
+    "scheduler_leases",
+    metadata,
+    Column("name", String(100), primary_key=True),
+    Column("holder", String(64), nullable=False),
+    Column("expires_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def archive_table(table: Table) -> Table:
+    """Archive copy of a soft-delete table: the same columns (no foreign keys, keyed by id) plus archived_at"""
+    return Table(
+        f"{table.name}_archive",
+        metadata,
+        *[Column(column.name, column.type, primary_key=column.name == "id", nullable=column.nullable) for column in table.columns],
+        Column("archived_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
+
+
+# Rows soft-deleted longer than ARCHIVE_RETENTION_DAYS are moved here (see ArchiveService)
+finance_transactions_archive = archive_table(finance_transactions)
+expenses_archive = archive_table(expenses)
+notes_archive = archive_table(notes)
+finance_categories_archive = archive_table(finance_categories)
+
+
+def get_db() -> AsyncEngine:
+    """Get async database engine"""
+    return async_engine
+
 
-def get_db() -> Engine:
-    """Get database engine"""
-    return engine
+async def dispose_db() -> None:
+    """Close all pooled async connections"""
+    await async_engine.dispose()
 
 
 def create_tables():
@@ -0,0 +1,120 @@
+"""
+Date-range partitions (finance_transactions is partitioned by RANGE (date)).
+
+Partitions cover one year or one month (TRANSACTION_PARTITION_INTERVAL) and are
+named <table>_pYYYY or <table>_pYYYY_MM. Rows dated outside every partition go
+to <table>_default. A partition is created detached, filled with its range's
+rows from the default partition and then attached: a CHECK constraint matching
+the bounds lets ATTACH skip validating the new partition, and the parent stays
+readable and writable throughout.
+
+These helpers only build SQL for PartitionRepository. Migrations keep their
+own frozen copies instead of importing them.
+"""
+import re
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+PARTITION_INTERVALS = ("year", "month")
+
+# [start, end) of a partition
+DateRange = Tuple[date, date]
+
+BOUND_PATTERN = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def interval_start(day: date, interval: str) -> date:
+    """First day of the year or month containing a date"""
+    if interval == "year":
+        return date(day.year, 1, 1)
+    if interval == "month":
+        return date(day.year, day.month, 1)
+    raise ValueError(f"Unknown partition interval: {interval}")
+
+
+def shift_interval(start: date, interval: str, count: int = 1) -> date:
+    """Start of the interval count intervals after (or before, if negative) an interval start"""
+    if interval == "year":
+        return date(start.year + count, 1, 1)
+    months = start.year * 12 + start.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_ranges(first: date, last: date, interval: str) -> List[DateRange]:
+    """Consecutive partition ranges covering first..last (inclusive)"""
+    ranges = []
+    start = interval_start(first, interval)
+    while start <= last:
+        end = shift_interval(start, interval)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def partition_name(table: str, start: date, interval: str) -> str:
+    """<table>_pYYYY (yearly) or <table>_pYYYY_MM (monthly)"""
+    if interval == "year":
+        return f"{table}_p{start:%Y}"
+    return f"{table}_p{start:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def parse_bound(expression: str) -> Optional[DateRange]:
+    """Range of a partition from pg_get_expr(relpartbound), None for the default partition"""
+    match = BOUND_PATTERN.search(expression)
+    if not match:
+        return None
+    return date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))
+
+
+def overlaps(candidate: DateRange, ranges: List[DateRange]) -> bool:
+    """Whether a range overlaps any of the given ranges"""
+    return any(candidate[0] < end and start < candidate[1] for start, end in ranges)
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE {default_partition_name(table)} PARTITION OF {table} DEFAULT"
+
+
+def create_partition_sql(
+    table: str,
+    name: str,
+    start: date,
+    end: date,
+    columns: Optional[Sequence[str]] = None
+) -> List[str]:
+    """Statements creating and attaching a partition; run them in one transaction.
+
+    columns lists the table's stored columns (all when None); generated
+    columns must be left out as they cannot be inserted into.
+    """
+    default = default_partition_name(table)
+    bounds = f"date >= DATE '{start.isoformat()}' AND date < DATE '{end.isoformat()}'"
+    names = ", ".join(columns) if columns else "*"
+    target = f"{name} ({names})" if columns else name
+    return [
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)",
+        f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds CHECK ({bounds})",
+        # Rows that were routed to the default partition before this range existed
+        f"WITH moved AS (DELETE FROM {default} WHERE {bounds} RETURNING {names}) INSERT INTO {target} SELECT {names} FROM moved",
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+        f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds",
+    ]
+
+
+def detach_partition_sql(table: str, name: str) -> str:
+    """Detached partitions stay behind as standalone tables"""
+    return f"ALTER TABLE {table} DETACH PARTITION {name}"
+
+
+# Partitions of a table and their bounds
+LIST_PARTITIONS_SQL = """
+SELECT child.relname AS name, pg_get_expr(child.relpartbound, child.oid) AS bound
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE pg_inherits.inhparent = CAST(:table AS regclass)
+ORDER BY child.relname
+"""
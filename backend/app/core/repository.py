@@ -1,22 +1,43 @@
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, insert, update, delete, and_
-from sqlalchemy.engine import Engine
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+from contextlib import asynccontextmanager
+from sqlalchemy import select, insert, update, delete, and_, func
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
 from uuid import UUID
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWork
 
 
 class BaseRepository:
     """Base repository class with common query methods"""
     
-    def __init__(self, table, db: Engine = None):
+    def __init__(self, table, db: AsyncEngine = None, uow: Optional[UnitOfWork] = None):
         self.table = table
         self.db = db or get_db()
+        self.uow = uow
+    
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[AsyncConnection]:
+        """Connection for reads (the unit of work's connection when bound)"""
+        if self.uow is not None:
+            yield await self.uow.connection()
+            return
+        async with self.db.connect() as conn:
+            yield conn
+    
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[AsyncConnection]:
+        """Connection for writes (commits on exit unless a unit of work owns the transaction)"""
+        if self.uow is not None:
+            yield await self.uow.connection()
+            return
+        async with self.db.begin() as conn:
+            yield conn
     
     async def find_by_id(self, id: UUID) -> Optional[Dict[str, Any]]:
         """Find a record by ID"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             stmt = select(self.table).where(self.table.c.id == id)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -24,18 +45,18 @@ class BaseRepository:
     
     async def find_by(self, **filters) -> List[Dict[str, Any]]:
         """Find records by filters"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [getattr(self.table.c, key) == value for key, value in filters.items()]
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
     
     async def find_one_by(self, **filters) -> Optional[Dict[str, Any]]:
         """Find one record by filters"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [getattr(self.table.c, key) == value for key, value in filters.items()]
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -43,17 +64,17 @@ class BaseRepository:
     
     async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = insert(self.table).values(**data).returning(self.table)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             return dict(row._mapping)
     
     async def update(self, id: UUID, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a record by ID"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = update(self.table).where(self.table.c.id == id).values(**data).returning(self.table)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -61,19 +82,29 @@ class BaseRepository:
     
     async def delete(self, id: UUID) -> bool:
         """Delete a record by ID"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = delete(self.table).where(self.table.c.id == id)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return result.rowcount > 0
     
     async def find_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
         """Find all records with optional pagination"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             stmt = select(self.table)
             if limit:
                 stmt = stmt.limit(limit)
             if offset:
                 stmt = stmt.offset(offset)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
-
+    
+    async def find_version(self, *conditions) -> Tuple[Any, ...]:
+        """Change marker for the rows matching conditions (deleted rows included): count, max(updated_at), max(deleted_at)"""
+        async with self.connect() as conn:
+            stmt = select(
+                func.count(),
+                func.max(self.table.c.updated_at),
+                func.max(self.table.c.deleted_at)
+            ).where(and_(*conditions))
+            result = await conn.execute(stmt)
+            return tuple(result.fetchone())
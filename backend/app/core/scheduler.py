@@ -0,0 +1,111 @@
+"""
+In-process scheduler for periodic background jobs.
+
+Every worker runs the scheduler, but a job only runs in the worker holding
+its row in `scheduler_leases`. A lease lasts one job interval and the holder
+renews it on each run; when the holder stops (or dies), another worker takes
+the job over once the lease expires. Jobs must be idempotent: a run that
+outlasts its lease may overlap with the next holder's run.
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, List, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.config import settings
+from app.core.database import scheduler_leases, get_db
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as a lease holder
+HOLDER_ID = uuid.uuid4().hex
+
+
+async def acquire_lease(name: str, holder: str, ttl_seconds: float) -> bool:
+    """Take (or renew) a named lease unless another holder has an unexpired one"""
+    now = datetime.now(timezone.utc)
+    stmt = pg_insert(scheduler_leases).values(
+        name=name,
+        holder=holder,
+        expires_at=now + timedelta(seconds=ttl_seconds)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[scheduler_leases.c.name],
+        set_={"holder": stmt.excluded.holder, "expires_at": stmt.excluded.expires_at},
+        where=or_(scheduler_leases.c.holder == stmt.excluded.holder, scheduler_leases.c.expires_at < now)
+    ).returning(scheduler_leases.c.holder)
+    async with get_db().begin() as conn:
+        result = await conn.execute(stmt)
+        return result.fetchone() is not None
+
+
+async def release_lease(name: str, holder: str) -> None:
+    """Expire a lease held by holder so another worker can take it right away"""
+    stmt = (
+        update(scheduler_leases)
+        .where(scheduler_leases.c.name == name, scheduler_leases.c.holder == holder)
+        .values(expires_at=datetime.now(timezone.utc))
+    )
+    async with get_db().begin() as conn:
+        await conn.execute(stmt)
+
+
+@dataclass
+class ScheduledJob:
+    """A coroutine function run every interval_seconds by the lease holder"""
+    name: str
+    interval_seconds: float
+    run: Callable[[], Awaitable[Any]]
+
+
+class Scheduler:
+    """Runs each job in its own asyncio task, guarded by the job's lease"""
+
+    def __init__(self, jobs: List[ScheduledJob], holder: str = HOLDER_ID):
+        self.jobs = jobs
+        self.holder = holder
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}") for job in self.jobs]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs:
+            try:
+                await release_lease(job.name, self.holder)
+            except Exception:
+                logger.exception("Failed to release scheduler lease %s", job.name)
+
+    async def run_once(self, job: ScheduledJob) -> bool:
+        """Run a job if this worker gets its lease, return whether it ran"""
+        if not await acquire_lease(job.name, self.holder, job.interval_seconds):
+            return False
+        await job.run()
+        return True
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        while True:
+            try:
+                await self.run_once(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A failed run is retried on the next tick
+                logger.exception("Scheduled job %s failed", job.name)
+            await asyncio.sleep(job.interval_seconds)
+
+
+def start_scheduler(jobs: List[ScheduledJob]) -> Optional[Scheduler]:
+    """Start the scheduler when SCHEDULER_ENABLED (called from the app lifespan)"""
+    if not settings.SCHEDULER_ENABLED or not jobs:
+        return None
+    scheduler = Scheduler(jobs)
+    scheduler.start()
+    return scheduler
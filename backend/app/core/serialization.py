@@ -0,0 +1,56 @@
+"""
+Fast JSON serialization for list endpoints.
+
+The default path builds a pydantic model per row, FastAPI validates the
+models again against `response_model` and then encodes them. For large lists
+`rows_response` instead picks the response model's fields straight from the
+repository rows and encodes them with orjson (UUID, date and datetime are
+native; Decimal is converted to float like the models' float fields).
+Endpoints keep their `response_model`, so the OpenAPI schema is unchanged.
+Disable with FAST_SERIALIZATION=false.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Tuple, Type
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def response_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    """Field names a response model serializes, in declaration order"""
+    return tuple(model.model_fields)
+
+
+def encode_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def rows_to_json(rows: Iterable[Mapping[str, Any]], model: Type[BaseModel]) -> bytes:
+    """Encode rows as a JSON array of objects shaped like the response model (no validation)"""
+    fields = response_fields(model)
+    return orjson.dumps(
+        [{name: row[name] for name in fields} for row in rows],
+        default=encode_default,
+        option=orjson.OPT_UTC_Z,
+    )
+
+
+def rows_response(
+    rows: Iterable[Mapping[str, Any]],
+    model: Type[BaseModel],
+    response: Optional[Response] = None
+) -> Response:
+    """JSON response for rows, keeping the status and headers set on the endpoint's injected response"""
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return Response(
+        content=rows_to_json(rows, model),
+        status_code=response.status_code if response is not None and response.status_code else 200,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,55 @@
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from app.core.database import get_db
+
+
+class UnitOfWork:
+    """One connection and one transaction shared by every repository in a request.
+
+    The connection is checked out lazily on first use. Write paths wrap their work in
+    `async with uow:`; blocks can be nested and only the outermost one commits (or rolls
+    back on error) and releases the connection, so a service can call other services
+    and validations without splitting the transaction.
+    """
+
+    def __init__(self, db: AsyncEngine = None):
+        self.db = db or get_db()
+        self._conn: Optional[AsyncConnection] = None
+        self._depth = 0
+
+    async def connection(self) -> AsyncConnection:
+        """Get the shared connection, checking one out of the pool if needed"""
+        if self._conn is None:
+            self._conn = await self.db.connect()
+        return self._conn
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._depth -= 1
+        if self._depth > 0 or self._conn is None:
+            return
+        try:
+            if exc_type is None:
+                await self._conn.commit()
+            else:
+                await self._conn.rollback()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Release the connection (anything not committed is rolled back)"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+async def get_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """FastAPI dependency providing a request-scoped unit of work"""
+    uow = UnitOfWork()
+    try:
+        yield uow
+    finally:
+        await uow.close()
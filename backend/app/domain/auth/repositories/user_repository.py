@@ -1,14 +1,15 @@
 from typing import Optional, Dict, Any
 from uuid import UUID
 from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
 from app.core.database import users
 
 
 class UserRepository(BaseRepository):
     """Repository for user operations"""
     
-    def __init__(self):
-        super().__init__(users)
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(users, uow=uow)
     
     async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Find a user by email"""
@@ -0,0 +1,23 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Dict, List
+from uuid import UUID
+from datetime import datetime
+
+
+class ArchiveEntity(str, Enum):
+    transactions = "transactions"
+    expenses = "expenses"
+    categories = "categories"
+    notes = "notes"
+
+
+class ArchiveResult(BaseModel):
+    cutoff: datetime  # rows soft-deleted before this were archived
+    archived: Dict[ArchiveEntity, int]
+
+
+class ArchiveRestoreResult(BaseModel):
+    entity: ArchiveEntity
+    restored: List[UUID]
+    not_restored: List[UUID]  # not archived, or blocked by a missing reference or a conflicting live row
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from uuid import UUID
+from app.domain.finance.dto.transaction_dto import TransactionResponse
+from app.domain.finance.dto.expense_dto import ExpenseScheduleItem
+from app.domain.finance.dto.note_dto import NoteResponse
+
+
+class CategoryTotalResponse(BaseModel):
+    category_id: UUID
+    name: str
+    type: str  # 'income' or 'expense'
+    color: Optional[str]
+    total: float
+    count: int
+
+
+class DashboardResponse(BaseModel):
+    year: int
+    month: int
+    total_income: float
+    total_expense: float
+    net: float
+    by_category: List[CategoryTotalResponse]
+    recent_transactions: List[TransactionResponse]
+    upcoming_expenses: List[ExpenseScheduleItem]  # overdue installments first, then by due date
+    monthly_note: Optional[NoteResponse] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime
 
@@ -14,6 +14,9 @@ class ExpenseCreate(BaseModel):
     start_date: date
     total_payments: Optional[int] = None
     notes: Optional[str] = None
+    # Materialize the payments due from start_date up to today as transactions on the next run.
+    # Without it, those payments are taken as made outside the app (installments count them as completed).
+    backfill: bool = False
 
 
 class ExpenseUpdate(BaseModel):
@@ -50,3 +53,54 @@ class ExpenseResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class ExpenseScheduleItem(BaseModel):
+    expense_id: UUID
+    name: str
+    category_id: UUID
+    property_id: UUID
+    expense_type: str
+    due_date: date
+    amount: Optional[float]  # None for variable expenses
+    payment_number: Optional[int]  # installments only
+    total_payments: Optional[int]
+    overdue: bool
+
+
+class ExpenseForecastMonth(BaseModel):
+    month: date  # first day of the month
+    total: float
+    count: int
+    variable_count: int  # payments without an amount (not in total)
+
+
+class ExpenseForecastResponse(BaseModel):
+    start_date: date
+    months: List[ExpenseForecastMonth]
+    total: float
+    overdue_total: float
+    overdue_count: int
+
+
+class ExpenseMaterializationResult(BaseModel):
+    through: date
+    expenses_processed: int
+    transactions_created: int
+    variable_skipped: int  # due payments of expenses without an amount (not materialized)
+    paid_skipped: int  # due payments whose month already has a linked transaction (e.g. posted by hand)
+
+
+class ExpenseReconciliationItem(BaseModel):
+    id: UUID
+    user_id: UUID
+    name: str
+    previous_payments_completed: int
+    payments_completed: int
+    previous_is_active: bool
+    is_active: bool
+
+
+class ExpenseReconciliationResult(BaseModel):
+    corrected: int
+    expenses: List[ExpenseReconciliationItem]
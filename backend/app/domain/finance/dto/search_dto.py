@@ -0,0 +1,33 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Optional, List
+from uuid import UUID
+import datetime
+
+
+class SearchEntity(str, Enum):
+    transactions = "transactions"
+    notes = "notes"
+
+
+class SearchMatch(BaseModel):
+    start: int  # offset in the snippet, in Unicode code points
+    end: int  # exclusive
+
+
+class SearchResult(BaseModel):
+    type: SearchEntity
+    id: UUID
+    rank: float
+    snippet: str  # Matching text, plain (no markup)
+    matches: List[SearchMatch]  # Where the query matched in the snippet
+    date: Optional[datetime.date] = None  # transactions (module-qualified: the field name shadows the type)
+    amount: Optional[float] = None  # transactions
+    year: Optional[int] = None  # notes
+    month: Optional[int] = None  # notes (None for yearly notes)
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    next_offset: Optional[int] = None  # offset of the next page, None on the last page
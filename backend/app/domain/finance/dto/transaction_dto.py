@@ -1,3 +1,4 @@
+from enum import Enum
 from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
@@ -35,3 +36,56 @@ class TransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class SeriesGranularity(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+    year = "year"
+
+
+class TransactionSeriesPoint(BaseModel):
+    bucket: date  # First day of the bucket (weeks start on Monday)
+    income: float
+    expense: float
+    net: float
+
+
+class TransactionSuggestion(BaseModel):
+    description: str  # As last entered (suggestions are distinct case-insensitively)
+    category_id: UUID  # Category, property and amount of the most recent use
+    property_id: UUID
+    amount: float
+    last_used: date
+    uses: int  # Transactions with this description within the lookback window
+
+
+class TransactionTagFacet(BaseModel):
+    tag: str
+    count: int  # Transactions carrying the tag
+    total: float  # Sum of their amounts
+    income: float
+    expense: float
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class TransactionImportError(BaseModel):
+    row: int  # 1-based position in the submitted batch (excluding the CSV header)
+    errors: List[str]
+
+
+class TransactionImportResult(BaseModel):
+    imported: int
+    skipped: int = 0  # Rows matching an existing transaction's fingerprint
+    errors: List[TransactionImportError]
+
+
+class TransactionPartitionResult(BaseModel):
+    interval: str  # year or month
+    created: List[str]  # partition names
+    detached: List[str]  # left behind as standalone tables
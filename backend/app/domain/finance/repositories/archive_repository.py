@@ -0,0 +1,147 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Table, select, insert, delete, exists, or_, func, null
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import (
+    finance_transactions,
+    finance_transactions_archive,
+    expenses,
+    expenses_archive,
+    notes,
+    notes_archive,
+    finance_categories,
+    finance_categories_archive,
+    properties,
+)
+from app.domain.finance.dto.archive_dto import ArchiveEntity
+
+# Hot table and archive table per entity, in archival order: transactions first
+# so that the expenses and categories they reference can be archived after them
+ARCHIVE_TABLES: Dict[ArchiveEntity, Tuple[Table, Table]] = {
+    ArchiveEntity.transactions: (finance_transactions, finance_transactions_archive),
+    ArchiveEntity.expenses: (expenses, expenses_archive),
+    ArchiveEntity.categories: (finance_categories, finance_categories_archive),
+    ArchiveEntity.notes: (notes, notes_archive),
+}
+
+
+def archive_guards(entity: ArchiveEntity, row: Table) -> List[Any]:
+    """Conditions for archiving a hot row: no hot row may still reference it"""
+    if entity == ArchiveEntity.expenses:
+        # expense_id is ON DELETE SET NULL: archiving would silently unlink transactions
+        return [~exists().where(finance_transactions.c.expense_id == row.c.id)]
+    if entity == ArchiveEntity.categories:
+        return [
+            ~exists().where(finance_transactions.c.category_id == row.c.id),
+            ~exists().where(expenses.c.category_id == row.c.id),
+        ]
+    return []
+
+
+def restore_guards(entity: ArchiveEntity, row: Table) -> List[Any]:
+    """Conditions for restoring an archived row: its references exist and no live row conflicts with it"""
+    if entity == ArchiveEntity.transactions:
+        return [
+            exists().where(finance_categories.c.id == row.c.category_id, finance_categories.c.deleted_at.is_(None)),
+            exists().where(properties.c.id == row.c.property_id),
+            or_(row.c.expense_id.is_(None), exists().where(expenses.c.id == row.c.expense_id)),
+            or_(
+                row.c.fingerprint.is_(None),
+                ~exists().where(
+                    finance_transactions.c.user_id == row.c.user_id,
+                    finance_transactions.c.fingerprint == row.c.fingerprint,
+                    finance_transactions.c.date == row.c.date,
+                    finance_transactions.c.deleted_at.is_(None)
+                )
+            ),
+        ]
+    if entity == ArchiveEntity.expenses:
+        return [
+            exists().where(finance_categories.c.id == row.c.category_id, finance_categories.c.deleted_at.is_(None)),
+            exists().where(properties.c.id == row.c.property_id),
+        ]
+    if entity == ArchiveEntity.categories:
+        # (user_id, name) is unique among all categories, deleted ones included
+        return [~exists().where(finance_categories.c.user_id == row.c.user_id, finance_categories.c.name == row.c.name)]
+    # Notes are unique per (user_id, domain, year, month), deleted ones included
+    return [~exists().where(
+        notes.c.user_id == row.c.user_id,
+        notes.c.domain == row.c.domain,
+        notes.c.year == row.c.year,
+        notes.c.month.is_not_distinct_from(row.c.month)
+    )]
+
+
+class ArchiveRepository(BaseRepository):
+    """Repository moving soft-deleted rows between the hot tables and their *_archive tables"""
+
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(None, uow=uow)
+
+    async def archive_batch(self, entity: ArchiveEntity, deleted_before: datetime, batch_size: int) -> int:
+        """Move up to batch_size rows soft-deleted before a time into the archive, return rows moved.
+
+        One statement: WITH moved AS (DELETE ... RETURNING *) INSERT INTO archive
+        SELECT FROM moved. Rows still referenced by hot rows are skipped, and
+        rows locked by a concurrent run are left to it (SKIP LOCKED).
+        """
+        hot, archive = ARCHIVE_TABLES[entity]
+        names = [column.name for column in hot.columns]
+        candidates = (
+            select(hot.c.id)
+            .where(hot.c.deleted_at < deleted_before, *archive_guards(entity, hot))
+            .order_by(hot.c.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            # Same table as the DELETE: keep the subquery's own FROM
+            .correlate(None)
+        )
+        moved = delete(hot).where(hot.c.id.in_(candidates)).returning(*hot.columns).cte("moved")
+        stmt = insert(archive).from_select(names, select(*[moved.c[name] for name in names]))
+        async with self.begin() as conn:
+            result = await conn.execute(stmt)
+            return result.rowcount
+
+    async def restore(self, entity: ArchiveEntity, user_id: UUID, ids: List[UUID]) -> List[Dict[str, Any]]:
+        """Move a user's archived rows back into the hot table, undeleted, return the restored rows.
+
+        Rows whose references are gone (or that would conflict with a live row)
+        stay in the archive and are not returned. Restored expenses are not
+        backfilled with payments due while they were deleted.
+        """
+        if not ids:
+            return []
+        hot, archive = ARCHIVE_TABLES[entity]
+        names = [column.name for column in hot.columns]
+        archived = archive.alias("archived")
+        candidates = select(archived.c.id).where(
+            archived.c.user_id == user_id,
+            archived.c.id.in_(ids),
+            *restore_guards(entity, archived)
+        )
+        moved = delete(archive).where(archive.c.id.in_(candidates)).returning(*[archive.c[name] for name in names]).cte("moved")
+        restored_values = {
+            "deleted_at": null(),
+            "updated_at": func.now(),
+            # Restored expenses only materialize payments due from today on (expenses only)
+            "materialized_through": func.current_date() - 1,
+        }
+        stmt = insert(hot).from_select(
+            names,
+            select(*[restored_values.get(name, moved.c[name]) for name in names])
+        ).returning(hot)
+        async with self.begin() as conn:
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+
+    async def count_archived(self, entity: ArchiveEntity, user_id: Optional[UUID] = None) -> int:
+        """Number of archived rows (all users or one)"""
+        _, archive = ARCHIVE_TABLES[entity]
+        stmt = select(func.count()).select_from(archive)
+        if user_id is not None:
+            stmt = stmt.where(archive.c.user_id == user_id)
+        async with self.connect() as conn:
+            result = await conn.execute(stmt)
+            return result.scalar_one()
@@ -1,20 +1,49 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy import select, and_
 from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.cache import get_cache, invalidate
 from app.core.database import finance_categories, get_db
 
 
+# Non-deleted categories per user (keyed by str(user_id))
+CATEGORY_CACHE = "categories"
+
+
 class CategoryRepository(BaseRepository):
     """Repository for category operations"""
     
-    def __init__(self):
-        super().__init__(finance_categories)
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(finance_categories, uow=uow)
+        self.cache = get_cache(CATEGORY_CACHE)
+    
+    async def get_version(self, user_id: UUID, category_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for a user's categories (or one category), used for ETags"""
+        conditions = [self.table.c.user_id == user_id]
+        if category_id:
+            conditions.append(self.table.c.id == category_id)
+        return await self.find_version(*conditions)
+    
+    async def invalidate_cache(self, user_id: UUID) -> None:
+        """Drop the user's cached categories (call after a committed write)"""
+        await invalidate(CATEGORY_CACHE, str(user_id))
     
     async def find_by_user_id(self, user_id: UUID, include_deleted: bool = False) -> List[Dict[str, Any]]:
-        """Find all categories for a user (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        """Find all categories for a user (excludes deleted by default, served from the cache when possible)"""
+        if not include_deleted:
+            key = str(user_id)
+            categories = self.cache.get(key)
+            if categories is None:
+                generation = self.cache.generation(key)
+                categories = await self._query_by_user_id(user_id, include_deleted)
+                self.cache.set(key, categories, generation)
+            return [dict(category) for category in categories]
+        return await self._query_by_user_id(user_id, include_deleted)
+    
+    async def _query_by_user_id(self, user_id: UUID, include_deleted: bool) -> List[Dict[str, Any]]:
+        async with self.connect() as conn:
             conditions = [self.table.c.user_id == user_id]
             
             # Exclude deleted categories by default
@@ -22,12 +51,17 @@ class CategoryRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
     
     async def find_by_user_and_id(self, user_id: UUID, category_id: UUID, include_deleted: bool = False) -> Dict[str, Any] | None:
         """Find a category by user ID and category ID (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        if not include_deleted:
+            for category in await self.find_by_user_id(user_id):
+                if category["id"] == category_id:
+                    return category
+            return None
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.id == category_id
@@ -38,7 +72,7 @@ class CategoryRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -46,7 +80,7 @@ class CategoryRepository(BaseRepository):
     
     async def find_by_user_and_name(self, user_id: UUID, name: str, exclude_id: UUID | None = None) -> Dict[str, Any] | None:
         """Find a category by user ID and name (for uniqueness check, excludes deleted)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.name == name,
@@ -56,7 +90,7 @@ class CategoryRepository(BaseRepository):
                 conditions.append(self.table.c.id != exclude_id)
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -64,11 +98,11 @@ class CategoryRepository(BaseRepository):
     
     async def soft_delete(self, category_id: UUID) -> bool:
         """Soft delete a category by setting deleted_at timestamp"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = self.table.update().where(
                 self.table.c.id == category_id,
                 self.table.c.deleted_at.is_(None)  # Only soft delete if not already deleted
             ).values(deleted_at=datetime.now(timezone.utc))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return result.rowcount > 0
 
@@ -1,20 +1,29 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
-from datetime import datetime, timezone
-from sqlalchemy import select, and_, or_
+from datetime import date, datetime, timezone
+from sqlalchemy import select, update, and_, or_, case, cast, column, values, func, Date, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from app.core.repository import BaseRepository
-from app.core.database import expenses, get_db
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import expenses, finance_transactions, get_db
 
 
 class ExpenseRepository(BaseRepository):
     """Repository for expense operations"""
     
-    def __init__(self):
-        super().__init__(expenses)
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(expenses, uow=uow)
+    
+    async def get_version(self, user_id: UUID, expense_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for a user's expenses (or one expense), used for ETags"""
+        conditions = [self.table.c.user_id == user_id]
+        if expense_id:
+            conditions.append(self.table.c.id == expense_id)
+        return await self.find_version(*conditions)
     
     async def find_by_user_id(self, user_id: UUID, is_active: bool = None, include_deleted: bool = False) -> List[Dict[str, Any]]:
         """Find all expenses for a user (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [self.table.c.user_id == user_id]
             
             # Exclude deleted expenses by default
@@ -25,12 +34,68 @@ class ExpenseRepository(BaseRepository):
                 conditions.append(self.table.c.is_active == is_active)
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
     
+    async def find_due_for_materialization(self, through: date, limit: int) -> List[Dict[str, Any]]:
+        """Find active expenses (all users) whose payments are not yet materialized through a date.
+
+        Each row carries paid_months: the first day of every month, from the
+        one where materialization resumes, that already has a non-deleted
+        transaction linked to the expense (e.g. a payment posted by hand), or
+        None. Rows are locked (FOR UPDATE SKIP LOCKED) so concurrent runs split
+        the work instead of waiting on each other; call inside a unit of work.
+        """
+        transactions = finance_transactions
+        paid_month = cast(func.date_trunc("month", transactions.c.date), Date)
+        paid_months = (
+            select(func.array_agg(paid_month.distinct()))
+            .where(
+                transactions.c.expense_id == self.table.c.id,
+                transactions.c.deleted_at.is_(None),
+                transactions.c.date >= func.date_trunc(
+                    "month", func.coalesce(self.table.c.materialized_through, self.table.c.start_date)
+                )
+            )
+            .scalar_subquery()
+            .label("paid_months")
+        )
+        async with self.connect() as conn:
+            stmt = (
+                select(self.table, paid_months)
+                .where(
+                    self.table.c.is_active == True,
+                    self.table.c.deleted_at.is_(None),
+                    self.table.c.start_date <= through,
+                    or_(
+                        self.table.c.materialized_through.is_(None),
+                        self.table.c.materialized_through < through
+                    )
+                )
+                .order_by(self.table.c.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def mark_materialized(self, expense_ids: List[UUID], through: date) -> int:
+        """Record that expenses' payments are materialized through a date, return rows updated"""
+        if not expense_ids:
+            return 0
+        async with self.begin() as conn:
+            stmt = (
+                update(self.table)
+                .where(self.table.c.id.in_(expense_ids))
+                # Bookkeeping only: keep updated_at (and the expense ETags) unchanged
+                .values(materialized_through=through, updated_at=self.table.c.updated_at)
+            )
+            result = await conn.execute(stmt)
+            return result.rowcount
+    
     async def find_by_user_and_id(self, user_id: UUID, expense_id: UUID, include_deleted: bool = False) -> Dict[str, Any] | None:
         """Find an expense by user ID and expense ID (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.id == expense_id
@@ -41,7 +106,7 @@ class ExpenseRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -49,11 +114,146 @@ class ExpenseRepository(BaseRepository):
     
     async def soft_delete(self, expense_id: UUID) -> bool:
         """Soft delete an expense by setting deleted_at timestamp"""
-        with self.db.connect() as conn:
+        async with self.begin() as conn:
             stmt = self.table.update().where(
                 self.table.c.id == expense_id
             ).values(deleted_at=datetime.now(timezone.utc))
-            result = conn.execute(stmt)
-            conn.commit()
+            result = await conn.execute(stmt)
             return result.rowcount > 0
 
+    
+    async def add_payment(self, user_id: UUID, expense_id: UUID, delta: int = 1) -> Dict[str, Any] | None:
+        """Atomically add (delta=1) or remove (delta=-1) a payment of an installment expense, return the updated row.
+
+        One conditional UPDATE ... RETURNING, so concurrent payments never lose
+        an increment. Reaching total_payments deactivates the expense; dropping
+        back below it reactivates an expense that was completed. Returns None for
+        ongoing, deleted or missing expenses, or when the count would go below 0.
+        """
+        old_completed = self.table.c.payments_completed
+        new_completed = old_completed + delta
+        total = self.table.c.total_payments
+        stmt = (
+            update(self.table)
+            .where(
+                self.table.c.id == expense_id,
+                self.table.c.user_id == user_id,
+                self.table.c.expense_type == "installment",
+                self.table.c.deleted_at.is_(None),
+                new_completed >= 0
+            )
+            .values(
+                payments_completed=new_completed,
+                is_active=case(
+                    (and_(total.isnot(None), new_completed >= total), False),
+                    (and_(total.isnot(None), old_completed >= total, new_completed < total), True),
+                    else_=self.table.c.is_active
+                )
+            )
+            .returning(self.table)
+        )
+        async with self.begin() as conn:
+            result = await conn.execute(stmt)
+            row = result.fetchone()
+            if row:
+                return dict(row._mapping)
+            return None
+    
+    async def record_payments(self, user_id: Optional[UUID], payment_counts: Dict[UUID, int]) -> int:
+        """Add payments to many installment expenses in one UPDATE ... FROM (VALUES ...), return rows updated.
+
+        Expenses reaching total_payments are deactivated; ongoing and deleted expenses are skipped.
+        user_id None (system jobs) updates expenses of any user.
+        """
+        if not payment_counts:
+            return 0
+        counts = values(
+            column("expense_id", PG_UUID(as_uuid=True)),
+            column("payments", Integer),
+            name="counts"
+        ).data(sorted(payment_counts.items(), key=lambda item: str(item[0])))
+        new_completed = self.table.c.payments_completed + counts.c.payments
+        stmt = (
+            update(self.table)
+            .where(
+                self.table.c.id == counts.c.expense_id,
+                self.table.c.expense_type == "installment",
+                self.table.c.deleted_at.is_(None)
+            )
+            .values(
+                payments_completed=new_completed,
+                is_active=case(
+                    (and_(self.table.c.total_payments.isnot(None), new_completed >= self.table.c.total_payments), False),
+                    else_=self.table.c.is_active
+                )
+            )
+        )
+        if user_id is not None:
+            stmt = stmt.where(self.table.c.user_id == user_id)
+        async with self.begin() as conn:
+            result = await conn.execute(stmt)
+            return result.rowcount
+    
+    async def reconcile_payments(self, user_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+        """Recompute installment payments_completed (and is_active) from linked transactions, return corrected rows.
+
+        One UPDATE ... FROM over a GROUP BY of non-deleted linked transactions,
+        for all users or one. is_active follows the same rules as add_payment:
+        completed installments are deactivated, and an installment that was
+        completed but has fewer payments is reactivated; manual deactivation is kept.
+        Returned rows carry the previous values as previous_payments_completed and previous_is_active.
+        """
+        tx = finance_transactions
+        counts = select(tx.c.expense_id, func.count().label("payments")).where(
+            tx.c.deleted_at.is_(None),
+            tx.c.expense_id.isnot(None)
+        )
+        if user_id is not None:
+            counts = counts.where(tx.c.user_id == user_id)
+        counts = counts.group_by(tx.c.expense_id).subquery("counts")
+
+        previous = self.table.alias("previous")
+        actual = func.coalesce(counts.c.payments, 0)
+        total = previous.c.total_payments
+        conditions = [previous.c.expense_type == "installment", previous.c.deleted_at.is_(None)]
+        if user_id is not None:
+            conditions.append(previous.c.user_id == user_id)
+        source = (
+            select(
+                previous.c.id,
+                previous.c.payments_completed.label("previous_payments_completed"),
+                previous.c.is_active.label("previous_is_active"),
+                actual.label("payments_completed"),
+                case(
+                    (and_(total.isnot(None), actual >= total), False),
+                    (and_(total.isnot(None), previous.c.payments_completed >= total), True),
+                    else_=previous.c.is_active
+                ).label("is_active")
+            )
+            .select_from(previous.outerjoin(counts, counts.c.expense_id == previous.c.id))
+            .where(*conditions)
+            .subquery("source")
+        )
+        stmt = (
+            update(self.table)
+            .where(
+                self.table.c.id == source.c.id,
+                or_(
+                    source.c.previous_payments_completed != source.c.payments_completed,
+                    source.c.previous_is_active != source.c.is_active
+                )
+            )
+            .values(payments_completed=source.c.payments_completed, is_active=source.c.is_active)
+            .returning(
+                self.table.c.id,
+                self.table.c.user_id,
+                self.table.c.name,
+                source.c.previous_payments_completed,
+                self.table.c.payments_completed,
+                source.c.previous_is_active,
+                self.table.c.is_active
+            )
+        )
+        async with self.begin() as conn:
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
@@ -1,19 +1,24 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from sqlalchemy import select, and_
 from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
 from app.core.database import notes, get_db
 
 
 class NoteRepository(BaseRepository):
     """Repository for monthly and yearly note operations"""
     
-    def __init__(self):
-        super().__init__(notes)
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(notes, uow=uow)
+    
+    async def get_version(self, user_id: UUID) -> Tuple[Any, ...]:
+        """Change marker for a user's notes, used for ETags"""
+        return await self.find_version(self.table.c.user_id == user_id)
     
     async def find_by_user_id(self, user_id: UUID, domain: str = "finance", include_deleted: bool = False) -> List[Dict[str, Any]]:
         """Find all monthly and yearly notes for a user (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.domain == domain
@@ -24,7 +29,7 @@ class NoteRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
     
     async def find_by_user_and_period(
@@ -36,7 +41,7 @@ class NoteRepository(BaseRepository):
         include_deleted: bool = False
     ) -> Dict[str, Any] | None:
         """Find a monthly or yearly note by user ID, year, month (optional), and domain (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.domain == domain,
@@ -54,7 +59,7 @@ class NoteRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -62,7 +67,7 @@ class NoteRepository(BaseRepository):
     
     async def find_by_user_and_id(self, user_id: UUID, note_id: UUID, include_deleted: bool = False) -> Dict[str, Any] | None:
         """Find a note by user ID and note ID (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.id == note_id
@@ -73,7 +78,7 @@ class NoteRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -82,13 +87,12 @@ class NoteRepository(BaseRepository):
     async def soft_delete(self, note_id: UUID) -> bool:
         """Soft delete a note by setting deleted_at timestamp"""
         from datetime import datetime, timezone
-        with self.db.connect() as conn:
+        async with self.begin() as conn:
             update_stmt = (
                 self.table.update()
                 .where(self.table.c.id == note_id)
                 .values(deleted_at=datetime.now(timezone.utc))
             )
-            result = conn.execute(update_stmt)
-            conn.commit()
+            result = await conn.execute(update_stmt)
             return result.rowcount > 0
 
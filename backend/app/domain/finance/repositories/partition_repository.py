@@ -0,0 +1,39 @@
+from datetime import date
+from typing import Dict, Optional
+from sqlalchemy import text
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import finance_transactions
+from app.core.partitions import (
+    DateRange,
+    LIST_PARTITIONS_SQL,
+    create_partition_sql,
+    detach_partition_sql,
+    parse_bound,
+)
+
+
+class PartitionRepository(BaseRepository):
+    """Repository for the date-range partitions of finance_transactions"""
+
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(finance_transactions, uow=uow)
+
+    async def find_partitions(self) -> Dict[str, Optional[DateRange]]:
+        """Partition name -> [start, end) bounds (None for the default partition)"""
+        async with self.connect() as conn:
+            result = await conn.execute(text(LIST_PARTITIONS_SQL), {"table": self.table.name})
+            return {row.name: parse_bound(row.bound) for row in result.fetchall()}
+
+    async def create_partition(self, name: str, start: date, end: date) -> None:
+        """Create and attach a partition, moving its range's rows out of the default partition"""
+        async with self.begin() as conn:
+            # The table definition lists stored columns only (see database.py)
+            columns = [column.name for column in self.table.columns]
+            for statement in create_partition_sql(self.table.name, name, start, end, columns):
+                await conn.execute(text(statement))
+
+    async def detach_partition(self, name: str) -> None:
+        """Detach a partition; its rows stay in a standalone table of the same name"""
+        async with self.begin() as conn:
+            await conn.execute(text(detach_partition_sql(self.table.name, name)))
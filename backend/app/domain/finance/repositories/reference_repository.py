@@ -0,0 +1,125 @@
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+from sqlalchemy import select, exists, literal, union_all
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import finance_categories, properties, expenses
+from app.core.cache import get_cache
+from app.domain.finance.repositories.category_repository import CATEGORY_CACHE
+from app.domain.settings.repositories.property_repository import PROPERTY_CACHE, PROPERTY_CACHE_KEY
+
+
+class ReferenceRepository(BaseRepository):
+    """Repository for existence checks on the rows a transaction or expense references"""
+
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(None, uow=uow)
+
+    def known_category_ids(self, user_id: UUID) -> Set[UUID]:
+        """The user's non-deleted category ids if they are already cached (empty otherwise).
+
+        Only peeks: a miss is left to the EXISTS query rather than loading every
+        category, and the cache is never filled from an uncommitted transaction.
+        """
+        categories = get_cache(CATEGORY_CACHE).get(str(user_id))
+        return {category["id"] for category in categories} if categories else set()
+
+    def known_property_ids(self) -> Set[UUID]:
+        """Non-deleted property ids if they are already cached (empty otherwise, see known_category_ids)"""
+        cached = get_cache(PROPERTY_CACHE).get(PROPERTY_CACHE_KEY)
+        return {property["id"] for property in cached} if cached else set()
+
+    async def check_references(
+        self,
+        user_id: UUID,
+        category_id: Optional[UUID] = None,
+        property_id: Optional[UUID] = None,
+        expense_id: Optional[UUID] = None
+    ) -> Dict[str, bool]:
+        """Check category ownership, property liveness and expense ownership in one query.
+
+        Only the references that are provided are checked; the result maps
+        'category', 'property' and 'expense' to whether the referenced row exists.
+        Categories and properties already in the cache are not queried.
+        """
+        found: Dict[str, bool] = {}
+        if category_id is not None and category_id in self.known_category_ids(user_id):
+            found["category"], category_id = True, None
+        if property_id is not None and property_id in self.known_property_ids():
+            found["property"], property_id = True, None
+
+        checks = []
+        if category_id is not None:
+            checks.append(exists().where(
+                finance_categories.c.id == category_id,
+                finance_categories.c.user_id == user_id,
+                finance_categories.c.deleted_at.is_(None)
+            ).label("category"))
+        if property_id is not None:
+            checks.append(exists().where(
+                properties.c.id == property_id,
+                properties.c.deleted_at.is_(None)
+            ).label("property"))
+        if expense_id is not None:
+            checks.append(exists().where(
+                expenses.c.id == expense_id,
+                expenses.c.user_id == user_id,
+                expenses.c.deleted_at.is_(None)
+            ).label("expense"))
+
+        if not checks:
+            return found
+
+        async with self.connect() as conn:
+            result = await conn.execute(select(*checks))
+            return {**found, **result.fetchone()._mapping}
+
+    async def find_existing(
+        self,
+        user_id: UUID,
+        category_ids: Iterable[UUID] = (),
+        property_ids: Iterable[UUID] = (),
+        expense_ids: Iterable[UUID] = ()
+    ) -> Dict[str, Set[UUID]]:
+        """Resolve many category, property and expense ids in one set-based query.
+
+        Same rules as check_references; the result maps 'category', 'property' and
+        'expense' to the subset of the given ids that exist. Ids missing from the
+        cache are still checked in the database.
+        """
+        category_ids, property_ids, expense_ids = set(category_ids), set(property_ids), set(expense_ids)
+        found: Dict[str, Set[UUID]] = {
+            "category": category_ids & self.known_category_ids(user_id) if category_ids else set(),
+            "property": property_ids & self.known_property_ids() if property_ids else set(),
+            "expense": set()
+        }
+        category_ids -= found["category"]
+        property_ids -= found["property"]
+
+        selects = []
+        if category_ids:
+            selects.append(select(literal("category").label("kind"), finance_categories.c.id).where(
+                finance_categories.c.id.in_(category_ids),
+                finance_categories.c.user_id == user_id,
+                finance_categories.c.deleted_at.is_(None)
+            ))
+        if property_ids:
+            selects.append(select(literal("property").label("kind"), properties.c.id).where(
+                properties.c.id.in_(property_ids),
+                properties.c.deleted_at.is_(None)
+            ))
+        if expense_ids:
+            selects.append(select(literal("expense").label("kind"), expenses.c.id).where(
+                expenses.c.id.in_(expense_ids),
+                expenses.c.user_id == user_id,
+                expenses.c.deleted_at.is_(None)
+            ))
+
+        if not selects:
+            return found
+
+        async with self.connect() as conn:
+            result = await conn.execute(union_all(*selects))
+            for kind, id in result.fetchall():
+                found[kind].add(id)
+        return found
@@ -0,0 +1,244 @@
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from uuid import UUID
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import select, delete, insert, update, and_, desc, func, case, cast, column, literal_column, table, text, Date, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import finance_transaction_rollups, finance_transactions, finance_categories
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing a date"""
+    return value.replace(day=1)
+
+
+class RollupRepository(BaseRepository):
+    """Repository for the monthly finance_transactions rollup"""
+
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(finance_transaction_rollups, uow=uow)
+
+    async def get_version(self, user_id: UUID) -> Tuple[Any, ...]:
+        """Change marker for all of a user's transactions, used for ETags.
+
+        Every transaction write updates the rollup in the same transaction, so
+        this reads a few rollup rows instead of the user's whole history.
+        """
+        async with self.connect() as conn:
+            stmt = select(
+                func.sum(self.table.c.transaction_count),
+                func.sum(self.table.c.total_amount),
+                func.max(self.table.c.updated_at)
+            ).where(self.table.c.user_id == user_id)
+            result = await conn.execute(stmt)
+            return tuple(result.fetchone())
+
+    async def apply_transactions(self, transactions: Iterable[Dict[str, Any]], sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) transactions from the rollup with one upsert.
+
+        Deltas are pre-aggregated per rollup key because a single
+        INSERT ... ON CONFLICT DO UPDATE cannot touch the same row twice.
+        """
+        deltas: Dict[Tuple[UUID, UUID, UUID, date], List] = {}
+        for tx in transactions:
+            key = (tx["user_id"], tx["property_id"], tx["category_id"], month_start(tx["date"]))
+            delta = deltas.setdefault(key, [Decimal(0), 0])
+            delta[0] += Decimal(str(tx["amount"])) * sign
+            delta[1] += sign
+
+        if not deltas:
+            return
+
+        # Sorted so concurrent writers lock rollup rows in the same order
+        values = [
+            {
+                "user_id": user_id,
+                "property_id": property_id,
+                "category_id": category_id,
+                "year_month": year_month,
+                "total_amount": total_amount,
+                "transaction_count": transaction_count,
+            }
+            for (user_id, property_id, category_id, year_month), (total_amount, transaction_count) in sorted(
+                deltas.items(), key=lambda item: tuple(str(part) for part in item[0])
+            )
+        ]
+        stmt = pg_insert(self.table).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                self.table.c.user_id,
+                self.table.c.property_id,
+                self.table.c.category_id,
+                self.table.c.year_month,
+            ],
+            set_={
+                "total_amount": self.table.c.total_amount + stmt.excluded.total_amount,
+                "transaction_count": self.table.c.transaction_count + stmt.excluded.transaction_count,
+                "updated_at": func.now(),
+            },
+        )
+        async with self.begin() as conn:
+            await conn.execute(stmt)
+
+    async def remove_detached_partition(self, partition: str) -> int:
+        """Subtract the non-deleted rows of a just-detached finance_transactions partition, return rollup rows updated.
+
+        Call in the transaction that detached it: the detach lock keeps the
+        partition's rows unchanged until commit. One UPDATE over the partition's
+        per-month aggregates.
+        """
+        detached = table(partition, *[column(c.name, c.type) for c in finance_transactions.c]).alias("detached")
+        bucket = cast(func.date_trunc(literal_column("'month'"), detached.c.date), Date)
+        totals = (
+            select(
+                detached.c.user_id,
+                detached.c.property_id,
+                detached.c.category_id,
+                bucket.label("year_month"),
+                func.sum(detached.c.amount).label("total_amount"),
+                func.count().label("transaction_count"),
+            )
+            .where(detached.c.deleted_at.is_(None))
+            .group_by(detached.c.user_id, detached.c.property_id, detached.c.category_id, bucket)
+            .subquery("totals")
+        )
+        stmt = (
+            update(self.table)
+            .where(
+                self.table.c.user_id == totals.c.user_id,
+                self.table.c.property_id == totals.c.property_id,
+                self.table.c.category_id == totals.c.category_id,
+                self.table.c.year_month == totals.c.year_month,
+            )
+            .values(
+                total_amount=self.table.c.total_amount - totals.c.total_amount,
+                transaction_count=self.table.c.transaction_count - totals.c.transaction_count,
+                updated_at=func.now(),
+            )
+        )
+        async with self.begin() as conn:
+            result = await conn.execute(stmt)
+            return result.rowcount
+
+    async def rebuild(self, user_id: Optional[UUID] = None) -> int:
+        """Recompute the rollup from finance_transactions (all users or one), return rows written.
+
+        Takes a lock that blocks concurrent rollup upserts until the rebuild
+        commits, so transactions written meanwhile are neither lost nor counted twice.
+        """
+        tx = finance_transactions
+        bucket = cast(func.date_trunc(literal_column("'month'"), tx.c.date), Date)
+        conditions = [tx.c.deleted_at.is_(None)]
+        delete_stmt = delete(self.table)
+        if user_id:
+            conditions.append(tx.c.user_id == user_id)
+            delete_stmt = delete_stmt.where(self.table.c.user_id == user_id)
+
+        source = (
+            select(
+                tx.c.user_id,
+                tx.c.property_id,
+                tx.c.category_id,
+                bucket.label("year_month"),
+                func.sum(tx.c.amount),
+                func.count(),
+            )
+            .where(and_(*conditions))
+            .group_by(tx.c.user_id, tx.c.property_id, tx.c.category_id, bucket)
+        )
+        insert_stmt = insert(self.table).from_select(
+            ["user_id", "property_id", "category_id", "year_month", "total_amount", "transaction_count"],
+            source,
+        )
+        async with self.begin() as conn:
+            await conn.execute(text("LOCK TABLE finance_transaction_rollups IN SHARE ROW EXCLUSIVE MODE"))
+            await conn.execute(delete_stmt)
+            result = await conn.execute(insert_stmt)
+            return result.rowcount
+
+    async def sum_by_category(self, user_id: UUID, start_month: date, end_month: date) -> List[Dict[str, Any]]:
+        """Sum and count per category (with name/type/color) for whole months start_month..end_month"""
+        async with self.connect() as conn:
+            categories = finance_categories
+            stmt = (
+                select(
+                    self.table.c.category_id,
+                    categories.c.name,
+                    categories.c.type,
+                    categories.c.color,
+                    func.sum(self.table.c.total_amount).label("total"),
+                    func.sum(self.table.c.transaction_count).label("count")
+                )
+                .select_from(self.table.join(categories, categories.c.id == self.table.c.category_id))
+                .where(
+                    self.table.c.user_id == user_id,
+                    self.table.c.year_month >= month_start(start_month),
+                    self.table.c.year_month <= month_start(end_month),
+                    self.table.c.transaction_count > 0
+                )
+                .group_by(self.table.c.category_id, categories.c.name, categories.c.type, categories.c.color)
+                .order_by(desc("total"))
+            )
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+
+    async def aggregate_series(
+        self,
+        user_id: UUID,
+        granularity: str,
+        start_month: date,
+        end_month: date,
+        property_id: Optional[UUID] = None,
+        category_id: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """Income and expense totals per month/year bucket from the rollup, gap-filled with zeros.
+
+        `granularity` must be 'month' or 'year' (it is inlined into the SQL).
+        """
+        unit = literal_column(f"'{granularity}'")
+        step = literal_column(f"interval '1 {granularity}'")
+
+        def truncate(value):
+            return cast(func.date_trunc(unit, cast(value, DateTime)), Date)
+
+        async with self.connect() as conn:
+            categories = finance_categories
+            conditions = [
+                self.table.c.user_id == user_id,
+                self.table.c.year_month >= month_start(start_month),
+                self.table.c.year_month <= month_start(end_month)
+            ]
+            if property_id:
+                conditions.append(self.table.c.property_id == property_id)
+            if category_id:
+                conditions.append(self.table.c.category_id == category_id)
+
+            bucket = truncate(self.table.c.year_month).label("bucket")
+            totals = (
+                select(
+                    bucket,
+                    func.sum(case((categories.c.type == "income", self.table.c.total_amount), else_=0)).label("income"),
+                    func.sum(case((categories.c.type == "expense", self.table.c.total_amount), else_=0)).label("expense")
+                )
+                .select_from(self.table.join(categories, categories.c.id == self.table.c.category_id))
+                .where(and_(*conditions))
+                .group_by(bucket)
+                .subquery("totals")
+            )
+            buckets = select(
+                cast(func.generate_series(truncate(start_month), truncate(end_month), step), Date).label("bucket")
+            ).subquery("buckets")
+
+            stmt = (
+                select(
+                    buckets.c.bucket,
+                    func.coalesce(totals.c.income, 0).label("income"),
+                    func.coalesce(totals.c.expense, 0).label("expense")
+                )
+                .select_from(buckets.outerjoin(totals, totals.c.bucket == buckets.c.bucket))
+                .order_by(buckets.c.bucket)
+            )
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
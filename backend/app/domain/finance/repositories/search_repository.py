@@ -0,0 +1,131 @@
+from typing import List, Dict, Any, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, union_all, desc, func, literal, literal_column, cast, null, Date, Integer, DECIMAL
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import finance_transactions, notes
+from app.domain.finance.dto.search_dto import SearchEntity
+
+# Must match the configuration of the generated search_vector columns (migration 0008)
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+# Matches are marked with control characters instead of HTML tags, then split out
+# into offsets (split_headline) so the snippet stays plain text
+MATCH_START = "\x02"
+MATCH_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel=\"{MATCH_START}\", StopSel=\"{MATCH_STOP}\", "
+    "MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter=\" … \""
+)
+
+
+def search_vector(table) -> Any:
+    """A table's generated search_vector column (not part of the table definitions)"""
+    return literal_column(f"{table.name}.search_vector")
+
+
+def split_headline(headline: str) -> Tuple[str, List[Dict[str, int]]]:
+    """Split a ts_headline result into plain text and the [start, end) offsets of its matches"""
+    first, *parts = headline.split(MATCH_START)
+    text = first
+    matches = []
+    for part in parts:
+        match, _, rest = part.partition(MATCH_STOP)
+        matches.append({"start": len(text), "end": len(text) + len(match)})
+        text += match + rest
+    return text, matches
+
+
+class SearchRepository(BaseRepository):
+    """Repository for full-text search over transactions and notes"""
+    
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(None, uow=uow)
+    
+    async def search(
+        self,
+        user_id: UUID,
+        query: str,
+        entities: List[SearchEntity],
+        domain: str = "finance",
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Rank a user's non-deleted transactions and notes (of a domain) matching a query.
+
+        The query uses web search syntax (websearch_to_tsquery: words, "phrases",
+        OR, -excluded). Matches come from the GIN indexes on search_vector and are
+        ordered by ts_rank_cd, then id; snippets (ts_headline) are only computed
+        for the returned page and come back as plain text plus match offsets.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        branches = []
+        if SearchEntity.transactions in entities:
+            transactions = finance_transactions
+            vector = search_vector(transactions)
+            branches.append(
+                select(
+                    literal(SearchEntity.transactions.value).label("type"),
+                    transactions.c.id,
+                    func.ts_rank_cd(vector, tsquery).label("rank"),
+                    func.concat_ws(" · ", transactions.c.description, transactions.c.notes, transactions.c.payment_method).label("document"),
+                    transactions.c.date,
+                    transactions.c.amount,
+                    cast(null(), Integer).label("year"),
+                    cast(null(), Integer).label("month")
+                ).where(
+                    transactions.c.user_id == user_id,
+                    transactions.c.deleted_at.is_(None),
+                    vector.op("@@")(tsquery)
+                )
+            )
+        if SearchEntity.notes in entities:
+            vector = search_vector(notes)
+            branches.append(
+                select(
+                    literal(SearchEntity.notes.value).label("type"),
+                    notes.c.id,
+                    func.ts_rank_cd(vector, tsquery).label("rank"),
+                    notes.c.notes.label("document"),
+                    cast(null(), Date).label("date"),
+                    cast(null(), DECIMAL(10, 2)).label("amount"),
+                    notes.c.year,
+                    notes.c.month
+                ).where(
+                    notes.c.user_id == user_id,
+                    notes.c.domain == domain,
+                    notes.c.deleted_at.is_(None),
+                    vector.op("@@")(tsquery)
+                )
+            )
+        if not branches:
+            return []
+        
+        matches = (branches[0] if len(branches) == 1 else union_all(*branches)).subquery("matches")
+        page = (
+            select(matches)
+            .order_by(desc(matches.c.rank), desc(matches.c.id))
+            .limit(limit)
+            .offset(offset)
+            .subquery("page")
+        )
+        stmt = (
+            select(
+                page.c.type,
+                page.c.id,
+                page.c.rank,
+                page.c.date,
+                page.c.amount,
+                page.c.year,
+                page.c.month,
+                func.ts_headline(SEARCH_CONFIG, page.c.document, tsquery, HEADLINE_OPTIONS).label("snippet")
+            )
+            .order_by(desc(page.c.rank), desc(page.c.id))
+        )
+        async with self.connect() as conn:
+            result = await conn.execute(stmt)
+            rows = []
+            for row in result.fetchall():
+                row = dict(row._mapping)
+                row["snippet"], row["matches"] = split_headline(row["snippet"])
+                rows.append(row)
+            return rows
@@ -1,16 +1,33 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from uuid import UUID
 from datetime import date
-from sqlalchemy import select, and_, or_, desc
+from sqlalchemy import select, insert, and_, or_, desc, func, tuple_, case, cast, literal_column, Date, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.core.repository import BaseRepository
-from app.core.database import finance_transactions, get_db
+from app.core.unit_of_work import UnitOfWork
+from app.core.database import finance_transactions, finance_categories, get_db
+
+
+def tag_conditions(tags_any: Optional[List[str]] = None, tags_all: Optional[List[str]] = None) -> List[Any]:
+    """Tag filters as JSONB containment (@>), served by the tags jsonb_path_ops index"""
+    tags = finance_transactions.c.tags
+    conditions = []
+    if tags_any:
+        conditions.append(or_(*[tags.contains([tag]) for tag in tags_any]))
+    if tags_all:
+        conditions.append(tags.contains(list(tags_all)))
+    return conditions
 
 
 class TransactionRepository(BaseRepository):
     """Repository for transaction operations"""
     
-    def __init__(self):
-        super().__init__(finance_transactions)
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(finance_transactions, uow=uow)
+    
+    async def get_version(self, user_id: UUID, transaction_id: UUID) -> Tuple[Any, ...]:
+        """Change marker for one transaction, used for ETags (lists use RollupRepository.get_version)"""
+        return await self.find_version(self.table.c.user_id == user_id, self.table.c.id == transaction_id)
     
     async def find_by_user_id(
         self, 
@@ -20,10 +37,19 @@ class TransactionRepository(BaseRepository):
         category_id: Optional[UUID] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
-        include_deleted: bool = False
+        include_deleted: bool = False,
+        after: Optional[Tuple[date, UUID]] = None,
+        tags_any: Optional[List[str]] = None,
+        tags_all: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Find all transactions for a user with optional filters (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        """Find all transactions for a user with optional filters (excludes deleted by default).
+
+        Rows are ordered by (date, id) descending. `after` is a keyset position
+        (date, id): only rows strictly after it in that order are returned, so a
+        page costs one index range scan regardless of depth. tags_any keeps rows
+        with at least one of the tags, tags_all rows with every one of them.
+        """
+        async with self.connect() as conn:
             conditions = [self.table.c.user_id == user_id]
             
             # Exclude deleted transactions by default
@@ -36,20 +62,307 @@ class TransactionRepository(BaseRepository):
                 conditions.append(self.table.c.date <= end_date)
             if category_id:
                 conditions.append(self.table.c.category_id == category_id)
+            if after:
+                conditions.append(tuple_(self.table.c.date, self.table.c.id) < tuple_(*after))
+            conditions.extend(tag_conditions(tags_any, tags_all))
             
-            stmt = select(self.table).where(and_(*conditions)).order_by(desc(self.table.c.date))
+            stmt = (
+                select(self.table)
+                .where(and_(*conditions))
+                .order_by(desc(self.table.c.date), desc(self.table.c.id))
+            )
             
             if limit:
                 stmt = stmt.limit(limit)
             if offset:
                 stmt = stmt.offset(offset)
             
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def create_many(self, rows: List[Dict[str, Any]], skip_duplicates: bool = False) -> List[Dict[str, Any]]:
+        """Insert many transactions with batched multi-row INSERTs, return the created rows.
+
+        With skip_duplicates, rows whose fingerprint already exists for the user
+        (among non-deleted rows) are skipped with ON CONFLICT DO NOTHING and are
+        not returned. The unique index includes date (the partition key), which
+        the fingerprint already covers.
+        """
+        if not rows:
+            return []
+        stmt = insert(self.table)
+        if skip_duplicates:
+            stmt = pg_insert(self.table).on_conflict_do_nothing(
+                index_elements=[self.table.c.user_id, self.table.c.fingerprint, self.table.c.date],
+                index_where=and_(self.table.c.deleted_at.is_(None), self.table.c.fingerprint.isnot(None))
+            )
+        async with self.begin() as conn:
+            # executemany + RETURNING is sent as multi-row INSERT ... VALUES pages
+            result = await conn.execute(stmt.returning(self.table), rows)
+            return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def lock_fingerprint(self, fingerprint: str) -> None:
+        """Serialize writers of a fingerprint until the unit of work ends (transaction-level advisory lock).
+
+        The unique fingerprint index includes date, so it cannot stop the same
+        fingerprint from being inserted under another date; writers that check
+        for it first take this lock so two of them cannot both miss.
+        """
+        async with self.begin() as conn:
+            await conn.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(fingerprint, 0))))
+    
+    async def find_by_fingerprint(
+        self,
+        user_id: UUID,
+        fingerprint: str,
+        transaction_date: Optional[date] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find the non-deleted transaction with a fingerprint (pass its date to read a single partition)"""
+        async with self.connect() as conn:
+            conditions = [
+                self.table.c.user_id == user_id,
+                self.table.c.fingerprint == fingerprint,
+                self.table.c.deleted_at.is_(None)
+            ]
+            if transaction_date:
+                conditions.append(self.table.c.date == transaction_date)
+            stmt = select(self.table).where(and_(*conditions))
+            result = await conn.execute(stmt)
+            row = result.fetchone()
+            if row:
+                return dict(row._mapping)
+            return None
+    
+    async def stream_by_user_id(
+        self,
+        user_id: UUID,
+        columns: List[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[UUID] = None,
+        batch_size: int = 1000,
+        tags_any: Optional[List[str]] = None,
+        tags_all: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream a user's non-deleted transactions in batches from a server-side cursor.
+
+        Uses its own pooled connection (never the unit of work's) because it stays
+        open for as long as the consumer keeps reading. Same order as find_by_user_id.
+        """
+        conditions = [self.table.c.user_id == user_id, self.table.c.deleted_at.is_(None)]
+        if start_date:
+            conditions.append(self.table.c.date >= start_date)
+        if end_date:
+            conditions.append(self.table.c.date <= end_date)
+        if category_id:
+            conditions.append(self.table.c.category_id == category_id)
+        conditions.extend(tag_conditions(tags_any, tags_all))
+        
+        stmt = (
+            select(*[self.table.c[name] for name in columns])
+            .where(and_(*conditions))
+            .order_by(desc(self.table.c.date), desc(self.table.c.id))
+            .execution_options(yield_per=batch_size)
+        )
+        async with self.db.connect() as conn:
+            result = await conn.stream(stmt)
+            async for batch in result.mappings().partitions():
+                yield [dict(row) for row in batch]
+    
+    async def sum_by_category(self, user_id: UUID, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Sum and count a user's transactions per category (with category name/type/color) for a date range"""
+        async with self.connect() as conn:
+            categories = finance_categories
+            stmt = (
+                select(
+                    self.table.c.category_id,
+                    categories.c.name,
+                    categories.c.type,
+                    categories.c.color,
+                    func.sum(self.table.c.amount).label("total"),
+                    func.count().label("count")
+                )
+                .select_from(self.table.join(categories, categories.c.id == self.table.c.category_id))
+                .where(
+                    self.table.c.user_id == user_id,
+                    self.table.c.deleted_at.is_(None),
+                    self.table.c.date >= start_date,
+                    self.table.c.date <= end_date
+                )
+                .group_by(self.table.c.category_id, categories.c.name, categories.c.type, categories.c.color)
+                .order_by(desc("total"))
+            )
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def tag_facets(
+        self,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[UUID] = None,
+        tags_any: Optional[List[str]] = None,
+        tags_all: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Count and income/expense totals per tag of a user's non-deleted transactions.
+
+        Takes the same filters as find_by_user_id; with tag filters (drilling
+        down) the candidate rows come from the tags index. Ordered by count,
+        then tag.
+        """
+        categories = finance_categories
+        conditions = [
+            self.table.c.user_id == user_id,
+            self.table.c.deleted_at.is_(None),
+            func.jsonb_typeof(self.table.c.tags) == "array"
+        ]
+        if start_date:
+            conditions.append(self.table.c.date >= start_date)
+        if end_date:
+            conditions.append(self.table.c.date <= end_date)
+        if category_id:
+            conditions.append(self.table.c.category_id == category_id)
+        conditions.extend(tag_conditions(tags_any, tags_all))
+        
+        tagged = (
+            select(
+                func.jsonb_array_elements_text(self.table.c.tags).label("tag"),
+                self.table.c.amount,
+                categories.c.type
+            )
+            .select_from(self.table.join(categories, categories.c.id == self.table.c.category_id))
+            .where(and_(*conditions))
+            .subquery("tagged")
+        )
+        count = func.count().label("count")
+        stmt = (
+            select(
+                tagged.c.tag,
+                count,
+                func.sum(tagged.c.amount).label("total"),
+                func.coalesce(func.sum(case((tagged.c.type == "income", tagged.c.amount))), 0).label("income"),
+                func.coalesce(func.sum(case((tagged.c.type == "expense", tagged.c.amount))), 0).label("expense")
+            )
+            .group_by(tagged.c.tag)
+            .order_by(desc(count), tagged.c.tag)
+        )
+        async with self.connect() as conn:
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def aggregate_series(
+        self,
+        user_id: UUID,
+        granularity: str,
+        start_date: date,
+        end_date: date,
+        property_id: Optional[UUID] = None,
+        category_id: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """Income and expense totals per date_trunc bucket, gap-filled with zeros.
+
+        `granularity` must be one of day/week/month/year (it is inlined into the SQL).
+        """
+        unit = literal_column(f"'{granularity}'")
+        step = literal_column(f"interval '1 {granularity}'")
+        
+        def truncate(value):
+            return cast(func.date_trunc(unit, cast(value, DateTime)), Date)
+        
+        async with self.connect() as conn:
+            categories = finance_categories
+            conditions = [
+                self.table.c.user_id == user_id,
+                self.table.c.deleted_at.is_(None),
+                self.table.c.date >= start_date,
+                self.table.c.date <= end_date
+            ]
+            if property_id:
+                conditions.append(self.table.c.property_id == property_id)
+            if category_id:
+                conditions.append(self.table.c.category_id == category_id)
+            
+            bucket = truncate(self.table.c.date).label("bucket")
+            totals = (
+                select(
+                    bucket,
+                    func.sum(case((categories.c.type == "income", self.table.c.amount), else_=0)).label("income"),
+                    func.sum(case((categories.c.type == "expense", self.table.c.amount), else_=0)).label("expense")
+                )
+                .select_from(self.table.join(categories, categories.c.id == self.table.c.category_id))
+                .where(and_(*conditions))
+                .group_by(bucket)
+                .subquery("totals")
+            )
+            buckets = select(
+                cast(func.generate_series(truncate(start_date), truncate(end_date), step), Date).label("bucket")
+            ).subquery("buckets")
+            
+            stmt = (
+                select(
+                    buckets.c.bucket,
+                    func.coalesce(totals.c.income, 0).label("income"),
+                    func.coalesce(totals.c.expense, 0).label("expense")
+                )
+                .select_from(buckets.outerjoin(totals, totals.c.bucket == buckets.c.bucket))
+                .order_by(buckets.c.bucket)
+            )
+            result = await conn.execute(stmt)
+            return [dict(row._mapping) for row in result.fetchall()]
+    
+    async def suggest_descriptions(self, user_id: UUID, prefix: str, since: date, limit: int = 10) -> List[Dict[str, Any]]:
+        """Distinct past descriptions matching what is being typed, each with its most recent use.
+
+        Matches case-insensitively on the start of the description; from three
+        characters on, anywhere in it (both served by the lower(description)
+        trigram index). Descriptions starting with the prefix come first, then
+        the most used, then the most recent. Only transactions dated from
+        `since` are considered, which also limits the partitions read.
+        """
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%" if len(prefix) >= 3 else f"{escaped}%"
+        key = func.lower(self.table.c.description)
+        
+        latest = (
+            select(
+                self.table.c.description,
+                self.table.c.category_id,
+                self.table.c.property_id,
+                self.table.c.amount,
+                self.table.c.date.label("last_used"),
+                func.count().over(partition_by=key).label("uses"),
+                key.like(func.lower(f"{escaped}%"), escape="\\").label("starts_with")
+            )
+            .where(
+                self.table.c.user_id == user_id,
+                self.table.c.deleted_at.is_(None),
+                self.table.c.description.isnot(None),
+                self.table.c.date >= since,
+                key.like(func.lower(pattern), escape="\\")
+            )
+            .distinct(key)
+            .order_by(key, desc(self.table.c.date), desc(self.table.c.id))
+            .subquery("latest")
+        )
+        stmt = (
+            select(
+                latest.c.description,
+                latest.c.category_id,
+                latest.c.property_id,
+                latest.c.amount,
+                latest.c.last_used,
+                latest.c.uses
+            )
+            .order_by(desc(latest.c.starts_with), desc(latest.c.uses), desc(latest.c.last_used))
+            .limit(limit)
+        )
+        async with self.connect() as conn:
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
     
     async def find_by_user_and_id(self, user_id: UUID, transaction_id: UUID, include_deleted: bool = False) -> Dict[str, Any] | None:
         """Find a transaction by user ID and transaction ID (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.user_id == user_id,
                 self.table.c.id == transaction_id
@@ -60,22 +373,24 @@ class TransactionRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
             return None
     
-    async def soft_delete(self, transaction_id: UUID) -> bool:
-        """Soft delete a transaction by setting deleted_at timestamp"""
+    async def soft_delete(self, transaction_id: UUID, transaction_date: Optional[date] = None) -> bool:
+        """Soft delete a transaction by setting deleted_at timestamp (pass its date to touch a single partition)"""
         from datetime import datetime, timezone
-        with self.db.connect() as conn:
+        async with self.begin() as conn:
+            conditions = [self.table.c.id == transaction_id]
+            if transaction_date:
+                conditions.append(self.table.c.date == transaction_date)
             update_stmt = (
                 self.table.update()
-                .where(self.table.c.id == transaction_id)
+                .where(and_(*conditions))
                 .values(deleted_at=datetime.now(timezone.utc))
             )
-            result = conn.execute(update_stmt)
-            conn.commit()
+            result = await conn.execute(update_stmt)
             return result.rowcount > 0
 
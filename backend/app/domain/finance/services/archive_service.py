@@ -0,0 +1,77 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+from app.core.config import settings
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.repositories.archive_repository import ArchiveRepository, ARCHIVE_TABLES
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+from app.domain.finance.repositories.expense_repository import ExpenseRepository
+from app.domain.finance.repositories.category_repository import CategoryRepository
+from app.domain.finance.dto.archive_dto import ArchiveEntity, ArchiveResult, ArchiveRestoreResult
+
+# Scheduler job / lease name
+ARCHIVE_JOB = "archive-soft-deleted"
+
+
+class ArchiveService:
+    """Moves long soft-deleted rows out of the hot tables, and restores them"""
+
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.archive_repository = ArchiveRepository(uow)
+        self.rollup_repository = RollupRepository(uow)
+        self.expense_repository = ExpenseRepository(uow)
+        self.category_repository = CategoryRepository(uow)
+
+    async def archive(
+        self,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> ArchiveResult:
+        """Archive rows soft-deleted more than retention_days ago, one committed batch at a time.
+
+        Soft-deleted rows are already out of the rollup and payment counters, so
+        moving them changes nothing the app reads.
+        """
+        retention_days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        archived = {}
+        for entity in ARCHIVE_TABLES:
+            archived[entity] = 0
+            while True:
+                async with self.uow:
+                    moved = await self.archive_repository.archive_batch(entity, cutoff, batch_size)
+                archived[entity] += moved
+                if moved < batch_size:
+                    break
+        return ArchiveResult(cutoff=cutoff, archived=archived)
+
+    async def restore(self, user_id: UUID, entity: ArchiveEntity, ids: List[UUID]) -> ArchiveRestoreResult:
+        """Move archived rows back into the hot table as live (undeleted) rows.
+
+        Restored transactions are added back to the rollup and to their installment's
+        payment count. Restore a transaction's category (and expense) before the transaction.
+        """
+        async with self.uow:
+            restored = await self.archive_repository.restore(entity, user_id, ids)
+            if entity == ArchiveEntity.transactions:
+                await self.rollup_repository.apply_transactions(restored)
+                await self.expense_repository.record_payments(
+                    user_id, Counter(row["expense_id"] for row in restored if row["expense_id"])
+                )
+        if entity == ArchiveEntity.categories and restored:
+            await self.category_repository.invalidate_cache(user_id)
+
+        restored_ids = {row["id"] for row in restored}
+        return ArchiveRestoreResult(
+            entity=entity,
+            restored=[row_id for row_id in ids if row_id in restored_ids],
+            not_restored=[row_id for row_id in ids if row_id not in restored_ids]
+        )
+
+
+async def archive_soft_deleted() -> ArchiveResult:
+    """Scheduler job entry point"""
+    return await ArchiveService(UnitOfWork()).archive()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from fastapi import HTTPException, status
 from app.domain.finance.repositories.category_repository import CategoryRepository
@@ -32,11 +32,18 @@ class CategoryService:
         }
         
         category = await self.category_repository.create(data)
+        await self.category_repository.invalidate_cache(user_id)
         return CategoryResponse(**category)
     
-    async def get_categories(self, user_id: UUID) -> List[CategoryResponse]:
-        """Get all categories for a user"""
+    async def get_version(self, user_id: UUID, category_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for a user's categories (or one category), used for ETags"""
+        return await self.category_repository.get_version(user_id, category_id)
+    
+    async def get_categories(self, user_id: UUID, as_rows: bool = False) -> List[CategoryResponse] | List[Dict[str, Any]]:
+        """Get all categories for a user (as_rows returns the raw rows for fast serialization)"""
         categories = await self.category_repository.find_by_user_id(user_id)
+        if as_rows:
+            return categories
         return [CategoryResponse(**cat) for cat in categories]
     
     async def get_category(self, user_id: UUID, category_id: UUID) -> CategoryResponse:
@@ -73,6 +80,7 @@ class CategoryService:
             return CategoryResponse(**category)
         
         updated_category = await self.category_repository.update(category_id, update_data)
+        await self.category_repository.invalidate_cache(user_id)
         return CategoryResponse(**updated_category)
     
     async def delete_category(self, user_id: UUID, category_id: UUID) -> None:
@@ -86,6 +94,7 @@ class CategoryService:
             )
         
         deleted = await self.category_repository.soft_delete(category_id)
+        await self.category_repository.invalidate_cache(user_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,74 @@
+import asyncio
+import calendar
+from typing import Any, Tuple
+from uuid import UUID
+from datetime import date
+from app.domain.finance.repositories.transaction_repository import TransactionRepository
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+from app.domain.finance.repositories.expense_repository import ExpenseRepository
+from app.domain.finance.repositories.note_repository import NoteRepository
+from app.domain.finance.repositories.category_repository import CategoryRepository
+from app.domain.finance.dto.dashboard_dto import DashboardResponse, CategoryTotalResponse
+from app.domain.finance.dto.transaction_dto import TransactionResponse
+from app.domain.finance.dto.expense_dto import ExpenseScheduleItem
+from app.domain.finance.services.expense_projection import project_expenses
+from app.domain.finance.dto.note_dto import NoteResponse
+from app.domain.finance.validations.note_validations import validate_month
+
+RECENT_TRANSACTIONS_LIMIT = 5
+UPCOMING_EXPENSES_LIMIT = 5
+# Months projected for the upcoming list (the current one included)
+UPCOMING_EXPENSES_MONTHS = 2
+
+
+class DashboardService:
+    """Service for the finance dashboard summary"""
+    
+    def __init__(self):
+        # No shared unit of work: each query checks out its own pooled
+        # connection so the dashboard queries can run concurrently
+        self.transaction_repository = TransactionRepository()
+        self.rollup_repository = RollupRepository()
+        self.expense_repository = ExpenseRepository()
+        self.note_repository = NoteRepository()
+        self.category_repository = CategoryRepository()
+    
+    async def get_version(self, user_id: UUID) -> Tuple[Any, ...]:
+        """Change marker for everything the dashboard reads, used for ETags"""
+        return tuple(await asyncio.gather(
+            self.rollup_repository.get_version(user_id),
+            self.expense_repository.get_version(user_id),
+            self.note_repository.get_version(user_id),
+            self.category_repository.get_version(user_id),
+        ))
+    
+    async def get_dashboard(self, user_id: UUID, year: int, month: int) -> DashboardResponse:
+        """Get totals, per-category breakdown, recent transactions, upcoming expenses and note for a month"""
+        validate_month(month)
+        start_date = date(year, month, 1)
+        end_date = date(year, month, calendar.monthrange(year, month)[1])
+        
+        by_category, recent, expenses, note = await asyncio.gather(
+            self.rollup_repository.sum_by_category(user_id, start_date, end_date),
+            self.transaction_repository.find_by_user_id(
+                user_id, start_date, end_date, limit=RECENT_TRANSACTIONS_LIMIT
+            ),
+            self.expense_repository.find_by_user_id(user_id, is_active=True),
+            self.note_repository.find_by_user_and_period(user_id, year, month),
+        )
+        
+        upcoming = project_expenses(expenses, date.today(), UPCOMING_EXPENSES_MONTHS)[:UPCOMING_EXPENSES_LIMIT]
+        total_income = sum(row["total"] for row in by_category if row["type"] == "income")
+        total_expense = sum(row["total"] for row in by_category if row["type"] == "expense")
+        
+        return DashboardResponse(
+            year=year,
+            month=month,
+            total_income=total_income,
+            total_expense=total_expense,
+            net=total_income - total_expense,
+            by_category=[CategoryTotalResponse(**row) for row in by_category],
+            recent_transactions=[TransactionResponse(**tx) for tx in recent],
+            upcoming_expenses=[ExpenseScheduleItem(**payment._asdict()) for payment in upcoming],
+            monthly_note=NoteResponse(**note) if note else None,
+        )
@@ -0,0 +1,100 @@
+import hashlib
+from collections import Counter
+from datetime import date, timedelta
+from typing import Optional
+from uuid import UUID
+from app.core.config import settings
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.repositories.expense_repository import ExpenseRepository
+from app.domain.finance.repositories.transaction_repository import TransactionRepository
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+from app.domain.finance.dto.expense_dto import ExpenseMaterializationResult
+from app.domain.finance.services.expense_projection import materializable_due_dates
+
+# Scheduler job / lease name
+MATERIALIZATION_JOB = "materialize-expense-payments"
+
+
+def expense_payment_fingerprint(expense_id: UUID, due_date: date) -> str:
+    """Fingerprint of an expense's payment for a due date, so each payment is materialized once"""
+    return hashlib.sha256(f"expense-payment\x1f{expense_id}\x1f{due_date.isoformat()}".encode()).hexdigest()
+
+
+class ExpenseMaterializationService:
+    """Turns due expense payments into transactions, in set-based batches across all users"""
+    
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.expense_repository = ExpenseRepository(uow)
+        self.transaction_repository = TransactionRepository(uow)
+        self.rollup_repository = RollupRepository(uow)
+    
+    async def materialize(
+        self,
+        through: Optional[date] = None,
+        batch_size: Optional[int] = None
+    ) -> ExpenseMaterializationResult:
+        """Insert a transaction for every expense payment due up to a date (default today).
+
+        Payments are materialized after the expense's materialized_through, which
+        creation sets to the day before (or, with backfill, to the day before
+        start_date), except in months that already have a transaction linked to
+        the expense, such as one posted by hand.
+
+        Each batch of due expenses commits on its own: one INSERT for the
+        transactions (fingerprinted, so re-runs insert nothing twice), one rollup
+        upsert, one UPDATE for installment payment counts (deactivating finished
+        installments) and one UPDATE advancing the expenses' materialized_through.
+        """
+        through = through or date.today()
+        batch_size = batch_size or settings.EXPENSE_MATERIALIZATION_BATCH_SIZE
+        result = ExpenseMaterializationResult(
+            through=through, expenses_processed=0, transactions_created=0, variable_skipped=0, paid_skipped=0
+        )
+        
+        while True:
+            async with self.uow:
+                expenses = await self.expense_repository.find_due_for_materialization(through, batch_size)
+                if not expenses:
+                    break
+                
+                rows = []
+                for expense in expenses:
+                    # Rows created outside ExpenseService have no materialized_through yet
+                    after = expense["materialized_through"] or expense["created_at"].date() - timedelta(days=1)
+                    due_dates, paid = materializable_due_dates(expense, after, through, expense["paid_months"] or ())
+                    result.paid_skipped += paid
+                    if expense["amount"] is None:
+                        result.variable_skipped += len(due_dates)
+                        continue
+                    rows.extend(
+                        {
+                            "user_id": expense["user_id"],
+                            "property_id": expense["property_id"],
+                            "date": due_date,
+                            "amount": expense["amount"],
+                            "description": expense["name"],
+                            "category_id": expense["category_id"],
+                            "expense_id": expense["id"],
+                            "tags": None,
+                            "payment_method": None,
+                            "notes": None,
+                            "fingerprint": expense_payment_fingerprint(expense["id"], due_date)
+                        }
+                        for due_date in due_dates
+                    )
+                
+                created = await self.transaction_repository.create_many(rows, skip_duplicates=True)
+                await self.rollup_repository.apply_transactions(created)
+                await self.expense_repository.record_payments(None, Counter(tx["expense_id"] for tx in created))
+                await self.expense_repository.mark_materialized([expense["id"] for expense in expenses], through)
+            
+            result.expenses_processed += len(expenses)
+            result.transactions_created += len(created)
+        
+        return result
+
+
+async def materialize_due_expenses() -> ExpenseMaterializationResult:
+    """Scheduler job entry point"""
+    return await ExpenseMaterializationService(UnitOfWork()).materialize()
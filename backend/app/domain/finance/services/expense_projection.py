@@ -0,0 +1,178 @@
+"""
+Expense schedule projection.
+
+Computes the due dates and amounts of a user's recurring expenses over a
+window of months, in memory from one read of the expense rows: due dates
+are computed once per month and shared by all expenses, and walking the
+months in order yields payments already sorted by due date.
+`day_of_month` 29-31 is clamped to the last day of shorter months (an
+expense on the 31st is due Feb 28/29).
+
+An expense's first payment is due in the first month whose (clamped) due
+date is on or after its `start_date`. Installments stop after
+`total_payments`; the `payments_completed` earliest ones are paid, so an
+unpaid installment due before today is overdue. Ongoing expenses do not
+track payments and are never overdue.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+
+class ScheduledPayment(NamedTuple):
+    """One projected payment of an expense"""
+    expense_id: UUID
+    name: str
+    category_id: UUID
+    property_id: UUID
+    expense_type: str
+    due_date: date
+    amount: Optional[float]
+    payment_number: Optional[int]  # 1-based, installments only
+    total_payments: Optional[int]
+    overdue: bool
+
+
+def month_index(day: date) -> int:
+    """Months since year 0, so month arithmetic is integer arithmetic"""
+    return day.year * 12 + day.month - 1
+
+
+def month_start(index: int) -> date:
+    """First day of the month with a month index"""
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def clamped_due_date(index: int, day_of_month: int) -> date:
+    """Due date in a month, clamping day_of_month to the month's length"""
+    year, month = index // 12, index % 12 + 1
+    return date(year, month, min(day_of_month, calendar.monthrange(year, month)[1]))
+
+
+def first_due_index(start_date: date, day_of_month: int) -> int:
+    """Month index of an expense's first payment"""
+    index = month_index(start_date)
+    if clamped_due_date(index, day_of_month) < start_date:
+        index += 1
+    return index
+
+
+def due_dates_in_month(index: int) -> List[date]:
+    """Due date in a month for each day_of_month (list position), clamped to the month's length"""
+    year, month = index // 12, index % 12 + 1
+    length = calendar.monthrange(year, month)[1]
+    return [None] + [date(year, month, min(day, length)) for day in range(1, 32)]
+
+
+def project_expenses(expenses: Iterable[Dict[str, Any]], today: date, months: int) -> List[ScheduledPayment]:
+    """Project payments of active expenses from today over `months` calendar months (the current one included).
+
+    Overdue installments (unpaid and due before today) come first, then
+    payments due from today on, ordered by due date.
+    """
+    window_start = month_index(today)
+    window_end = window_start + months  # exclusive
+
+    # Expenses are walked month by month in day_of_month order, so payments
+    # come out already sorted by due date
+    plans = []
+    for expense in expenses:
+        if not expense["is_active"] or expense.get("deleted_at") is not None:
+            continue
+        day_of_month = expense["day_of_month"]
+        first = first_due_index(expense["start_date"], day_of_month)
+        is_installment = expense["expense_type"] == "installment"
+        if is_installment:
+            if expense["total_payments"] is None:
+                continue
+            # The next unpaid installment may be due before the window (overdue)
+            start = first + expense["payments_completed"]
+            end = min(window_end, first + expense["total_payments"])
+        else:
+            start = max(first, window_start)
+            end = window_end
+        if start >= end:
+            continue
+        fields = (expense["id"], expense["name"], expense["category_id"], expense["property_id"], expense["expense_type"])
+        amount = float(expense["amount"]) if expense["amount"] is not None else None
+        total = expense["total_payments"] if is_installment else None
+        plans.append((day_of_month, expense["name"], first, start, end, is_installment, fields, amount, total))
+    plans.sort(key=lambda plan: plan[:2])
+
+    overdue, upcoming = [], []
+    for index in range(min((plan[3] for plan in plans), default=window_start), window_end):
+        due_dates = due_dates_in_month(index)
+        for day_of_month, _, first, start, end, is_installment, fields, amount, total in plans:
+            if not start <= index < end:
+                continue
+            due_date = due_dates[day_of_month]
+            if due_date >= today:
+                upcoming.append(ScheduledPayment(
+                    *fields, due_date, amount, index - first + 1 if is_installment else None, total, False
+                ))
+            elif is_installment:
+                overdue.append(ScheduledPayment(*fields, due_date, amount, index - first + 1, total, True))
+    return overdue + upcoming
+
+
+def due_dates_between(expense: Dict[str, Any], after: date, through: date) -> List[date]:
+    """Due dates of an expense's payments in (after, through], earliest first.
+
+    Ongoing expenses are due every month; installments for payment numbers
+    1..total_payments, whether paid or not (see materializable_due_dates).
+    """
+    day_of_month = expense["day_of_month"]
+    first = first_due_index(expense["start_date"], day_of_month)
+    end = month_index(through) + 1
+    start = max(first, month_index(after))
+    if expense["expense_type"] == "installment":
+        if expense["total_payments"] is None:
+            return []
+        end = min(end, first + expense["total_payments"])
+    due_dates = []
+    for index in range(start, end):
+        due_date = clamped_due_date(index, day_of_month)
+        if after < due_date <= through:
+            due_dates.append(due_date)
+    return due_dates
+
+
+
+def materializable_due_dates(
+    expense: Dict[str, Any],
+    after: date,
+    through: date,
+    paid_months: Iterable[date] = ()
+) -> Tuple[List[date], int]:
+    """Due dates in (after, through] to turn into transactions, and how many were skipped as already paid.
+
+    A due date is paid when its month (first day in paid_months) already has a
+    transaction linked to the expense, e.g. one posted by hand. This is the only
+    check: payments_completed is not used, as it cannot tell which month a
+    hand payment covered.
+    """
+    paid = set(paid_months)
+    due_dates = due_dates_between(expense, after, through)
+    unpaid = [due_date for due_date in due_dates if due_date.replace(day=1) not in paid]
+    return unpaid, len(due_dates) - len(unpaid)
+
+
+def forecast_by_month(payments: Iterable[ScheduledPayment], today: date, months: int) -> List[Dict[str, Any]]:
+    """Total projected outflow per month of the window (overdue payments are not included)"""
+    window_start = month_index(today)
+    buckets: Dict[int, Dict[str, Any]] = defaultdict(lambda: {"total": 0.0, "count": 0, "variable_count": 0})
+    for payment in payments:
+        if payment.overdue:
+            continue
+        bucket = buckets[month_index(payment.due_date)]
+        bucket["count"] += 1
+        if payment.amount is None:
+            bucket["variable_count"] += 1
+        else:
+            bucket["total"] += payment.amount
+    return [
+        {"month": month_start(index), **buckets[index]}
+        for index in range(window_start, window_start + months)
+    ]
@@ -1,43 +1,58 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, timedelta
 from fastapi import HTTPException, status
+from app.core.unit_of_work import UnitOfWork
 from app.domain.finance.repositories.expense_repository import ExpenseRepository
 from app.domain.finance.repositories.category_repository import CategoryRepository
 from app.domain.finance.repositories.transaction_repository import TransactionRepository
 from app.domain.finance.dto.expense_dto import (
     ExpenseCreate,
     ExpenseUpdate,
-    ExpenseResponse
+    ExpenseResponse,
+    ExpenseScheduleItem,
+    ExpenseForecastMonth,
+    ExpenseForecastResponse,
+    ExpenseReconciliationItem,
+    ExpenseReconciliationResult
 )
+from app.domain.finance.services.expense_projection import project_expenses, forecast_by_month, due_dates_between
 from app.domain.finance.validations.expense_validations import (
     validate_expense_create,
+    validate_projection_months,
     validate_expense_update,
-    validate_category_exists,
-    validate_property_exists,
     validate_total_payments_for_update
 )
+from app.domain.finance.validations.reference_validations import validate_references_exist
 
 
 class ExpenseService:
-    """Service for expense operations"""
+    """Service for expense operations (all repositories share the request's unit of work)"""
     
-    def __init__(self):
-        self.expense_repository = ExpenseRepository()
-        self.category_repository = CategoryRepository()
-        self.transaction_repository = TransactionRepository()
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.expense_repository = ExpenseRepository(uow)
+        self.category_repository = CategoryRepository(uow)
+        self.transaction_repository = TransactionRepository(uow)
     
     async def create_expense(
         self,
         user_id: UUID,
         expense_data: ExpenseCreate
     ) -> ExpenseResponse:
-        """Create a new expense"""
+        """Create a new expense.
+
+        Payments due before today are only materialized with backfill; otherwise
+        they are taken as paid outside the app and installments start with
+        them counted in payments_completed.
+        """
         # Validate expense data
         validate_expense_create(expense_data)
-        await validate_category_exists(user_id, expense_data.category_id)
-        await validate_property_exists(expense_data.property_id)
         
+        yesterday = date.today() - timedelta(days=1)
+        materialized_through = expense_data.start_date - timedelta(days=1)
+        if not expense_data.backfill:
+            materialized_through = max(materialized_through, yesterday)
         data = {
             "user_id": user_id,
             "property_id": expense_data.property_id,
@@ -50,21 +65,75 @@ class ExpenseService:
             "total_payments": expense_data.total_payments,
             "payments_completed": 0,
             "is_active": True,
-            "notes": expense_data.notes
+            "notes": expense_data.notes,
+            "materialized_through": materialized_through
         }
+        if expense_data.expense_type == "installment" and not expense_data.backfill:
+            paid_outside = due_dates_between(data, expense_data.start_date - timedelta(days=1), yesterday)
+            data["payments_completed"] = len(paid_outside)
+            data["is_active"] = len(paid_outside) < (expense_data.total_payments or 0)
         
-        expense = await self.expense_repository.create(data)
+        async with self.uow:
+            await validate_references_exist(
+                user_id,
+                category_id=expense_data.category_id,
+                property_id=expense_data.property_id,
+                uow=self.uow
+            )
+            expense = await self.expense_repository.create(data)
         return ExpenseResponse(**expense)
     
+    async def get_version(self, user_id: UUID, expense_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for a user's expenses (or one expense), used for ETags"""
+        return await self.expense_repository.get_version(user_id, expense_id)
+    
     async def get_expenses(
         self,
         user_id: UUID,
-        is_active: Optional[bool] = None
-    ) -> List[ExpenseResponse]:
-        """Get all expenses for a user"""
+        is_active: Optional[bool] = None,
+        as_rows: bool = False
+    ) -> List[ExpenseResponse] | List[Dict[str, Any]]:
+        """Get all expenses for a user (as_rows returns the raw rows for fast serialization)"""
         expenses = await self.expense_repository.find_by_user_id(user_id, is_active)
+        if as_rows:
+            return expenses
         return [ExpenseResponse(**exp) for exp in expenses]
     
+    async def get_schedule(
+        self,
+        user_id: UUID,
+        months: int,
+        today: Optional[date] = None,
+        as_rows: bool = False
+    ) -> List[ExpenseScheduleItem] | List[Dict[str, Any]]:
+        """Get the projected payments of a user's active expenses over the next months (overdue first).
+
+        as_rows returns plain dicts for fast serialization.
+        """
+        validate_projection_months(months)
+        today = today or date.today()
+        expenses = await self.expense_repository.find_by_user_id(user_id, is_active=True)
+        payments = project_expenses(expenses, today, months)
+        if as_rows:
+            return [payment._asdict() for payment in payments]
+        return [ExpenseScheduleItem(**payment._asdict()) for payment in payments]
+    
+    async def get_forecast(self, user_id: UUID, months: int, today: Optional[date] = None) -> ExpenseForecastResponse:
+        """Get the projected expense outflow per month, plus overdue installments"""
+        validate_projection_months(months)
+        today = today or date.today()
+        expenses = await self.expense_repository.find_by_user_id(user_id, is_active=True)
+        payments = project_expenses(expenses, today, months)
+        by_month = forecast_by_month(payments, today, months)
+        overdue = [payment for payment in payments if payment.overdue]
+        return ExpenseForecastResponse(
+            start_date=today,
+            months=[ExpenseForecastMonth(**month) for month in by_month],
+            total=sum(month["total"] for month in by_month),
+            overdue_total=sum(payment.amount or 0 for payment in overdue),
+            overdue_count=len(overdue)
+        )
+    
     async def get_expense(
         self,
         user_id: UUID,
@@ -86,69 +155,83 @@ class ExpenseService:
         expense_data: ExpenseUpdate
     ) -> ExpenseResponse:
         """Update an expense"""
-        # Verify expense exists and belongs to user
-        expense = await self.expense_repository.find_by_user_and_id(user_id, expense_id)
-        if not expense:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Expense not found"
-            )
-        
         # Validate expense data (only validates provided fields)
         validate_expense_update(expense_data)
         
-        # Validate category if provided
-        if expense_data.category_id:
-            await validate_category_exists(user_id, expense_data.category_id)
-        
-        # Validate property if provided
-        if expense_data.property_id:
-            await validate_property_exists(expense_data.property_id)
-        
-        # Validate total_payments based on expense type (current or updated)
-        validate_total_payments_for_update(expense_data, expense["expense_type"])
-        
-        # Prepare update data - only include fields that were explicitly set
-        update_data = expense_data.model_dump(exclude_unset=True)
-        
-        if not update_data:
-            return ExpenseResponse(**expense)
-        
-        updated_expense = await self.expense_repository.update(expense_id, update_data)
+        async with self.uow:
+            # Verify expense exists and belongs to user
+            expense = await self.expense_repository.find_by_user_and_id(user_id, expense_id)
+            if not expense:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Expense not found"
+                )
+            
+            # Validate category and property if provided (single query)
+            await validate_references_exist(
+                user_id,
+                category_id=expense_data.category_id,
+                property_id=expense_data.property_id,
+                uow=self.uow
+            )
+            
+            # Validate total_payments based on expense type (current or updated)
+            validate_total_payments_for_update(expense_data, expense["expense_type"])
+            
+            # Prepare update data - only include fields that were explicitly set
+            update_data = expense_data.model_dump(exclude_unset=True)
+            
+            if not update_data:
+                return ExpenseResponse(**expense)
+            
+            updated_expense = await self.expense_repository.update(expense_id, update_data)
         return ExpenseResponse(**updated_expense)
     
     async def delete_expense(self, user_id: UUID, expense_id: UUID) -> bool:
         """Soft delete an expense"""
-        # Verify expense exists and belongs to user (exclude already deleted)
-        expense = await self.expense_repository.find_by_user_and_id(user_id, expense_id, include_deleted=False)
-        if not expense:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Expense not found"
-            )
-        
-        return await self.expense_repository.soft_delete(expense_id)
+        async with self.uow:
+            # Verify expense exists and belongs to user (exclude already deleted)
+            expense = await self.expense_repository.find_by_user_and_id(user_id, expense_id, include_deleted=False)
+            if not expense:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Expense not found"
+                )
+            
+            return await self.expense_repository.soft_delete(expense_id)
     
     async def record_payment(self, user_id: UUID, expense_id: UUID) -> None:
-        """Record a payment for an expense (increment payments_completed for installments)"""
-        # Get expense and verify it belongs to user
-        expense = await self.expense_repository.find_by_user_and_id(user_id, expense_id, include_deleted=False)
-        if not expense:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Expense not found"
-            )
-        
-        # Update payments_completed for installments
-        if expense["expense_type"] == "installment":
-            new_payments_completed = expense["payments_completed"] + 1
-            update_data = {"payments_completed": new_payments_completed}
-            
-            # Auto-deactivate if all payments completed
-            if expense["total_payments"] and new_payments_completed >= expense["total_payments"]:
-                update_data["is_active"] = False
-            
-            await self.expense_repository.update(expense_id, update_data)
-        # For ongoing expenses, no update needed
+        """Record a payment for an expense (atomically increment payments_completed for installments)"""
+        async with self.uow:
+            updated = await self.expense_repository.add_payment(user_id, expense_id)
+            if updated:
+                return
+            # Nothing to count for ongoing expenses; only a missing expense is an error
+            expense = await self.expense_repository.find_by_user_and_id(user_id, expense_id, include_deleted=False)
+            if not expense:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Expense not found"
+                )
     
+    async def revert_payment(self, user_id: UUID, expense_id: UUID) -> None:
+        """Undo a payment when its transaction is deleted (reactivates a completed installment).
 
+        Ongoing, deleted and missing expenses are left alone.
+        """
+        async with self.uow:
+            await self.expense_repository.add_payment(user_id, expense_id, delta=-1)
+    
+    async def record_payments(self, user_id: UUID, payment_counts: Dict[UUID, int]) -> None:
+        """Record many payments at once (expense id -> number of payments), e.g. for imports"""
+        async with self.uow:
+            await self.expense_repository.record_payments(user_id, payment_counts)
+    
+    async def reconcile_payments(self, user_id: Optional[UUID] = None) -> ExpenseReconciliationResult:
+        """Recompute installment payment counters from linked transactions (one user or all), report corrections"""
+        async with self.uow:
+            corrected = await self.expense_repository.reconcile_payments(user_id)
+        return ExpenseReconciliationResult(
+            corrected=len(corrected),
+            expenses=[ExpenseReconciliationItem(**row) for row in corrected]
+        )
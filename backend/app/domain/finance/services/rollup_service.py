@@ -0,0 +1,17 @@
+from typing import Optional
+from uuid import UUID
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+
+
+class RollupService:
+    """Service for maintaining the monthly transaction rollup"""
+    
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.rollup_repository = RollupRepository(uow)
+    
+    async def rebuild(self, user_id: Optional[UUID] = None) -> int:
+        """Rebuild the rollup from raw transactions (backfill / drift repair), return rows written"""
+        async with self.uow:
+            return await self.rollup_repository.rebuild(user_id)
@@ -0,0 +1,32 @@
+from typing import List
+from uuid import UUID
+from app.domain.finance.repositories.search_repository import SearchRepository
+from app.domain.finance.dto.search_dto import SearchEntity, SearchResult, SearchResponse
+from app.domain.finance.validations.search_validations import validate_search_query
+
+
+class SearchService:
+    """Service for full-text search over transactions and notes"""
+    
+    def __init__(self):
+        self.search_repository = SearchRepository()
+    
+    async def search(
+        self,
+        user_id: UUID,
+        query: str,
+        entities: List[SearchEntity],
+        domain: str = "finance",
+        limit: int = 20,
+        offset: int = 0
+    ) -> SearchResponse:
+        """Ranked page of a user's transactions and notes matching a query"""
+        query = validate_search_query(query)
+        # One extra row tells whether another page follows
+        rows = await self.search_repository.search(user_id, query, entities, domain, limit + 1, offset)
+        next_offset = offset + limit if len(rows) > limit else None
+        return SearchResponse(
+            query=query,
+            results=[SearchResult(**row) for row in rows[:limit]],
+            next_offset=next_offset
+        )
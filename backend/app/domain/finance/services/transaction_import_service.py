@@ -0,0 +1,142 @@
+import csv
+import io
+import json
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.repositories.transaction_repository import TransactionRepository
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+from app.domain.finance.repositories.reference_repository import ReferenceRepository
+from app.domain.finance.services.expense_service import ExpenseService
+from app.domain.finance.services.transaction_service import transaction_fingerprint
+from app.domain.finance.dto.transaction_dto import (
+    TransactionCreate,
+    TransactionImportError,
+    TransactionImportResult
+)
+from app.domain.finance.validations.transaction_validations import validate_import_size
+
+
+def parse_import_csv(content: bytes) -> List[Dict[str, Any]]:
+    """Parse a CSV import (header row required) into raw rows; empty cells become None.
+
+    `tags` is read as a JSON array, matching the CSV export.
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
+    rows = []
+    for record in csv.DictReader(io.StringIO(text)):
+        row = {key.strip(): (value.strip() or None) if value is not None else None for key, value in record.items() if key}
+        if row.get("tags"):
+            try:
+                row["tags"] = json.loads(row["tags"])
+            except ValueError:
+                pass  # Left as a string so the row fails validation with a per-row error
+        rows.append(row)
+    return rows
+
+
+def format_validation_errors(exc: ValidationError) -> List[str]:
+    """Flatten a pydantic ValidationError into 'field: message' strings"""
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    ]
+
+
+class TransactionImportService:
+    """Service for bulk transaction imports (all repositories share the request's unit of work)"""
+    
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.transaction_repository = TransactionRepository(uow)
+        self.rollup_repository = RollupRepository(uow)
+        self.reference_repository = ReferenceRepository(uow)
+        self.expense_service = ExpenseService(uow)
+    
+    async def import_transactions(
+        self,
+        user_id: UUID,
+        rows: List[Dict[str, Any]],
+        dedupe: bool = True
+    ) -> TransactionImportResult:
+        """Validate a batch of raw rows and load the valid ones in one transaction.
+
+        Invalid rows are reported per row and skipped. References for the whole
+        batch are resolved in one query, valid rows are inserted with multi-row
+        INSERTs, and rollups and installment payments are applied in aggregate.
+        With dedupe, rows already imported (same fingerprint) are skipped.
+        """
+        validate_import_size(len(rows))
+        errors: List[TransactionImportError] = []
+        
+        parsed: List[Tuple[int, TransactionCreate]] = []
+        for number, raw in enumerate(rows, start=1):
+            try:
+                transaction = TransactionCreate.model_validate(raw)
+            except ValidationError as exc:
+                errors.append(TransactionImportError(row=number, errors=format_validation_errors(exc)))
+                continue
+            if transaction.amount <= 0:
+                errors.append(TransactionImportError(row=number, errors=["Amount must be greater than 0"]))
+                continue
+            parsed.append((number, transaction))
+        
+        found = await self.reference_repository.find_existing(
+            user_id,
+            category_ids=(tx.category_id for _, tx in parsed),
+            property_ids=(tx.property_id for _, tx in parsed),
+            expense_ids=(tx.expense_id for _, tx in parsed if tx.expense_id)
+        )
+        
+        data = []
+        occurrences: Counter = Counter()
+        for number, tx in parsed:
+            row_errors = []
+            if tx.category_id not in found["category"]:
+                row_errors.append("Category not found")
+            if tx.property_id not in found["property"]:
+                row_errors.append("Property not found")
+            if tx.expense_id and tx.expense_id not in found["expense"]:
+                row_errors.append("Expense not found")
+            if row_errors:
+                errors.append(TransactionImportError(row=number, errors=row_errors))
+                continue
+            
+            data.append({
+                "user_id": user_id,
+                "property_id": tx.property_id,
+                "date": tx.date,
+                "amount": tx.amount,
+                "description": tx.description,
+                "category_id": tx.category_id,
+                "expense_id": tx.expense_id,
+                "tags": tx.tags,
+                "payment_method": tx.payment_method,
+                "notes": tx.notes,
+                "fingerprint": None
+            })
+            if dedupe:
+                content = (tx.property_id, tx.date, tx.amount, tx.description)
+                data[-1]["fingerprint"] = transaction_fingerprint(user_id, *content, occurrence=occurrences[content])
+                occurrences[content] += 1
+        
+        created = []
+        if data:
+            async with self.uow:
+                created = await self.transaction_repository.create_many(data, skip_duplicates=dedupe)
+                # Only rows actually inserted count towards rollups and payments
+                payment_counts = Counter(tx["expense_id"] for tx in created if tx["expense_id"])
+                await self.rollup_repository.apply_transactions(created)
+                await self.expense_service.record_payments(user_id, payment_counts)
+        
+        errors.sort(key=lambda error: error.row)
+        return TransactionImportResult(imported=len(created), skipped=len(data) - len(created), errors=errors)
@@ -0,0 +1,73 @@
+from datetime import date
+from typing import Optional
+from app.core.config import settings
+from app.core.unit_of_work import UnitOfWork
+from app.core.partitions import interval_start, overlaps, partition_name, shift_interval
+from app.domain.finance.repositories.partition_repository import PartitionRepository
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+from app.domain.finance.dto.transaction_dto import TransactionPartitionResult
+
+# Scheduler job / lease name
+PARTITION_JOB = "maintain-transaction-partitions"
+
+
+class TransactionPartitionService:
+    """Keeps finance_transactions partitions created ahead of time, and detaches old ones"""
+
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.partition_repository = PartitionRepository(uow)
+        self.rollup_repository = RollupRepository(uow)
+
+    async def maintain(
+        self,
+        today: Optional[date] = None,
+        ahead: Optional[int] = None,
+        detach_after_months: Optional[int] = None
+    ) -> TransactionPartitionResult:
+        """Create missing partitions from today's interval through `ahead` intervals later,
+        and detach partitions that ended more than detach_after_months ago (if set).
+
+        Ranges already covered by an existing partition (of either interval) are
+        skipped, so changing TRANSACTION_PARTITION_INTERVAL only affects new
+        partitions. Each partition is created or detached in its own transaction;
+        a detached partition's rows are subtracted from the rollup in that same
+        transaction, so totals keep matching the transaction list.
+        """
+        interval = settings.TRANSACTION_PARTITION_INTERVAL
+        today = today or date.today()
+        ahead = settings.TRANSACTION_PARTITIONS_AHEAD if ahead is None else ahead
+        if detach_after_months is None:
+            detach_after_months = settings.TRANSACTION_PARTITION_DETACH_AFTER_MONTHS
+
+        async with self.uow:
+            partitions = await self.partition_repository.find_partitions()
+        ranges = [bounds for bounds in partitions.values() if bounds]
+
+        created = []
+        start = interval_start(today, interval)
+        for _ in range(ahead + 1):
+            end = shift_interval(start, interval)
+            if not overlaps((start, end), ranges):
+                name = partition_name(self.partition_repository.table.name, start, interval)
+                async with self.uow:
+                    await self.partition_repository.create_partition(name, start, end)
+                created.append(name)
+            start = end
+
+        detached = []
+        if detach_after_months is not None:
+            cutoff = shift_interval(interval_start(today, "month"), "month", -detach_after_months)
+            for name, bounds in sorted(partitions.items()):
+                if bounds and bounds[1] <= cutoff:
+                    async with self.uow:
+                        await self.partition_repository.detach_partition(name)
+                        await self.rollup_repository.remove_detached_partition(name)
+                    detached.append(name)
+
+        return TransactionPartitionResult(interval=interval, created=created, detached=detached)
+
+
+async def maintain_transaction_partitions() -> TransactionPartitionResult:
+    """Scheduler job entry point"""
+    return await TransactionPartitionService(UnitOfWork()).maintain()
@@ -1,54 +1,208 @@
-from typing import List, Optional
+import csv
+import hashlib
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.unit_of_work import UnitOfWork
+from app.core.pagination import encode_cursor, decode_cursor
 from app.domain.finance.repositories.transaction_repository import TransactionRepository
+from app.domain.finance.repositories.rollup_repository import RollupRepository
 from app.domain.finance.services.expense_service import ExpenseService
-from app.domain.finance.dto.transaction_dto import TransactionCreate, TransactionResponse
+from app.domain.finance.dto.transaction_dto import (
+    TransactionCreate,
+    TransactionResponse,
+    SeriesGranularity,
+    TransactionSeriesPoint,
+    TransactionSuggestion,
+    TransactionTagFacet,
+    ExportFormat
+)
 from app.domain.finance.validations.transaction_validations import (
     validate_transaction_create,
-    validate_property_exists
+    validate_date_range
 )
 
 
+def covers_whole_buckets(granularity: SeriesGranularity, start_date: date, end_date: date) -> bool:
+    """Whether a date range starts and ends on month (or year) boundaries"""
+    if granularity not in (SeriesGranularity.month, SeriesGranularity.year):
+        return False
+    ends_on_month_end = (end_date + timedelta(days=1)).day == 1
+    if granularity == SeriesGranularity.month:
+        return start_date.day == 1 and ends_on_month_end
+    return (start_date.month, start_date.day) == (1, 1) and (end_date.month, end_date.day) == (12, 31)
+
+
+def decode_transaction_cursor(cursor: str) -> Tuple[date, UUID]:
+    """Decode a transaction list cursor into its (date, id) keyset position"""
+    position = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(position["date"]), UUID(position["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def clean_tags(tags: Optional[List[str]]) -> Optional[List[str]]:
+    """Tag filter values without surrounding whitespace, blanks or repeats (None when nothing is left)"""
+    if not tags:
+        return None
+    cleaned = list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
+    return cleaned or None
+
+
+def transaction_fingerprint(
+    user_id: UUID,
+    property_id: UUID,
+    transaction_date: date,
+    amount: float,
+    description: Optional[str],
+    occurrence: int = 0
+) -> str:
+    """SHA-256 of a transaction's normalized content, used to skip re-imported rows.
+
+    The description is case-folded with whitespace collapsed and the amount is
+    rounded to cents. `occurrence` numbers identical rows within one batch so
+    that genuine repeats (two equal payments on the same day) are both kept.
+    """
+    normalized_description = " ".join((description or "").split()).casefold()
+    normalized_amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+    content = "\x1f".join([
+        str(user_id),
+        str(property_id),
+        transaction_date.isoformat(),
+        str(normalized_amount),
+        normalized_description,
+        str(occurrence),
+    ])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def idempotency_fingerprint(user_id: UUID, idempotency_key: str) -> str:
+    """Fingerprint of a single create from the client's idempotency key (never equal to a content fingerprint)"""
+    return hashlib.sha256(f"idempotency-key\x1f{user_id}\x1f{idempotency_key}".encode()).hexdigest()
+
+
+# Columns written by the export, in order (the header row for CSV)
+EXPORT_COLUMNS = [
+    "id",
+    "date",
+    "amount",
+    "description",
+    "category_id",
+    "property_id",
+    "expense_id",
+    "tags",
+    "payment_method",
+    "notes",
+    "created_at",
+    "updated_at",
+]
+
+
+def export_value(value: Any) -> Any:
+    """Convert a column value to its JSON/CSV export form"""
+    if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    # Decimal (kept exact) and UUID
+    return str(value)
+
+
+def render_export_batch(rows: List[dict], export_format: ExportFormat) -> str:
+    """Render a batch of export rows as CSV lines or NDJSON lines"""
+    if export_format == ExportFormat.ndjson:
+        return "".join(
+            json.dumps({name: export_value(row[name]) for name in EXPORT_COLUMNS}) + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            json.dumps(row[name]) if name == "tags" and row[name] is not None else export_value(row[name])
+            for name in EXPORT_COLUMNS
+        ])
+    return buffer.getvalue()
+
+
 class TransactionService:
-    """Service for transaction operations"""
+    """Service for transaction operations (all repositories share the request's unit of work)"""
     
-    def __init__(self):
-        self.transaction_repository = TransactionRepository()
-        self.expense_service = ExpenseService()
+    def __init__(self, uow: UnitOfWork):
+        self.uow = uow
+        self.transaction_repository = TransactionRepository(uow)
+        self.rollup_repository = RollupRepository(uow)
+        self.expense_service = ExpenseService(uow)
     
-    async def create_transaction(self, user_id: UUID, transaction_data: TransactionCreate) -> TransactionResponse:
-        """Create a new transaction"""
-        # Validate transaction data
-        await validate_transaction_create(
-            user_id,
-            transaction_data.category_id,
-            transaction_data.amount,
-            transaction_data.property_id,
-            transaction_data.expense_id
-        )
-        
-        data = {
-            "user_id": user_id,
-            "house_id": transaction_data.house_id,
-            "date": transaction_data.date,
-            "amount": transaction_data.amount,
-            "description": transaction_data.description,
-            "category_id": transaction_data.category_id,
-            "expense_id": transaction_data.expense_id,
-            "tags": transaction_data.tags,
-            "payment_method": transaction_data.payment_method,
-            "notes": transaction_data.notes
-        }
-        
-        transaction = await self.transaction_repository.create(data)
-        
-        # Update expense if linked
-        if transaction_data.expense_id:
-            await self.expense_service.record_payment(user_id, transaction_data.expense_id)
+    async def create_transaction(
+        self,
+        user_id: UUID,
+        transaction_data: TransactionCreate,
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[TransactionResponse, bool]:
+        """Create a new transaction (validation, insert and expense payment commit together).
+
+        Returns the transaction and whether it was created. With an idempotency key,
+        a retry carrying a key already used (whatever its date) is not inserted and
+        the existing transaction is returned. Content is not compared, so two identical
+        purchases on the same day are both kept (content dedupe is for imports only).
+        """
+        async with self.uow:
+            # Validate transaction data
+            await validate_transaction_create(
+                user_id,
+                transaction_data.category_id,
+                transaction_data.amount,
+                transaction_data.property_id,
+                transaction_data.expense_id,
+                self.uow
+            )
+            
+            data = {
+                "user_id": user_id,
+                "property_id": transaction_data.property_id,
+                "date": transaction_data.date,
+                "amount": transaction_data.amount,
+                "description": transaction_data.description,
+                "category_id": transaction_data.category_id,
+                "expense_id": transaction_data.expense_id,
+                "tags": transaction_data.tags,
+                "payment_method": transaction_data.payment_method,
+                "notes": transaction_data.notes,
+                "fingerprint": None
+            }
+            
+            if idempotency_key:
+                data["fingerprint"] = idempotency_fingerprint(user_id, idempotency_key)
+                # The unique index is per date (partition key): look the key up in every
+                # partition, holding the lock so a concurrent retry waits for this one
+                await self.transaction_repository.lock_fingerprint(data["fingerprint"])
+                existing = await self.transaction_repository.find_by_fingerprint(user_id, data["fingerprint"])
+                if existing:
+                    return TransactionResponse(**existing), False
+            transaction = await self.transaction_repository.create(data)
+            await self.rollup_repository.apply_transactions([transaction])
+            
+            # Update expense if linked
+            if transaction_data.expense_id:
+                await self.expense_service.record_payment(user_id, transaction_data.expense_id)
         
-        return TransactionResponse(**transaction)
+        return TransactionResponse(**transaction), True
+    
+    async def get_version(self, user_id: UUID, transaction_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for a user's transactions (or one transaction), used for ETags"""
+        if transaction_id:
+            return await self.transaction_repository.get_version(user_id, transaction_id)
+        return await self.rollup_repository.get_version(user_id)
     
     async def get_transactions(
         self,
@@ -57,13 +211,117 @@ class TransactionService:
         end_date: Optional[date] = None,
         category_id: Optional[UUID] = None,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
-    ) -> List[TransactionResponse]:
-        """Get all transactions for a user with optional filters"""
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        as_rows: bool = False,
+        tags_any: Optional[List[str]] = None,
+        tags_all: Optional[List[str]] = None
+    ) -> Tuple[List[TransactionResponse] | List[Dict[str, Any]], Optional[str]]:
+        """Get a page of transactions for a user with optional filters, plus the cursor for the next page.
+
+        With a cursor, paging is keyset-based on (date, id) and offset is ignored.
+        A next cursor is only returned when a limit is set and more rows remain.
+        as_rows returns the raw rows for fast serialization.
+        """
+        after = None
+        if cursor:
+            after = decode_transaction_cursor(cursor)
+            offset = None
+        
+        # Fetch one extra row to know whether another page exists
         transactions = await self.transaction_repository.find_by_user_id(
-            user_id, start_date, end_date, category_id, limit, offset
+            user_id, start_date, end_date, category_id,
+            limit + 1 if limit else None, offset, after=after,
+            tags_any=clean_tags(tags_any), tags_all=clean_tags(tags_all)
+        )
+        
+        next_cursor = None
+        if limit and len(transactions) > limit:
+            transactions = transactions[:limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor({"date": last["date"].isoformat(), "id": str(last["id"])})
+        
+        if as_rows:
+            return transactions, next_cursor
+        return [TransactionResponse(**tx) for tx in transactions], next_cursor
+    
+    async def get_series(
+        self,
+        user_id: UUID,
+        granularity: SeriesGranularity,
+        start_date: date,
+        end_date: date,
+        property_id: Optional[UUID] = None,
+        category_id: Optional[UUID] = None
+    ) -> List[TransactionSeriesPoint]:
+        """Get income/expense totals per bucket for a date range (empty buckets are zero)"""
+        validate_date_range(start_date, end_date)
+        if covers_whole_buckets(granularity, start_date, end_date):
+            # Whole months/years can be answered from the monthly rollup
+            rows = await self.rollup_repository.aggregate_series(
+                user_id, granularity.value, start_date, end_date, property_id, category_id
+            )
+        else:
+            rows = await self.transaction_repository.aggregate_series(
+                user_id, granularity.value, start_date, end_date, property_id, category_id
+            )
+        return [
+            TransactionSeriesPoint(
+                bucket=row["bucket"],
+                income=row["income"],
+                expense=row["expense"],
+                net=row["income"] - row["expense"]
+            )
+            for row in rows
+        ]
+    
+    async def get_tag_facets(
+        self,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[UUID] = None,
+        tags_any: Optional[List[str]] = None,
+        tags_all: Optional[List[str]] = None
+    ) -> List[TransactionTagFacet]:
+        """Count and totals per tag for the transactions matching the list filters"""
+        if start_date and end_date:
+            validate_date_range(start_date, end_date)
+        rows = await self.transaction_repository.tag_facets(
+            user_id, start_date, end_date, category_id, clean_tags(tags_any), clean_tags(tags_all)
         )
-        return [TransactionResponse(**tx) for tx in transactions]
+        return [TransactionTagFacet(**row) for row in rows]
+    
+    async def suggest_descriptions(self, user_id: UUID, prefix: str, limit: int = 8) -> List[TransactionSuggestion]:
+        """Past descriptions matching a typed prefix, with the category/property/amount last used with each"""
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        since = date.today() - timedelta(days=settings.TRANSACTION_SUGGEST_LOOKBACK_DAYS)
+        rows = await self.transaction_repository.suggest_descriptions(user_id, prefix, since, limit)
+        return [TransactionSuggestion(**row) for row in rows]
+    
+    async def export_transactions(
+        self,
+        user_id: UUID,
+        export_format: ExportFormat,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[UUID] = None,
+        tags_any: Optional[List[str]] = None,
+        tags_all: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Stream a user's transactions as CSV or NDJSON chunks (one chunk per fetched batch)"""
+        if export_format == ExportFormat.csv:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        
+        async for rows in self.transaction_repository.stream_by_user_id(
+            user_id, EXPORT_COLUMNS, start_date, end_date, category_id,
+            tags_any=clean_tags(tags_any), tags_all=clean_tags(tags_all)
+        ):
+            yield render_export_batch(rows, export_format)
     
     async def get_transaction(self, user_id: UUID, transaction_id: UUID) -> TransactionResponse:
         """Get a transaction by ID"""
@@ -77,13 +335,19 @@ class TransactionService:
     
     async def delete_transaction(self, user_id: UUID, transaction_id: UUID) -> bool:
         """Soft delete a transaction"""
-        # Verify transaction exists and belongs to user (exclude already deleted)
-        transaction = await self.transaction_repository.find_by_user_and_id(user_id, transaction_id, include_deleted=False)
-        if not transaction:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Transaction not found"
-            )
-        
-        return await self.transaction_repository.soft_delete(transaction_id)
+        async with self.uow:
+            # Verify transaction exists and belongs to user (exclude already deleted)
+            transaction = await self.transaction_repository.find_by_user_and_id(user_id, transaction_id, include_deleted=False)
+            if not transaction:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Transaction not found"
+                )
+            
+            deleted = await self.transaction_repository.soft_delete(transaction_id, transaction["date"])
+            if deleted:
+                await self.rollup_repository.apply_transactions([transaction], sign=-1)
+                if transaction["expense_id"]:
+                    await self.expense_service.revert_payment(user_id, transaction["expense_id"])
+            return deleted
 
@@ -1,9 +1,7 @@
 from typing import Optional
-from uuid import UUID
 from fastapi import HTTPException, status
+from app.core.config import settings
 from app.domain.finance.dto.expense_dto import ExpenseCreate, ExpenseUpdate
-from app.domain.finance.repositories.category_repository import CategoryRepository
-from app.domain.settings.repositories.property_repository import PropertyRepository
 
 
 def validate_expense_type(expense_type: str) -> None:
@@ -24,6 +22,15 @@ def validate_day_of_month(day_of_month: int) -> None:
         )
 
 
+def validate_projection_months(months: int) -> None:
+    """Validate that a schedule/forecast window is between 1 and EXPENSE_PROJECTION_MAX_MONTHS months"""
+    if not (1 <= months <= settings.EXPENSE_PROJECTION_MAX_MONTHS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Months must be between 1 and {settings.EXPENSE_PROJECTION_MAX_MONTHS}"
+        )
+
+
 def validate_total_payments_for_installment(total_payments: Optional[int], expense_type: str) -> None:
     """Validate total_payments for installment expenses"""
     if expense_type == 'installment':
@@ -43,28 +50,6 @@ def validate_total_payments_for_ongoing(total_payments: Optional[int], expense_t
         )
 
 
-async def validate_category_exists(user_id: UUID, category_id: UUID) -> None:
-    """Validate that category exists and belongs to user"""
-    category_repo = CategoryRepository()
-    category = await category_repo.find_by_user_and_id(user_id, category_id)
-    if not category:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Category not found"
-        )
-
-
-async def validate_property_exists(property_id: UUID) -> None:
-    """Validate that property exists (no user check needed, properties are system-wide)"""
-    property_repo = PropertyRepository()
-    property = await property_repo.find_by_id(property_id)
-    if not property:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found"
-        )
-
-
 def validate_expense_create(expense_data: ExpenseCreate) -> None:
     """Validate all fields for expense creation"""
     validate_expense_type(expense_data.expense_type)
@@ -0,0 +1,37 @@
+from typing import Optional
+from uuid import UUID
+from fastapi import HTTPException, status
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.repositories.reference_repository import ReferenceRepository
+
+
+async def validate_references_exist(
+    user_id: UUID,
+    category_id: Optional[UUID] = None,
+    property_id: Optional[UUID] = None,
+    expense_id: Optional[UUID] = None,
+    uow: Optional[UnitOfWork] = None
+) -> None:
+    """Validate that the referenced category, property and expense exist in a single round trip.
+
+    Category and expense must belong to the user; properties are system-wide.
+    Errors are raised in category, property, expense order.
+    """
+    reference_repo = ReferenceRepository(uow)
+    found = await reference_repo.check_references(user_id, category_id, property_id, expense_id)
+
+    if category_id is not None and not found["category"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category not found"
+        )
+    if property_id is not None and not found["property"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found"
+        )
+    if expense_id is not None and not found["expense"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Expense not found"
+        )
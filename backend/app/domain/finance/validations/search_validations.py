@@ -0,0 +1,12 @@
+from fastapi import HTTPException, status
+
+
+def validate_search_query(query: str) -> str:
+    """Validate that the search query has text to match, return it stripped"""
+    query = query.strip()
+    if not query:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must not be empty"
+        )
+    return query
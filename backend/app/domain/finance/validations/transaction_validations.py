@@ -1,9 +1,10 @@
 from typing import Optional
 from uuid import UUID
+from datetime import date
 from fastapi import HTTPException, status
-from app.domain.finance.repositories.category_repository import CategoryRepository
-from app.domain.settings.repositories.property_repository import PropertyRepository
-from app.domain.finance.services.expense_service import ExpenseService
+from app.core.config import settings
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.validations.reference_validations import validate_references_exist
 
 
 def validate_amount(amount: float) -> None:
@@ -15,45 +16,37 @@ def validate_amount(amount: float) -> None:
         )
 
 
-async def validate_category_exists(user_id: UUID, category_id: UUID) -> None:
-    """Validate that category exists and belongs to user"""
-    category_repo = CategoryRepository()
-    category = await category_repo.find_by_user_and_id(user_id, category_id)
-    if not category:
+def validate_date_range(start_date: date, end_date: date) -> None:
+    """Validate that start_date is not after end_date"""
+    if start_date > end_date:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Category not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
         )
 
 
-async def validate_property_exists(property_id: UUID) -> None:
-    """Validate that property exists (no user check needed, properties are system-wide)"""
-    property_repo = PropertyRepository()
-    property = await property_repo.find_by_id(property_id)
-    if not property:
+def validate_import_size(row_count: int) -> None:
+    """Validate that an import batch is not empty and within IMPORT_MAX_ROWS"""
+    if row_count == 0:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import contains no rows"
         )
-
-
-async def validate_expense_exists(user_id: UUID, expense_id: UUID) -> None:
-    """Validate that expense exists and belongs to user"""
-    expense_service = ExpenseService()
-    try:
-        await expense_service.get_expense(user_id, expense_id)
-    except HTTPException:
+    if row_count > settings.IMPORT_MAX_ROWS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Expense not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import is limited to {settings.IMPORT_MAX_ROWS} rows per batch"
         )
 
 
-async def validate_transaction_create(user_id: UUID, category_id: UUID, amount: float, property_id: UUID, expense_id: Optional[UUID] = None) -> None:
-    """Validate all fields for transaction creation"""
+async def validate_transaction_create(
+    user_id: UUID,
+    category_id: UUID,
+    amount: float,
+    property_id: UUID,
+    expense_id: Optional[UUID] = None,
+    uow: Optional[UnitOfWork] = None
+) -> None:
+    """Validate all fields for transaction creation (references are checked in one query)"""
     validate_amount(amount)
-    await validate_category_exists(user_id, category_id)
-    await validate_property_exists(property_id)
-    if expense_id:
-        await validate_expense_exists(user_id, expense_id)
-
+    await validate_references_exist(user_id, category_id, property_id, expense_id, uow)
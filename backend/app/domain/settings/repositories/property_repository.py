@@ -1,20 +1,47 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy import select, and_, update, insert
 from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.core.cache import get_cache, invalidate
 from app.core.database import properties, get_db
 
 
+# Non-deleted properties (a single entry, properties are system-wide)
+PROPERTY_CACHE = "properties"
+PROPERTY_CACHE_KEY = "all"
+
+
 class PropertyRepository(BaseRepository):
     """Repository for property operations"""
     
-    def __init__(self):
-        super().__init__(properties)
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        super().__init__(properties, uow=uow)
+        self.cache = get_cache(PROPERTY_CACHE)
+    
+    async def get_version(self, property_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for all properties (or one property), used for ETags"""
+        conditions = [self.table.c.id == property_id] if property_id else []
+        return await self.find_version(*conditions)
+    
+    async def invalidate_cache(self) -> None:
+        """Drop the cached properties (call after a committed write)"""
+        await invalidate(PROPERTY_CACHE)
     
     async def find_all(self, include_deleted: bool = False) -> List[Dict[str, Any]]:
-        """Find all properties (system-wide, not user-scoped)"""
-        with self.db.connect() as conn:
+        """Find all properties (system-wide, not user-scoped; non-deleted ones are served from the cache when possible)"""
+        if not include_deleted:
+            cached = self.cache.get(PROPERTY_CACHE_KEY)
+            if cached is None:
+                generation = self.cache.generation(PROPERTY_CACHE_KEY)
+                cached = await self._query_all(include_deleted)
+                self.cache.set(PROPERTY_CACHE_KEY, cached, generation)
+            return [dict(property) for property in cached]
+        return await self._query_all(include_deleted)
+    
+    async def _query_all(self, include_deleted: bool) -> List[Dict[str, Any]]:
+        async with self.connect() as conn:
             conditions = []
             
             # Exclude deleted properties by default
@@ -24,12 +51,17 @@ class PropertyRepository(BaseRepository):
             stmt = select(self.table)
             if conditions:
                 stmt = stmt.where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return [dict(row._mapping) for row in result.fetchall()]
     
     async def find_by_id(self, property_id: UUID, include_deleted: bool = False) -> Optional[Dict[str, Any]]:
         """Find a property by ID (excludes deleted by default)"""
-        with self.db.connect() as conn:
+        if not include_deleted:
+            for property in await self.find_all():
+                if property["id"] == property_id:
+                    return property
+            return None
+        async with self.connect() as conn:
             conditions = [self.table.c.id == property_id]
             
             # Exclude deleted properties by default
@@ -37,7 +69,7 @@ class PropertyRepository(BaseRepository):
                 conditions.append(self.table.c.deleted_at.is_(None))
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -45,20 +77,20 @@ class PropertyRepository(BaseRepository):
     
     async def create_property(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new property"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = insert(self.table).values(**property_data).returning(self.table)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             return dict(row._mapping)
     
     async def update_property(self, property_id: UUID, property_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a property"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = update(self.table).where(
                 self.table.c.id == property_id,
                 self.table.c.deleted_at.is_(None)
             ).values(**property_data).returning(self.table)
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -66,22 +98,22 @@ class PropertyRepository(BaseRepository):
     
     async def soft_delete_property(self, property_id: UUID) -> bool:
         """Soft delete a property"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             stmt = update(self.table).where(
                 self.table.c.id == property_id,
                 self.table.c.deleted_at.is_(None)
             ).values(deleted_at=datetime.now(timezone.utc))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             return result.rowcount > 0
     
     async def get_default_property(self) -> Optional[Dict[str, Any]]:
         """Get the default property (system-wide)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             stmt = select(self.table).where(
                 self.table.c.is_default == True,
                 self.table.c.deleted_at.is_(None)
             )
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
@@ -89,25 +121,25 @@ class PropertyRepository(BaseRepository):
     
     async def set_default_property(self, property_id: UUID) -> bool:
         """Set a property as default (unsets previous default)"""
-        with self.db.begin() as conn:
+        async with self.begin() as conn:
             # First, unset all default properties
             unset_stmt = update(self.table).where(
                 self.table.c.is_default == True,
                 self.table.c.deleted_at.is_(None)
             ).values(is_default=False)
-            conn.execute(unset_stmt)
+            await conn.execute(unset_stmt)
             
             # Then set the new default
             set_stmt = update(self.table).where(
                 self.table.c.id == property_id,
                 self.table.c.deleted_at.is_(None)
             ).values(is_default=True)
-            result = conn.execute(set_stmt)
+            result = await conn.execute(set_stmt)
             return result.rowcount > 0
     
     async def find_by_name(self, name: str, exclude_id: Optional[UUID] = None) -> Optional[Dict[str, Any]]:
         """Find a property by name (for uniqueness check)"""
-        with self.db.connect() as conn:
+        async with self.connect() as conn:
             conditions = [
                 self.table.c.name == name,
                 self.table.c.deleted_at.is_(None)
@@ -116,7 +148,7 @@ class PropertyRepository(BaseRepository):
                 conditions.append(self.table.c.id != exclude_id)
             
             stmt = select(self.table).where(and_(*conditions))
-            result = conn.execute(stmt)
+            result = await conn.execute(stmt)
             row = result.fetchone()
             if row:
                 return dict(row._mapping)
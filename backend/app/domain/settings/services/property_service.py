@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from fastapi import HTTPException, status
@@ -37,18 +37,30 @@ class PropertyService:
         
         # Create property
         created_property = await self.repository.create_property(property_dict)
+        await self.repository.invalidate_cache()
         
         # If setting as default, unset previous default (after creation)
         if created_property.get("is_default"):
             await self.repository.set_default_property(created_property["id"])
+            await self.repository.invalidate_cache()
             # Refetch to get updated data
             created_property = await self.repository.find_by_id(created_property["id"])
         
         return PropertyResponse(**created_property)
     
-    async def get_properties(self, include_deleted: bool = False) -> List[PropertyResponse]:
-        """Get all properties (system-wide)"""
+    async def get_version(self, property_id: Optional[UUID] = None) -> Tuple[Any, ...]:
+        """Change marker for all properties (or one property), used for ETags"""
+        return await self.repository.get_version(property_id)
+    
+    async def get_properties(
+        self,
+        include_deleted: bool = False,
+        as_rows: bool = False
+    ) -> List[PropertyResponse] | List[Dict[str, Any]]:
+        """Get all properties (system-wide; as_rows returns the raw rows for fast serialization)"""
         properties = await self.repository.find_all(include_deleted)
+        if as_rows:
+            return properties
         return [PropertyResponse(**property) for property in properties]
     
     async def get_property(self, property_id: UUID) -> PropertyResponse:
@@ -82,6 +94,7 @@ class PropertyService:
             if property_data.is_default:
                 # Set this property as default (will unset previous default)
                 await self.repository.set_default_property(property_id)
+                await self.repository.invalidate_cache()
                 # Remove is_default from update_dict since it's handled by set_default_property
                 update_dict.pop("is_default", None)
             else:
@@ -95,6 +108,7 @@ class PropertyService:
                         other_properties = [p for p in all_properties if p["id"] != property_id]
                         if other_properties:
                             await self.repository.set_default_property(other_properties[0]["id"])
+                            await self.repository.invalidate_cache()
                     # If this is the only property, we can't unset default
                     else:
                         raise HTTPException(
@@ -105,6 +119,7 @@ class PropertyService:
         # Update property if there's anything to update
         if update_dict:
             updated_property = await self.repository.update_property(property_id, update_dict)
+            await self.repository.invalidate_cache()
             if not updated_property:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -128,6 +143,7 @@ class PropertyService:
             if other_properties:
                 # Set another property as default
                 await self.repository.set_default_property(other_properties[0]["id"])
+                await self.repository.invalidate_cache()
             else:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -135,6 +151,7 @@ class PropertyService:
                 )
         
         deleted = await self.repository.soft_delete_property(property_id)
+        await self.repository.invalidate_cache()
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,12 +1,40 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import transactions, categories, expenses, notes, properties
+from app.core.database import dispose_db
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.cache import start_invalidation_listener
+from app.core.scheduler import ScheduledJob, start_scheduler
+from app.domain.finance.services.expense_materialization_service import MATERIALIZATION_JOB, materialize_due_expenses
+from app.domain.finance.services.archive_service import ARCHIVE_JOB, archive_soft_deleted
+from app.domain.finance.services.transaction_partition_service import PARTITION_JOB, maintain_transaction_partitions
+from app.api.v1 import transactions, categories, expenses, notes, properties, dashboard, search
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown"""
+    cache_listener = await start_invalidation_listener()
+    scheduler = start_scheduler([
+        ScheduledJob(MATERIALIZATION_JOB, settings.EXPENSE_MATERIALIZATION_INTERVAL_SECONDS, materialize_due_expenses),
+        ScheduledJob(ARCHIVE_JOB, settings.ARCHIVE_INTERVAL_SECONDS, archive_soft_deleted),
+        ScheduledJob(PARTITION_JOB, settings.TRANSACTION_PARTITION_INTERVAL_SECONDS, maintain_transaction_partitions),
+    ])
+    yield
+    if scheduler:
+        await scheduler.stop()
+    if cache_listener:
+        await cache_listener.stop()
+    # Release pooled database connections on shutdown
+    await dispose_db()
+
 
 app = FastAPI(
     title="Nexus API",
     description="Multi-domain home management API for tracking finances, household expenses, groceries, and more",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -16,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -24,6 +53,8 @@ app.include_router(categories.router, prefix="/api/v1/categories", tags=["catego
 app.include_router(expenses.router, prefix="/api/v1/expenses", tags=["expenses"])
 app.include_router(notes.router, prefix="/api/v1/notes", tags=["notes"])
 app.include_router(properties.router, prefix="/api/v1", tags=["properties"])
+app.include_router(dashboard.router, prefix="/api/v1/finance", tags=["dashboard"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
 
 
 @app.get("/")
@@ -0,0 +1,69 @@
+"""
+Concurrent load benchmark for the async repository layer.
+
+Runs the transaction list query from N concurrent clients for a fixed duration
+and reports throughput per concurrency level. With the async engine, throughput
+should grow with the number of clients (up to the pool size) instead of staying
+flat at one query at a time.
+
+Usage:
+    python -m benchmarks.load_benchmark --concurrency 1,2,4,8,16 --duration 5
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+from uuid import UUID
+
+from app.core.config import get_default_user_id
+from app.core.database import dispose_db
+from app.domain.finance.repositories.transaction_repository import TransactionRepository
+
+
+async def run_client(repository: TransactionRepository, user_id: UUID, deadline: float, limit: int) -> int:
+    """Issue list queries until the deadline, return the number completed"""
+    completed = 0
+    while time.perf_counter() < deadline:
+        await repository.find_by_user_id(user_id, limit=limit)
+        completed += 1
+    return completed
+
+
+async def run_level(concurrency: int, duration: float, user_id: UUID, limit: int) -> float:
+    """Run one concurrency level and return queries per second"""
+    repository = TransactionRepository()
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    counts = await asyncio.gather(
+        *[run_client(repository, user_id, deadline, limit) for _ in range(concurrency)]
+    )
+    elapsed = time.perf_counter() - started
+    return sum(counts) / elapsed
+
+
+async def main(levels: List[int], duration: float, user_id: UUID, limit: int) -> None:
+    print(f"{'clients':>8} {'queries/s':>12} {'speedup':>8}")
+    baseline = None
+    try:
+        for concurrency in levels:
+            qps = await run_level(concurrency, duration, user_id, limit)
+            baseline = baseline or qps
+            print(f"{concurrency:>8} {qps:>12.1f} {qps / baseline:>7.2f}x")
+    finally:
+        await dispose_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument("--limit", type=int, default=50, help="Rows per list query")
+    parser.add_argument("--user-id", type=UUID, default=None, help="User to query (defaults to DEFAULT_USER_ID)")
+    args = parser.parse_args()
+
+    asyncio.run(main(
+        [int(level) for level in args.concurrency.split(",")],
+        args.duration,
+        args.user_id or get_default_user_id(),
+        args.limit,
+    ))
@@ -0,0 +1,158 @@
+"""
+Concurrency stress test for the installment payment counter.
+
+Creates a throwaway user with one installment expense, then records payments
+for it from many concurrent clients (each payment in its own unit of work, like
+API requests) and checks that no increment was lost: payments_completed must
+equal the number of payments and the expense must be deactivated once
+total_payments is reached. The same payments are then reverted concurrently
+(as when their transactions are deleted), which must bring the count back to
+zero and reactivate the expense. Exits with code 1 on any mismatch.
+
+--mode read-modify-write runs the previous implementation (read the count,
+add one in Python, write it back) for comparison; it is expected to lose
+increments under load.
+
+Usage:
+    python -m benchmarks.payment_counter_stress --clients 32 --payments 50
+    python -m benchmarks.payment_counter_stress --mode read-modify-write
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable, Dict
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.database import async_engine, dispose_db
+from app.core.unit_of_work import UnitOfWork
+from app.domain.finance.repositories.expense_repository import ExpenseRepository
+from app.domain.finance.services.expense_service import ExpenseService
+
+STRESS_USER_ID = UUID("00000000-0000-0000-0000-0000000c0001")
+STRESS_PROPERTY_NAME = "Payment Counter Stress"
+
+CLEANUP_STATEMENTS = [
+    "DELETE FROM expenses WHERE user_id = :user_id",
+    "DELETE FROM finance_categories WHERE user_id = :user_id",
+    "DELETE FROM users WHERE id = :user_id",
+]
+
+
+async def setup(total_payments: int) -> UUID:
+    """Recreate the stress user with one installment expense, return the expense id"""
+    async with async_engine.begin() as conn:
+        await cleanup(conn)
+        property_id = (await conn.execute(text("""
+            INSERT INTO properties (name) VALUES (:name)
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+            RETURNING id
+        """), {"name": STRESS_PROPERTY_NAME})).scalar_one()
+        await conn.execute(text("""
+            INSERT INTO users (id, email, first_name, last_name)
+            VALUES (:user_id, 'payment-stress@nexus.local', 'Stress', 'User')
+        """), {"user_id": STRESS_USER_ID})
+        category_id = (await conn.execute(text("""
+            INSERT INTO finance_categories (user_id, name, type) VALUES (:user_id, 'Stress', 'expense')
+            RETURNING id
+        """), {"user_id": STRESS_USER_ID})).scalar_one()
+        return (await conn.execute(text("""
+            INSERT INTO expenses (user_id, property_id, name, amount, category_id, day_of_month, expense_type,
+                                  start_date, total_payments, payments_completed, is_active)
+            VALUES (:user_id, :property_id, 'Stress installment', 10, :category_id, 1, 'installment',
+                    current_date, :total_payments, 0, true)
+            RETURNING id
+        """), {
+            "user_id": STRESS_USER_ID,
+            "property_id": property_id,
+            "category_id": category_id,
+            "total_payments": total_payments,
+        })).scalar_one()
+
+
+async def cleanup(conn) -> None:
+    for statement in CLEANUP_STATEMENTS:
+        await conn.execute(text(statement), {"user_id": STRESS_USER_ID})
+
+
+async def read_modify_write(expense_id: UUID, delta: int) -> None:
+    """The previous counter update: read, add in Python, write back"""
+    uow = UnitOfWork()
+    repository = ExpenseRepository(uow)
+    async with uow:
+        expense = await repository.find_by_user_and_id(STRESS_USER_ID, expense_id)
+        completed = expense["payments_completed"] + delta
+        await repository.update(expense_id, {
+            "payments_completed": completed,
+            "is_active": completed < expense["total_payments"],
+        })
+
+
+async def atomic(expense_id: UUID, delta: int) -> None:
+    service = ExpenseService(UnitOfWork())
+    if delta > 0:
+        await service.record_payment(STRESS_USER_ID, expense_id)
+    else:
+        await service.revert_payment(STRESS_USER_ID, expense_id)
+
+
+MODES: Dict[str, Callable[[UUID, int], Awaitable[None]]] = {
+    "atomic": atomic,
+    "read-modify-write": read_modify_write,
+}
+
+
+async def run_phase(update: Callable[[UUID, int], Awaitable[None]], expense_id: UUID, clients: int, payments: int, delta: int) -> float:
+    """Apply clients x payments counter updates concurrently, return updates per second"""
+    async def client() -> None:
+        for _ in range(payments):
+            await update(expense_id, delta)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(clients)])
+    return clients * payments / (time.perf_counter() - started)
+
+
+async def check(expense_id: UUID, phase: str, expected_completed: int, expected_active: bool) -> bool:
+    expense = await ExpenseRepository().find_by_user_and_id(STRESS_USER_ID, expense_id)
+    completed, active = expense["payments_completed"], expense["is_active"]
+    ok = completed == expected_completed and active == expected_active
+    lost = abs(expected_completed - completed)
+    print(
+        f"{phase:>8}: payments_completed={completed} (expected {expected_completed}, {lost} lost), "
+        f"is_active={active} (expected {expected_active}) {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+async def main(args: argparse.Namespace) -> int:
+    update = MODES[args.mode]
+    total = args.clients * args.payments
+    try:
+        expense_id = await setup(total)
+        print(f"{args.mode}: {args.clients} clients x {args.payments} payments on one expense")
+
+        rate = await run_phase(update, expense_id, args.clients, args.payments, 1)
+        print(f"{'record':>8}: {rate:.0f} payments/s")
+        ok = await check(expense_id, "record", total, False)
+
+        rate = await run_phase(update, expense_id, args.clients, args.payments, -1)
+        print(f"{'revert':>8}: {rate:.0f} payments/s")
+        ok = await check(expense_id, "revert", 0, True) and ok
+    finally:
+        if not args.keep:
+            async with async_engine.begin() as conn:
+                await cleanup(conn)
+        await dispose_db()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--payments", type=int, default=50, help="Payments recorded (then reverted) per client")
+    parser.add_argument("--mode", choices=sorted(MODES), default="atomic", help="Counter implementation to stress")
+    parser.add_argument("--keep", action="store_true", help="Keep the stress user and expense afterwards")
+    sys.exit(asyncio.run(main(parser.parse_args())))
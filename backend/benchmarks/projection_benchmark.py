@@ -0,0 +1,123 @@
+"""
+Expense projection microbenchmark (no database needed).
+
+Times `project_expenses` and `forecast_by_month` (app/domain/finance/services/
+expense_projection.py) on synthetic expense rows: a mix of ongoing and
+installment expenses, every day_of_month, some behind on payments.
+
+Before timing, checks `materializable_due_dates` on fixed cases, e.g. an
+installment paid by hand in a month other than its first unpaid one.
+
+Usage:
+    python -m benchmarks.projection_benchmark --expenses 100,500,2000 --months 24
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from app.domain.finance.services.expense_projection import (
+    forecast_by_month,
+    materializable_due_dates,
+    project_expenses,
+)
+
+
+def synthetic_expenses(count: int, today: date) -> List[Dict[str, Any]]:
+    """Rows shaped like ExpenseRepository results"""
+    rng = random.Random(count)
+    user_id, property_id = uuid.uuid4(), uuid.uuid4()
+    categories = [uuid.uuid4() for _ in range(12)]
+    now = datetime.now(timezone.utc)
+    rows = []
+    for index in range(count):
+        installment = index % 2 == 0
+        start_date = date(today.year - rng.randint(0, 2), rng.randint(1, 12), rng.randint(1, 28))
+        total_payments = rng.randint(6, 60) if installment else None
+        rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "property_id": property_id,
+            "name": f"Expense {index}",
+            "amount": Decimal(rng.randint(500, 500000)) / 100 if index % 7 else None,
+            "category_id": categories[index % len(categories)],
+            "day_of_month": index % 31 + 1,
+            "expense_type": "installment" if installment else "ongoing",
+            "start_date": start_date,
+            "total_payments": total_payments,
+            "payments_completed": rng.randint(0, total_payments) if installment else 0,
+            "is_active": True,
+            "notes": None,
+            "deleted_at": None,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return rows
+
+
+def check_materialization() -> None:
+    """Materialized due dates for fixed cases (the job missed its runs since materialized_through)"""
+    installment = {
+        "expense_type": "installment",
+        "day_of_month": 10,
+        "start_date": date(2026, 1, 1),
+        "total_payments": 6,
+        # The hand payment in April was counted; materialization must not shift by it
+        "payments_completed": 1,
+    }
+    cases = [
+        # Paid by hand in April only: January-March and May-June are materialized
+        (
+            "installment, hand payment in a later month",
+            installment, date(2025, 12, 31), date(2026, 8, 31), [date(2026, 4, 1)],
+            [date(2026, 1, 10), date(2026, 2, 10), date(2026, 3, 10), date(2026, 5, 10), date(2026, 6, 10)], 1,
+        ),
+        (
+            "installment, no hand payment",
+            {**installment, "payments_completed": 0}, date(2026, 2, 10), date(2026, 4, 30), [],
+            [date(2026, 3, 10), date(2026, 4, 10)], 0,
+        ),
+        (
+            "ongoing, hand payment in a later month",
+            {**installment, "expense_type": "ongoing", "total_payments": None, "payments_completed": 0},
+            date(2026, 5, 31), date(2026, 8, 31), [date(2026, 7, 1)],
+            [date(2026, 6, 10), date(2026, 8, 10)], 1,
+        ),
+    ]
+    for name, expense, after, through, paid_months, expected, expected_skipped in cases:
+        due_dates, skipped = materializable_due_dates(expense, after, through, paid_months)
+        assert (due_dates, skipped) == (expected, expected_skipped), f"{name}: {due_dates}, {skipped} skipped"
+    print(f"materialization checks passed ({len(cases)} cases)")
+
+
+def main(sizes: List[int], months: int, repeat: int) -> None:
+    check_materialization()
+    today = date.today()
+    print(f"{'expenses':>8} {'payments':>9} {'overdue':>8} {'schedule ms':>12} {'forecast ms':>12}")
+    for size in sizes:
+        expenses = synthetic_expenses(size, today)
+        best_schedule = best_forecast = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            payments = project_expenses(expenses, today, months)
+            projected = time.perf_counter()
+            forecast_by_month(payments, today, months)
+            best_schedule = min(best_schedule, projected - started)
+            best_forecast = min(best_forecast, time.perf_counter() - projected)
+        overdue = sum(1 for payment in payments if payment.overdue)
+        print(
+            f"{size:>8} {len(payments):>9} {overdue:>8} "
+            f"{best_schedule * 1000:>12.2f} {best_forecast * 1000:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--expenses", default="100,500,2000", help="Comma-separated expense counts")
+    parser.add_argument("--months", type=int, default=24, help="Months to project")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size (best is reported)")
+    args = parser.parse_args()
+    main([int(size) for size in args.expenses.split(",")], args.months, args.repeat)
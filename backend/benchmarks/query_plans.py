@@ -0,0 +1,576 @@
+"""
+Query-plan regression suite for the repository layer.
+
+Seeds a local Postgres with synthetic users, categories, expenses, notes and
+transactions, runs every repository query scenario below while recording the
+SQL it emits, and runs EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) on each captured
+statement inside a rolled-back transaction. Plans are compared against stored
+snapshots and the run fails (exit code 1) when a statement:
+
+- falls back to a sequential scan that reads more than --seq-scan-rows rows, or
+- touches more shared buffers than its snapshot by more than --buffer-threshold.
+
+Scenarios themselves also run in a unit of work that is rolled back, so write
+queries leave no trace. Each statement is EXPLAINed after replaying the ones
+the scenario ran before it (e.g. the DELETE before a rebuild's INSERT, or the
+CREATE TABLE a partition copy writes to), in the same rolled-back transaction.
+
+Every public repository method needs a scenario, named "<repository>.<method>"
+or "<repository>.<method>.<variant>"; the run fails before touching the
+database when one is missing.
+
+Usage:
+    python -m benchmarks.query_plans --seed --transactions 200000
+    python -m benchmarks.query_plans                  # compare with snapshots
+    python -m benchmarks.query_plans --update         # accept current plans
+"""
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import pkgutil
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, text
+
+import app.domain
+from app.core.database import async_engine, dispose_db
+from app.core.repository import BaseRepository
+from app.core.unit_of_work import UnitOfWork
+from app.domain.auth.repositories.user_repository import UserRepository
+from app.domain.finance.dto.archive_dto import ArchiveEntity
+from app.domain.finance.dto.search_dto import SearchEntity
+from app.domain.finance.repositories.archive_repository import ArchiveRepository
+from app.domain.finance.repositories.category_repository import CategoryRepository
+from app.domain.finance.repositories.expense_repository import ExpenseRepository
+from app.domain.finance.repositories.note_repository import NoteRepository
+from app.domain.finance.repositories.partition_repository import PartitionRepository
+from app.domain.finance.repositories.reference_repository import ReferenceRepository
+from app.domain.finance.repositories.rollup_repository import RollupRepository
+from app.domain.finance.repositories.search_repository import SearchRepository
+from app.domain.finance.repositories.transaction_repository import TransactionRepository
+from app.domain.settings.repositories.property_repository import PropertyRepository
+
+SNAPSHOT_PATH = Path(__file__).with_name("query_plan_snapshots.json")
+BENCH_USER_PREFIX = "00000000-0000-0000-0000-0000000b"
+BENCH_PROPERTY_NAME = "Query Plan Benchmark"
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# Transaction control is left to the EXPLAIN connection, never replayed
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+def bench_user_ids(count: int) -> List[UUID]:
+    """Deterministic ids for the synthetic users"""
+    return [UUID(f"{BENCH_USER_PREFIX}{index:04d}") for index in range(1, count + 1)]
+
+
+# --- Seeding -----------------------------------------------------------------
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO finance_categories (user_id, name, type, color)
+    SELECT :user_id, 'Category ' || g, CASE WHEN g <= 3 THEN 'income' ELSE 'expense' END::category_type, '#336699'
+    FROM generate_series(1, 12) g
+    """,
+    """
+    INSERT INTO expenses (user_id, property_id, name, amount, category_id, day_of_month, expense_type,
+                          start_date, total_payments, payments_completed, is_active)
+    SELECT :user_id, :property_id, 'Expense ' || g, 100 + g, c.ids[1 + g % array_length(c.ids, 1)], 1 + g % 28,
+           CASE WHEN g % 2 = 0 THEN 'installment' ELSE 'ongoing' END::expense_type,
+           current_date - 365, CASE WHEN g % 2 = 0 THEN 24 END, 0, g % 5 <> 0
+    FROM generate_series(1, 20) g,
+         (SELECT array_agg(id ORDER BY id) AS ids FROM finance_categories WHERE user_id = :user_id) c
+    """,
+    """
+    INSERT INTO notes (user_id, domain, year, month, notes)
+    SELECT :user_id, 'finance', extract(year FROM d)::int, extract(month FROM d)::int, 'Synthetic note'
+    FROM generate_series(date_trunc('month', current_date) - interval '23 months',
+                         date_trunc('month', current_date), interval '1 month') d
+    """,
+    """
+    INSERT INTO finance_transactions (user_id, property_id, date, amount, description, category_id,
+                                      expense_id, payment_method, deleted_at)
+    SELECT :user_id, :property_id, current_date - (g % :days), round((random() * 500)::numeric, 2) + 1,
+           'Synthetic transaction ' || (g % 500), c.ids[1 + g % array_length(c.ids, 1)],
+           CASE WHEN g % 10 = 0 THEN e.ids[1 + g % array_length(e.ids, 1)] END, 'card',
+           CASE WHEN g % 50 = 0 THEN now() END
+    FROM generate_series(1, :per_user) g,
+         (SELECT array_agg(id ORDER BY id) AS ids FROM finance_categories WHERE user_id = :user_id) c,
+         (SELECT array_agg(id ORDER BY id) AS ids FROM expenses WHERE user_id = :user_id) e
+    """,
+]
+
+CLEANUP_STATEMENTS = [
+    "DELETE FROM finance_transaction_rollups WHERE user_id = ANY(:user_ids)",
+    "DELETE FROM finance_transactions WHERE user_id = ANY(:user_ids)",
+    "DELETE FROM expenses WHERE user_id = ANY(:user_ids)",
+    "DELETE FROM finance_categories WHERE user_id = ANY(:user_ids)",
+    "DELETE FROM notes WHERE user_id = ANY(:user_ids)",
+    "DELETE FROM users WHERE id = ANY(:user_ids)",
+]
+
+
+async def vacuum(analyze: bool = False) -> None:
+    """VACUUM the database (cannot run inside a transaction)"""
+    async with async_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE" if analyze else "VACUUM"))
+
+
+async def seed(users: int, transactions: int, days: int) -> None:
+    """Replace the synthetic data set (other users' data is untouched)"""
+    user_ids = bench_user_ids(users)
+    async with async_engine.begin() as conn:
+        existing = await conn.execute(text("SELECT id FROM users WHERE id::text LIKE :prefix"), {"prefix": f"{BENCH_USER_PREFIX}%"})
+        stale = [row.id for row in existing.fetchall()]
+        for statement in CLEANUP_STATEMENTS:
+            await conn.execute(text(statement), {"user_ids": stale})
+
+        property_id = (await conn.execute(text("""
+            INSERT INTO properties (name) VALUES (:name)
+            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+            RETURNING id
+        """), {"name": BENCH_PROPERTY_NAME})).scalar_one()
+
+        per_user = max(transactions // users, 1)
+        for index, user_id in enumerate(user_ids, start=1):
+            await conn.execute(text("""
+                INSERT INTO users (id, email, first_name, last_name)
+                VALUES (:user_id, :email, 'Benchmark', 'User')
+            """), {"user_id": user_id, "email": f"bench{index}@nexus.local"})
+            params = {"user_id": user_id, "property_id": property_id, "per_user": per_user, "days": days}
+            for statement in SEED_STATEMENTS:
+                await conn.execute(text(statement), params)
+
+    rollups = RollupRepository()
+    for user_id in user_ids:
+        await rollups.rebuild(user_id)
+
+    await vacuum(analyze=True)
+    print(f"Seeded {users} users x {per_user} transactions over {days} days")
+
+
+# --- Scenarios ---------------------------------------------------------------
+
+@dataclass
+class Context:
+    """Ids and dates the scenarios query with (taken from the first synthetic user)"""
+    user_id: UUID
+    property_id: UUID
+    category_id: UUID
+    expense_id: UUID
+    note_id: UUID
+    transaction: Dict[str, Any]
+    today: date = field(default_factory=date.today)
+
+
+Scenario = Callable[[UnitOfWork, Context], Awaitable[Any]]
+
+
+async def stream_first_batch(uow: UnitOfWork, ctx: Context) -> None:
+    async for _ in TransactionRepository(uow).stream_by_user_id(ctx.user_id, ["id", "date", "amount"], batch_size=500):
+        break
+
+
+def new_transaction(ctx: Context, **values: Any) -> Dict[str, Any]:
+    """Insertable copy of the context transaction"""
+    keys = ("user_id", "property_id", "date", "amount", "category_id")
+    return {**{key: ctx.transaction[key] for key in keys}, **values}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "transactions.find_by_user_id.first_page": lambda uow, ctx: TransactionRepository(uow).find_by_user_id(
+        ctx.user_id, limit=51),
+    "transactions.find_by_user_id.keyset_page": lambda uow, ctx: TransactionRepository(uow).find_by_user_id(
+        ctx.user_id, limit=51, after=(ctx.today - timedelta(days=700), ctx.transaction["id"])),
+    "transactions.find_by_user_id.date_range": lambda uow, ctx: TransactionRepository(uow).find_by_user_id(
+        ctx.user_id, ctx.today - timedelta(days=30), ctx.today, limit=51),
+    "transactions.find_by_user_id.category": lambda uow, ctx: TransactionRepository(uow).find_by_user_id(
+        ctx.user_id, category_id=ctx.category_id, limit=51),
+    "transactions.find_by_user_id.tags_any": lambda uow, ctx: TransactionRepository(uow).find_by_user_id(
+        ctx.user_id, limit=51, tags_any=["rent", "utilities"]),
+    "transactions.find_by_user_id.tags_all": lambda uow, ctx: TransactionRepository(uow).find_by_user_id(
+        ctx.user_id, limit=51, tags_all=["rent", "utilities"]),
+    "transactions.tag_facets": lambda uow, ctx: TransactionRepository(uow).tag_facets(
+        ctx.user_id, ctx.today - timedelta(days=365), ctx.today),
+    "transactions.find_by_user_and_id": lambda uow, ctx: TransactionRepository(uow).find_by_user_and_id(
+        ctx.user_id, ctx.transaction["id"]),
+    "transactions.find_by_id": lambda uow, ctx: TransactionRepository(uow).find_by_id(ctx.transaction["id"]),
+    "transactions.get_version": lambda uow, ctx: TransactionRepository(uow).get_version(
+        ctx.user_id, ctx.transaction["id"]),
+    "transactions.find_by_fingerprint": lambda uow, ctx: TransactionRepository(uow).find_by_fingerprint(
+        ctx.user_id, "0" * 64, ctx.today),
+    "transactions.find_by_fingerprint.any_date": lambda uow, ctx: TransactionRepository(uow).find_by_fingerprint(
+        ctx.user_id, "0" * 64),
+    "transactions.lock_fingerprint": lambda uow, ctx: TransactionRepository(uow).lock_fingerprint("0" * 64),
+    "transactions.suggest_descriptions.prefix": lambda uow, ctx: TransactionRepository(uow).suggest_descriptions(
+        ctx.user_id, "sy", ctx.today - timedelta(days=730)),
+    "transactions.suggest_descriptions.substring": lambda uow, ctx: TransactionRepository(uow).suggest_descriptions(
+        ctx.user_id, "transaction 4", ctx.today - timedelta(days=730)),
+    "transactions.stream_by_user_id": stream_first_batch,
+    "transactions.sum_by_category.month": lambda uow, ctx: TransactionRepository(uow).sum_by_category(
+        ctx.user_id, ctx.today.replace(day=1), ctx.today),
+    "transactions.aggregate_series.day": lambda uow, ctx: TransactionRepository(uow).aggregate_series(
+        ctx.user_id, "day", ctx.today - timedelta(days=90), ctx.today),
+    "transactions.aggregate_series.week_category": lambda uow, ctx: TransactionRepository(uow).aggregate_series(
+        ctx.user_id, "week", ctx.today - timedelta(days=365), ctx.today, category_id=ctx.category_id),
+    "transactions.create": lambda uow, ctx: TransactionRepository(uow).create(new_transaction(ctx)),
+    "transactions.create_many": lambda uow, ctx: TransactionRepository(uow).create_many([
+        new_transaction(ctx, fingerprint=f"{index:064d}") for index in range(100)
+    ], skip_duplicates=True),
+    "transactions.update": lambda uow, ctx: TransactionRepository(uow).update(
+        ctx.transaction["id"], {"description": "Updated"}),
+    "transactions.soft_delete": lambda uow, ctx: TransactionRepository(uow).soft_delete(
+        ctx.transaction["id"], ctx.transaction["date"]),
+    "rollups.get_version": lambda uow, ctx: RollupRepository(uow).get_version(ctx.user_id),
+    "rollups.rebuild.user": lambda uow, ctx: RollupRepository(uow).rebuild(ctx.user_id),
+    "rollups.apply_transactions": lambda uow, ctx: RollupRepository(uow).apply_transactions([ctx.transaction]),
+    "rollups.sum_by_category": lambda uow, ctx: RollupRepository(uow).sum_by_category(
+        ctx.user_id, ctx.today.replace(day=1), ctx.today),
+    "rollups.aggregate_series.month": lambda uow, ctx: RollupRepository(uow).aggregate_series(
+        ctx.user_id, "month", date(ctx.today.year - 1, 1, 1), date(ctx.today.year, 12, 31)),
+    "rollups.remove_detached_partition": lambda uow, ctx: RollupRepository(uow).remove_detached_partition(
+        "finance_transactions_default"),
+    "expenses.find_by_user_id": lambda uow, ctx: ExpenseRepository(uow).find_by_user_id(ctx.user_id, is_active=True),
+    "expenses.find_by_user_and_id": lambda uow, ctx: ExpenseRepository(uow).find_by_user_and_id(
+        ctx.user_id, ctx.expense_id),
+    "expenses.find_by_id": lambda uow, ctx: ExpenseRepository(uow).find_by_id(ctx.expense_id),
+    "expenses.get_version": lambda uow, ctx: ExpenseRepository(uow).get_version(ctx.user_id),
+    "expenses.create": lambda uow, ctx: ExpenseRepository(uow).create({
+        "user_id": ctx.user_id, "property_id": ctx.property_id, "category_id": ctx.category_id,
+        "name": "Benchmark expense", "amount": 100, "day_of_month": 15, "expense_type": "ongoing",
+        "start_date": ctx.today, "materialized_through": ctx.today}),
+    "expenses.update": lambda uow, ctx: ExpenseRepository(uow).update(ctx.expense_id, {"name": "Updated"}),
+    "expenses.soft_delete": lambda uow, ctx: ExpenseRepository(uow).soft_delete(ctx.expense_id),
+    "expenses.record_payments": lambda uow, ctx: ExpenseRepository(uow).record_payments(
+        ctx.user_id, {ctx.expense_id: 2}),
+    "expenses.add_payment": lambda uow, ctx: ExpenseRepository(uow).add_payment(ctx.user_id, ctx.expense_id),
+    "expenses.reconcile_payments.user": lambda uow, ctx: ExpenseRepository(uow).reconcile_payments(ctx.user_id),
+    "expenses.reconcile_payments.all": lambda uow, ctx: ExpenseRepository(uow).reconcile_payments(),
+    "expenses.find_due_for_materialization": lambda uow, ctx: ExpenseRepository(uow).find_due_for_materialization(
+        ctx.today, 500),
+    "expenses.mark_materialized": lambda uow, ctx: ExpenseRepository(uow).mark_materialized(
+        [ctx.expense_id], ctx.today),
+    "archive.archive_batch.transactions": lambda uow, ctx: ArchiveRepository(uow).archive_batch(
+        ArchiveEntity.transactions, datetime.now(timezone.utc) - timedelta(days=90), 1000),
+    "archive.archive_batch.categories": lambda uow, ctx: ArchiveRepository(uow).archive_batch(
+        ArchiveEntity.categories, datetime.now(timezone.utc) - timedelta(days=90), 1000),
+    "archive.restore.transactions": lambda uow, ctx: ArchiveRepository(uow).restore(
+        ArchiveEntity.transactions, ctx.user_id, [ctx.transaction["id"]]),
+    "archive.count_archived.transactions": lambda uow, ctx: ArchiveRepository(uow).count_archived(
+        ArchiveEntity.transactions, ctx.user_id),
+    "categories.find_by_user_id": lambda uow, ctx: CategoryRepository(uow).find_by_user_id(ctx.user_id),
+    "categories.find_by_user_and_name": lambda uow, ctx: CategoryRepository(uow).find_by_user_and_name(
+        ctx.user_id, "Category 1"),
+    "categories.find_by_user_and_id": lambda uow, ctx: CategoryRepository(uow).find_by_user_and_id(
+        ctx.user_id, ctx.category_id),
+    "categories.get_version": lambda uow, ctx: CategoryRepository(uow).get_version(ctx.user_id),
+    "categories.create": lambda uow, ctx: CategoryRepository(uow).create({
+        "user_id": ctx.user_id, "name": "Benchmark category", "type": "expense", "color": "#336699"}),
+    "categories.update": lambda uow, ctx: CategoryRepository(uow).update(ctx.category_id, {"color": "#993366"}),
+    "categories.soft_delete": lambda uow, ctx: CategoryRepository(uow).soft_delete(ctx.category_id),
+    "notes.find_by_user_id": lambda uow, ctx: NoteRepository(uow).find_by_user_id(ctx.user_id),
+    "notes.find_by_user_and_period": lambda uow, ctx: NoteRepository(uow).find_by_user_and_period(
+        ctx.user_id, ctx.today.year, ctx.today.month),
+    "notes.find_by_user_and_id": lambda uow, ctx: NoteRepository(uow).find_by_user_and_id(ctx.user_id, ctx.note_id),
+    "notes.find_by_id": lambda uow, ctx: NoteRepository(uow).find_by_id(ctx.note_id),
+    "notes.get_version": lambda uow, ctx: NoteRepository(uow).get_version(ctx.user_id),
+    "notes.create": lambda uow, ctx: NoteRepository(uow).create({
+        "user_id": ctx.user_id, "domain": "finance", "year": ctx.today.year + 1, "month": None, "notes": "Benchmark"}),
+    "notes.update": lambda uow, ctx: NoteRepository(uow).update(ctx.note_id, {"notes": "Updated"}),
+    "notes.soft_delete": lambda uow, ctx: NoteRepository(uow).soft_delete(ctx.note_id),
+    "partitions.find_partitions": lambda uow, ctx: PartitionRepository(uow).find_partitions(),
+    # Far enough ahead that no partition covers it yet
+    "partitions.create_partition": lambda uow, ctx: PartitionRepository(uow).create_partition(
+        "finance_transactions_query_plans", date(ctx.today.year + 50, 1, 1), date(ctx.today.year + 51, 1, 1)),
+    "partitions.detach_partition": lambda uow, ctx: PartitionRepository(uow).detach_partition(
+        "finance_transactions_default"),
+    "search.search.all": lambda uow, ctx: SearchRepository(uow).search(
+        ctx.user_id, "synthetic", list(SearchEntity), limit=21),
+    "search.search.transactions_phrase": lambda uow, ctx: SearchRepository(uow).search(
+        ctx.user_id, '"synthetic transaction 12" -cash', [SearchEntity.transactions], limit=21, offset=20),
+    "properties.find_all": lambda uow, ctx: PropertyRepository(uow).find_all(),
+    "properties.find_by_id": lambda uow, ctx: PropertyRepository(uow).find_by_id(ctx.property_id),
+    "properties.find_by_name": lambda uow, ctx: PropertyRepository(uow).find_by_name(
+        BENCH_PROPERTY_NAME, exclude_id=ctx.property_id),
+    "properties.get_default_property": lambda uow, ctx: PropertyRepository(uow).get_default_property(),
+    "properties.get_version": lambda uow, ctx: PropertyRepository(uow).get_version(),
+    "properties.create_property": lambda uow, ctx: PropertyRepository(uow).create_property(
+        {"name": f"{BENCH_PROPERTY_NAME} (new)"}),
+    "properties.update_property": lambda uow, ctx: PropertyRepository(uow).update_property(
+        ctx.property_id, {"is_active": True}),
+    "properties.set_default_property": lambda uow, ctx: PropertyRepository(uow).set_default_property(ctx.property_id),
+    "properties.soft_delete_property": lambda uow, ctx: PropertyRepository(uow).soft_delete_property(ctx.property_id),
+    "references.check_references": lambda uow, ctx: ReferenceRepository(uow).check_references(
+        ctx.user_id, ctx.category_id, ctx.property_id, ctx.expense_id),
+    "references.find_existing": lambda uow, ctx: ReferenceRepository(uow).find_existing(
+        ctx.user_id, [ctx.category_id], [ctx.property_id], [ctx.expense_id]),
+    "users.find_by_id": lambda uow, ctx: UserRepository(uow).find_by_id(ctx.user_id),
+    "users.find_by_email": lambda uow, ctx: UserRepository(uow).find_by_email("bench1@nexus.local"),
+}
+
+# Scenario prefix -> (repository, BaseRepository methods the services call on it).
+# Public methods defined on the repository itself always need a scenario.
+REPOSITORIES: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "transactions": (TransactionRepository, ("create", "update", "find_by_id")),
+    "rollups": (RollupRepository, ()),
+    "expenses": (ExpenseRepository, ("create", "update", "find_by_id")),
+    "archive": (ArchiveRepository, ()),
+    "categories": (CategoryRepository, ("create", "update")),
+    "notes": (NoteRepository, ("create", "update", "find_by_id")),
+    "partitions": (PartitionRepository, ()),
+    "search": (SearchRepository, ()),
+    "properties": (PropertyRepository, ()),
+    "references": (ReferenceRepository, ()),
+    "users": (UserRepository, ("find_by_id",)),
+}
+
+# Methods without a scenario, and why
+UNCOVERED = {
+    "categories.invalidate_cache": "no query (pg_notify only with CACHE_NOTIFY_ENABLED)",
+    "properties.invalidate_cache": "no query (pg_notify only with CACHE_NOTIFY_ENABLED)",
+    "users.create_user": "inserts a hashed_password column the users table does not have",
+}
+
+
+def repository_classes() -> List[type]:
+    """Every repository class under app/domain/*/repositories"""
+    classes = []
+    for module_info in pkgutil.walk_packages(app.domain.__path__, "app.domain."):
+        if ".repositories." not in module_info.name:
+            continue
+        module = importlib.import_module(module_info.name)
+        classes.extend(
+            member for member in vars(module).values()
+            if inspect.isclass(member) and issubclass(member, BaseRepository) and member.__module__ == module.__name__
+        )
+    return classes
+
+
+def missing_scenarios() -> List[str]:
+    """Public repository methods (and repositories) that have neither a scenario nor an UNCOVERED entry"""
+    missing = []
+    registered = {repository for repository, _ in REPOSITORIES.values()}
+    for repository in repository_classes():
+        if repository not in registered:
+            missing.append(f"{repository.__name__} (not in REPOSITORIES)")
+    for prefix, (repository, inherited) in REPOSITORIES.items():
+        methods = [
+            name for name, member in vars(repository).items()
+            if not name.startswith("_") and (inspect.iscoroutinefunction(member) or inspect.isasyncgenfunction(member))
+        ]
+        for method in [*methods, *inherited]:
+            key = f"{prefix}.{method}"
+            if key not in UNCOVERED and not any(name == key or name.startswith(f"{key}.") for name in SCENARIOS):
+                missing.append(key)
+    return missing
+
+
+async def load_context() -> Context:
+    """Pick the ids the scenarios query with from the first synthetic user"""
+    user_id = bench_user_ids(1)[0]
+    async with async_engine.connect() as conn:
+        transaction = (await conn.execute(text("""
+            SELECT * FROM finance_transactions WHERE user_id = :user_id AND deleted_at IS NULL
+            ORDER BY date DESC, id DESC OFFSET 1000 LIMIT 1
+        """), {"user_id": user_id})).mappings().first()
+        if transaction is None:
+            sys.exit("No synthetic data found: run with --seed first")
+        expense_id = (await conn.execute(text(
+            "SELECT id FROM expenses WHERE user_id = :user_id AND expense_type = 'installment' LIMIT 1"
+        ), {"user_id": user_id})).scalar_one()
+        note_id = (await conn.execute(text(
+            "SELECT id FROM notes WHERE user_id = :user_id LIMIT 1"
+        ), {"user_id": user_id})).scalar_one()
+    return Context(
+        user_id=user_id,
+        property_id=transaction["property_id"],
+        category_id=transaction["category_id"],
+        expense_id=expense_id,
+        note_id=note_id,
+        transaction=dict(transaction),
+    )
+
+
+# --- Capture and EXPLAIN -----------------------------------------------------
+
+# (statement, parameters, statements the scenario ran before it)
+Captured = Tuple[str, Any, List[Tuple[str, Any]]]
+
+
+class StatementRecorder:
+    """before_cursor_execute listener collecting the statements a scenario emits"""
+
+    def __init__(self):
+        self.statements: List[Captured] = []
+        self.executed: List[Tuple[str, Any]] = []
+        self.recording = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if not self.recording or executemany:
+            return
+        keyword = statement.lstrip().upper()
+        if keyword.startswith(TRANSACTION_CONTROL):
+            return
+        if keyword.startswith(EXPLAINABLE):
+            self.statements.append((statement, parameters, list(self.executed)))
+        self.executed.append((statement, parameters))
+
+
+async def capture(scenario: Scenario, ctx: Context, recorder: StatementRecorder) -> List[Captured]:
+    """Run a scenario in a rolled-back unit of work and return the statements it executed"""
+    uow = UnitOfWork()
+    recorder.statements = []
+    recorder.executed = []
+    recorder.recording = True
+    try:
+        await scenario(uow, ctx)
+    finally:
+        recorder.recording = False
+        await uow.close()
+    return recorder.statements
+
+
+async def explain(statement: str, parameters: Any, before: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """EXPLAIN ANALYZE a captured statement in a transaction that is rolled back
+    (after replaying the statements its scenario ran before it)"""
+    async with async_engine.connect() as conn:
+        for earlier, earlier_parameters in before:
+            await conn.exec_driver_sql(earlier, earlier_parameters)
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar_one()
+        await conn.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def describe(node: Dict[str, Any]) -> str:
+    """One-line summary of a scan node, e.g. 'Index Only Scan ix_... on finance_transactions'"""
+    parts = [node["Node Type"]]
+    if "Index Name" in node:
+        parts.append(node["Index Name"])
+    if "Relation Name" in node:
+        parts.append(f"on {node['Relation Name']}")
+    return " ".join(parts)
+
+
+def summarize(statement: str, plan: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a plan that are snapshotted and compared"""
+    scans = [describe(node) for node in walk(plan) if "Relation Name" in node or "Index Name" in node]
+    return {
+        "sql": " ".join(statement.split()),
+        "scans": scans,
+        "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+        "total_ms": plan.get("Actual Total Time"),
+    }
+
+
+def seq_scan_rows(plan: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """Sequential scans in a plan with the number of rows each one read"""
+    scans = []
+    for node in walk(plan):
+        if node["Node Type"] == "Seq Scan":
+            loops = node.get("Actual Loops", 1)
+            rows = (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+            scans.append((node["Relation Name"], rows))
+    return scans
+
+
+# --- Main --------------------------------------------------------------------
+
+async def run(args: argparse.Namespace) -> int:
+    missing = missing_scenarios()
+    if missing:
+        print("Repository methods without a scenario (add one, or an UNCOVERED entry):")
+        for name in missing:
+            print(f"  {name}")
+        return 1
+
+    if args.seed:
+        await seed(args.users, args.transactions, args.days)
+
+    ctx = await load_context()
+    snapshots = json.loads(SNAPSHOT_PATH.read_text()) if SNAPSHOT_PATH.exists() else {}
+    current: Dict[str, Any] = {}
+    failures: List[str] = []
+
+    recorder = StatementRecorder()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", recorder)
+    try:
+        for name, scenario in SCENARIOS.items():
+            if args.only and args.only not in name:
+                continue
+            captured = await capture(scenario, ctx, recorder)
+            wrote = any(not statement.lstrip().upper().startswith("SELECT") for statement, _ in recorder.executed)
+            for index, (statement, parameters, before) in enumerate(captured):
+                key = f"{name}#{index}"
+                plan = await explain(statement, parameters, before)
+                summary = current[key] = summarize(statement, plan)
+                previous: Optional[Dict[str, Any]] = snapshots.get(key)
+
+                problems = [
+                    f"seq scan on {relation} read {rows} rows"
+                    for relation, rows in seq_scan_rows(plan) if rows > args.seq_scan_rows
+                ]
+                if previous:
+                    limit = previous["buffers"] * (1 + args.buffer_threshold)
+                    if summary["buffers"] > limit and summary["buffers"] - previous["buffers"] > args.buffer_slack:
+                        problems.append(f"buffers {previous['buffers']} -> {summary['buffers']}")
+                    if summary["scans"] != previous["scans"]:
+                        print(f"  note {key}: plan changed {previous['scans']} -> {summary['scans']}")
+
+                status = "FAIL" if problems else ("new " if previous is None else "ok  ")
+                print(f"{status} {key:<55} {summary['buffers']:>8} buffers {summary['total_ms']:>9.2f} ms")
+                for problem in problems:
+                    failures.append(f"{key}: {problem}")
+                    print(f"     {problem}")
+            if wrote:
+                # Rolled-back writes leave dead rows that would inflate later scenarios' buffers
+                await vacuum()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", recorder)
+
+    if args.update:
+        SNAPSHOT_PATH.write_text(json.dumps({**snapshots, **current}, indent=2, sort_keys=True) + "\n")
+        print(f"Updated {SNAPSHOT_PATH.name} ({len(current)} statements)")
+
+    if failures:
+        print(f"\n{len(failures)} plan regression(s)")
+        return 1
+    return 0
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        return await run(args)
+    finally:
+        await dispose_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="(Re)create the synthetic data set before running")
+    parser.add_argument("--users", type=int, default=20, help="Synthetic users to seed (few users make each one a large share of small tables like the rollup)")
+    parser.add_argument("--transactions", type=int, default=200000, help="Synthetic transactions to seed (split across users)")
+    parser.add_argument("--days", type=int, default=1825, help="Spread transactions over this many days")
+    parser.add_argument("--only", default=None, help="Only run scenarios whose name contains this string")
+    parser.add_argument("--update", action="store_true", help="Write the current plans to the snapshot file")
+    parser.add_argument("--seq-scan-rows", type=int, default=1000, help="Fail on sequential scans reading more rows than this")
+    parser.add_argument("--buffer-threshold", type=float, default=0.25, help="Allowed relative buffer growth over the snapshot")
+    parser.add_argument("--buffer-slack", type=int, default=16, help="Ignore buffer growth smaller than this many blocks")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,96 @@
+"""
+Serialization microbenchmark for list responses (no database needed).
+
+Compares, on synthetic transaction rows, the default path (one
+TransactionResponse per row, FastAPI's response_model validation and JSON
+encoding) with the fast path in app/core/serialization.py (rows straight to
+JSON bytes with orjson), and checks both produce the same JSON.
+
+Usage:
+    python -m benchmarks.serialization_benchmark --rows 1000,5000,20000
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.serialization import rows_to_json
+from app.domain.finance.dto.transaction_dto import TransactionResponse
+
+
+def synthetic_rows(count: int) -> List[Dict[str, Any]]:
+    """Rows shaped like TransactionRepository results (UUID, date, Decimal, JSONB list, timestamptz)"""
+    user_id, property_id = uuid.uuid4(), uuid.uuid4()
+    categories = [uuid.uuid4() for _ in range(12)]
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "property_id": property_id,
+            "date": date.today() - timedelta(days=index % 365),
+            "amount": Decimal(index % 5000) / 10 + Decimal("0.99"),
+            "description": f"Synthetic transaction {index}",
+            "category_id": categories[index % len(categories)],
+            "expense_id": None,
+            "tags": ["groceries", "weekly"] if index % 3 == 0 else None,
+            "payment_method": "card",
+            "notes": None,
+            "fingerprint": None,
+            "deleted_at": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for index in range(count)
+    ]
+
+
+RESPONSE_FIELD = create_response_field(name="response", type_=List[TransactionResponse])
+
+
+async def default_path(rows: List[Dict[str, Any]]) -> bytes:
+    """What the list endpoint does without FAST_SERIALIZATION"""
+    models = [TransactionResponse(**row) for row in rows]
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=models)
+    return JSONResponse(content).body
+
+
+async def fast_path(rows: List[Dict[str, Any]]) -> bytes:
+    return rows_to_json(rows, TransactionResponse)
+
+
+async def measure(path: Callable, rows: List[Dict[str, Any]], repeat: int) -> float:
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(rows)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main(sizes: List[int], repeat: int) -> None:
+    print(f"{'rows':>8} {'default ms':>12} {'fast ms':>10} {'speedup':>8}")
+    for size in sizes:
+        rows = synthetic_rows(size)
+        if json.loads(await default_path(rows)) != json.loads(await fast_path(rows)):
+            raise SystemExit("Fast path output differs from the default path")
+        default_ms = await measure(default_path, rows, repeat)
+        fast_ms = await measure(fast_path, rows, repeat)
+        print(f"{size:>8} {default_ms:>12.2f} {fast_ms:>10.2f} {default_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100,1000,5000,20000", help="Comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size (best is reported)")
+    args = parser.parse_args()
+    asyncio.run(main([int(size) for size in args.rows.split(",")], args.repeat))
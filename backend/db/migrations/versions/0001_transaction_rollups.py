@@ -0,0 +1,45 @@
+"""add finance_transaction_rollups
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'finance_transaction_rollups',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('property_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('category_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('finance_categories.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('year_month', sa.Date(), nullable=False),
+        sa.Column('total_amount', sa.DECIMAL(14, 2), nullable=False, server_default='0'),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('user_id', 'property_id', 'category_id', 'year_month'),
+    )
+    # Backfill from existing (non-deleted) transactions
+    op.execute("""
+        INSERT INTO finance_transaction_rollups
+            (user_id, property_id, category_id, year_month, total_amount, transaction_count)
+        SELECT user_id, property_id, category_id, date_trunc('month', date)::date, SUM(amount), COUNT(*)
+        FROM finance_transactions
+        WHERE deleted_at IS NULL
+        GROUP BY user_id, property_id, category_id, date_trunc('month', date)::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('finance_transaction_rollups')
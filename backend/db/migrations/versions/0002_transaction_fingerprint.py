@@ -0,0 +1,46 @@
+"""add finance_transactions.fingerprint for import deduplication
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:00:00.000000
+
+The unique index is built CONCURRENTLY (outside a transaction, hence the
+autocommit block) so finance_transactions stays writable during the build. If
+the build is interrupted it leaves an INVALID index behind: drop it and re-run.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL fingerprint: they never conflict and are not deduplicated against
+    op.add_column('finance_transactions', sa.Column('fingerprint', sa.String(64), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_finance_transactions_user_fingerprint',
+            'finance_transactions',
+            ['user_id', 'fingerprint'],
+            unique=True,
+            postgresql_where=sa.text('deleted_at IS NULL AND fingerprint IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_finance_transactions_user_fingerprint',
+            table_name='finance_transactions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('finance_transactions', 'fingerprint')
@@ -0,0 +1,91 @@
+"""partial composite indexes for user-scoped, non-deleted queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00.000000
+
+Indexes are built and dropped CONCURRENTLY so the tables stay writable; that
+cannot run inside a transaction, hence the autocommit blocks. If a concurrent
+build is interrupted it leaves an INVALID index behind: drop it and re-run.
+
+Single-column indexes that the new indexes make redundant are dropped. The
+category, property and expense FK indexes are kept (they serve FK checks and
+the unfiltered lookups by those columns). The transaction and expense user_id
+indexes are dropped: every query filters on user_id together with
+deleted_at IS NULL, and users are never deleted.
+
+Categories and notes get no new index. Category lists and name checks use the
+UNIQUE(user_id, name) index, which also replaces idx_finance_categories_user_id.
+Month and year note lookups use the partial unique note indexes; those cannot
+serve the user-wide note list, so idx_notes_user_id is kept.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NOT_DELETED = sa.text('deleted_at IS NULL')
+
+# (name, table, columns, INCLUDE columns)
+INDEXES = [
+    # List/keyset pages, export, date-range sums and series (index-only for the aggregates)
+    (
+        'ix_finance_transactions_user_date_id',
+        'finance_transactions',
+        ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+        ['category_id', 'property_id', 'amount'],
+    ),
+    # Category-filtered lists and series, per-category sums
+    (
+        'ix_finance_transactions_user_category_date',
+        'finance_transactions',
+        ['user_id', 'category_id', sa.text('date DESC'), sa.text('id DESC')],
+        ['property_id', 'amount'],
+    ),
+    # Expense list (optionally by is_active) and upcoming expenses ordered by day_of_month
+    (
+        'ix_expenses_user_active_day',
+        'expenses',
+        ['user_id', 'is_active', 'day_of_month'],
+        [],
+    ),
+]
+
+# (name, table, columns) as created by db/schema.sql
+REDUNDANT_INDEXES = [
+    ('idx_finance_transactions_user_id', 'finance_transactions', ['user_id']),
+    ('idx_finance_transactions_date', 'finance_transactions', ['date']),
+    ('idx_finance_categories_user_id', 'finance_categories', ['user_id']),
+    ('idx_expenses_user_id', 'expenses', ['user_id']),
+    ('idx_notes_domain_year_month', 'notes', ['domain', 'year', 'month']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=NOT_DELETED,
+                postgresql_include=include,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
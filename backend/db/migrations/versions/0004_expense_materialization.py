@@ -0,0 +1,42 @@
+"""add scheduler_leases and expenses.materialized_through for expense payment materialization
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduler_leases',
+        sa.Column('name', sa.String(100), primary_key=True),
+        sa.Column('holder', sa.String(64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.add_column('expenses', sa.Column('materialized_through', sa.Date(), nullable=True))
+    # Payments of existing expenses due before today were entered by hand; start materializing from today
+    op.execute("UPDATE expenses SET materialized_through = CURRENT_DATE - 1")
+    # The scheduler's due-expense scan: active expenses not yet materialized through today
+    op.create_index(
+        'ix_expenses_active_materialized_through',
+        'expenses',
+        ['materialized_through', 'id'],
+        postgresql_where=sa.text('is_active AND deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_active_materialized_through', table_name='expenses')
+    op.drop_column('expenses', 'materialized_through')
+    op.drop_table('scheduler_leases')
@@ -0,0 +1,57 @@
+"""archive tables for soft-deleted rows
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00.000000
+
+Each archive table copies its hot table's columns (LIKE ... INCLUDING DEFAULTS
+INCLUDING CONSTRAINTS: types, NOT NULL and CHECKs, but no foreign keys) plus
+archived_at. Migrations that add a column to a hot table must add it to the
+archive table too.
+
+Small partial indexes on deleted_at let the archival job find expired rows
+without scanning live data; they are built CONCURRENTLY (see 0003).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['finance_transactions', 'expenses', 'notes', 'finance_categories']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"CREATE TABLE {table}_archive (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        op.add_column(
+            f'{table}_archive',
+            sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_primary_key(f'pk_{table}_archive', f'{table}_archive', ['id'])
+        # Restore looks rows up by user and id
+        op.create_index(f'ix_{table}_archive_user_id', f'{table}_archive', ['user_id', 'id'])
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f'ix_{table}_deleted_at',
+                table,
+                ['deleted_at'],
+                postgresql_where=sa.text('deleted_at IS NOT NULL'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.drop_index(f'ix_{table}_deleted_at', table_name=table, postgresql_concurrently=True, if_exists=True)
+    for table in reversed(TABLES):
+        op.drop_table(f'{table}_archive')
@@ -0,0 +1,246 @@
+"""partition finance_transactions by RANGE (date)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:00:00.000000
+
+The partitioned table is built next to the existing one, which stays live
+while its rows are copied in batches of COPY_BATCH_SIZE (each committed on its
+own, keyset by id). Yearly partitions cover the existing data through
+PARTITIONS_AHEAD years after today, plus a default partition; the maintenance
+job (app/core/partitions.py) takes over from there with the configured
+interval. Indexes and foreign keys are added after the copy.
+
+Before the copy starts, a trigger logs the id of every row inserted, updated
+or deleted in the live table. Catch-up passes take logged ids in batches and
+replace those rows in the new table (delete by id, then re-insert the current
+version if there is one), so edits of any column (date included) and
+archived rows carry over. Passes run unlocked until the backlog is under one
+batch; only that remainder is caught up under the lock that blocks writes
+(reads continue) for the final pass and the swap, so the time writes are
+blocked does not grow with the table.
+
+Partition helpers and sizes are frozen here rather than imported from the app,
+so the migration does the same thing whatever the app code or settings are
+when it runs.
+
+A partitioned table's unique indexes must include the partition key: the
+primary key becomes (id, date) and the fingerprint index (user_id,
+fingerprint, date). A fingerprint already hashes the date, so dedupe is
+unchanged.
+
+The downgrade copies everything back in one statement and does not see
+partitions detached by the maintenance job.
+"""
+from datetime import date
+from typing import List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'finance_transactions'
+NEW_TABLE = 'finance_transactions_partitioned'
+OLD_TABLE = 'finance_transactions_unpartitioned'
+
+# Future yearly partitions created ahead of today
+PARTITIONS_AHEAD = 2
+# Rows per committed copy batch
+COPY_BATCH_SIZE = 10000
+
+NOT_DELETED = sa.text('deleted_at IS NULL')
+
+# (name, columns, unique, WHERE, INCLUDE columns)
+INDEXES = [
+    (
+        'uq_finance_transactions_user_fingerprint',
+        ['user_id', 'fingerprint', 'date'],
+        True,
+        sa.text('deleted_at IS NULL AND fingerprint IS NOT NULL'),
+        [],
+    ),
+    (
+        'ix_finance_transactions_user_date_id',
+        ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+        False,
+        NOT_DELETED,
+        ['category_id', 'property_id', 'amount'],
+    ),
+    (
+        'ix_finance_transactions_user_category_date',
+        ['user_id', 'category_id', sa.text('date DESC'), sa.text('id DESC')],
+        False,
+        NOT_DELETED,
+        ['property_id', 'amount'],
+    ),
+    ('ix_finance_transactions_deleted_at', ['deleted_at'], False, sa.text('deleted_at IS NOT NULL'), []),
+    ('idx_finance_transactions_category_id', ['category_id'], False, None, []),
+    ('idx_finance_transactions_expense_id', ['expense_id'], False, None, []),
+    ('idx_finance_transactions_property_id', ['property_id'], False, None, []),
+]
+
+# (column, referenced table, ON DELETE) as created by db/schema.sql
+FOREIGN_KEYS = [
+    ('user_id', 'users', 'CASCADE'),
+    ('property_id', 'properties', 'RESTRICT'),
+    ('category_id', 'finance_categories', 'RESTRICT'),
+    ('expense_id', 'expenses', 'SET NULL'),
+]
+
+COPY_BATCH = sa.text(f"""
+WITH batch AS (
+    SELECT * FROM {TABLE} WHERE id > CAST(:after AS uuid) ORDER BY id LIMIT :limit
+), copied AS (
+    INSERT INTO {NEW_TABLE} SELECT * FROM batch
+)
+SELECT CAST(id AS text) FROM batch ORDER BY id DESC LIMIT 1
+""")
+
+# Ids of rows written to the live table since the copy started
+CHANGES = f'{TABLE}_migration_changes'
+
+TRACK_CHANGES = [
+    f"CREATE TABLE {CHANGES} (seq bigserial PRIMARY KEY, id uuid NOT NULL)",
+    f"""
+    CREATE FUNCTION {CHANGES}_log() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO {CHANGES} (id) VALUES (CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END);
+        RETURN NULL;
+    END
+    $$
+    """,
+    # Waits for in-flight writes, so every write committed after this is logged
+    f"""
+    CREATE TRIGGER {CHANGES}_log AFTER INSERT OR UPDATE OR DELETE ON {TABLE}
+    FOR EACH ROW EXECUTE FUNCTION {CHANGES}_log()
+    """,
+]
+
+# One catch-up pass: take a batch of logged ids (only committed entries are
+# visible, so none is consumed before its write commits) and replace those rows.
+# Matching on id alone also moves rows whose date changed to their new partition.
+CATCH_UP = f"""
+DO $$
+DECLARE
+    changed uuid[];
+BEGIN
+    WITH taken AS (
+        DELETE FROM {CHANGES}
+        WHERE seq IN (SELECT seq FROM {CHANGES} ORDER BY seq LIMIT {COPY_BATCH_SIZE})
+        RETURNING id
+    )
+    SELECT array_agg(DISTINCT id) INTO changed FROM taken;
+    DELETE FROM {NEW_TABLE} WHERE id = ANY(changed);
+    INSERT INTO {NEW_TABLE} SELECT * FROM {TABLE} WHERE id = ANY(changed);
+END
+$$
+"""
+
+
+def catch_up(remaining: int) -> None:
+    """Run catch-up passes until at most `remaining` logged changes are left"""
+    bind = op.get_bind()
+    while bind.execute(sa.text(f"SELECT count(*) FROM {CHANGES}")).scalar() > remaining:
+        op.execute(CATCH_UP)
+
+
+def year_ranges(first: date, last: date) -> List[Tuple[date, date]]:
+    """Consecutive [start, end) years covering first..last (inclusive)"""
+    return [(date(year, 1, 1), date(year + 1, 1, 1)) for year in range(first.year, last.year + 1)]
+
+
+def create_partition(start: date, end: date) -> None:
+    """Create a yearly partition detached, move its rows out of the default partition and attach it.
+
+    The CHECK matching the bounds lets ATTACH skip validating the partition.
+    """
+    name = f'{TABLE}_p{start:%Y}'
+    default = f'{NEW_TABLE}_default'
+    bounds = f"date >= DATE '{start.isoformat()}' AND date < DATE '{end.isoformat()}'"
+    op.execute(f"CREATE TABLE {name} (LIKE {NEW_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute(f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds CHECK ({bounds})")
+    op.execute(f"WITH moved AS (DELETE FROM {default} WHERE {bounds} RETURNING *) INSERT INTO {name} SELECT * FROM moved")
+    op.execute(
+        f"ALTER TABLE {NEW_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    op.execute(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds")
+
+
+def create_indexes(table: str, suffix: str, fingerprint_columns: Sequence[str]) -> None:
+    for name, columns, unique, where, include in INDEXES:
+        if name == 'uq_finance_transactions_user_fingerprint':
+            columns = list(fingerprint_columns)
+        op.create_index(
+            f'{name}{suffix}',
+            table,
+            columns,
+            unique=unique,
+            postgresql_where=where,
+            postgresql_include=include,
+        )
+
+
+def create_foreign_keys(table: str) -> None:
+    for column, referent, ondelete in FOREIGN_KEYS:
+        op.create_foreign_key(f'{TABLE}_{column}_fkey', table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    today = date.today()
+    first, last = bind.execute(sa.text(f"SELECT min(date), max(date) FROM {TABLE}")).one()
+    first = min(first or today, today)
+    last = max(last or today, date(today.year + PARTITIONS_AHEAD, 12, 31))
+
+    op.execute(
+        f"CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (date)"
+    )
+    op.execute(f"ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {NEW_TABLE}_pkey PRIMARY KEY (id, date)")
+    op.execute(f"CREATE TABLE {NEW_TABLE}_default PARTITION OF {NEW_TABLE} DEFAULT")
+    for start, end in year_ranges(first, last):
+        create_partition(start, end)
+
+    with op.get_context().autocommit_block():
+        for statement in TRACK_CHANGES:
+            op.execute(statement)
+        after = '00000000-0000-0000-0000-000000000000'
+        while True:
+            after = bind.execute(
+                COPY_BATCH, {'after': after, 'limit': COPY_BATCH_SIZE}
+            ).scalar()
+            if after is None:
+                break
+        catch_up(COPY_BATCH_SIZE)
+        create_indexes(NEW_TABLE, '_new', ['user_id', 'fingerprint', 'date'])
+        create_foreign_keys(NEW_TABLE)
+        # Changes made while the indexes were built
+        catch_up(COPY_BATCH_SIZE)
+
+    op.execute(f"LOCK TABLE {TABLE} IN SHARE ROW EXCLUSIVE MODE")
+    # At most about one batch left; nothing new is logged under the lock
+    catch_up(0)
+    op.execute(f"DROP TABLE {TABLE}")
+    op.execute(f"DROP TABLE {CHANGES}")
+    op.execute(f"DROP FUNCTION {CHANGES}_log()")
+    op.execute(f"ALTER TABLE {NEW_TABLE} RENAME TO {TABLE}")
+    op.execute(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {NEW_TABLE}_pkey TO {TABLE}_pkey")
+    op.execute(f"ALTER TABLE {NEW_TABLE}_default RENAME TO {TABLE}_default")
+    for name, _, _, _, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    op.execute(f"ANALYZE {TABLE}")
+
+
+def downgrade() -> None:
+    op.execute(f"CREATE TABLE {OLD_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute(f"INSERT INTO {OLD_TABLE} SELECT * FROM {TABLE}")
+    op.execute(f"DROP TABLE {TABLE}")
+    op.execute(f"ALTER TABLE {OLD_TABLE} RENAME TO {TABLE}")
+    op.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)")
+    create_indexes(TABLE, '', ['user_id', 'fingerprint'])
+    create_foreign_keys(TABLE)
+    op.execute(f"ANALYZE {TABLE}")
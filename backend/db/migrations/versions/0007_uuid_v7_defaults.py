@@ -0,0 +1,54 @@
+"""time-ordered UUIDv7 defaults for primary keys
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:00:00.000000
+
+The app generates ids itself (app/core/ids.py); uuid_generate_v7() gives rows
+inserted by SQL (schema.sql seeds, manual fixes) the same time-ordered layout:
+a gen_random_uuid() whose first 48 bits are replaced by the Unix time in
+milliseconds and whose version nibble is flipped from 4 to 7. Existing v4 ids
+are kept. Setting a default only touches the catalog; on finance_transactions
+it applies to every partition, and new partitions copy it (LIKE ... INCLUDING
+DEFAULTS).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['users', 'properties', 'finance_categories', 'expenses', 'notes', 'finance_transactions']
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+    """)
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+    op.execute("DROP FUNCTION uuid_generate_v7()")
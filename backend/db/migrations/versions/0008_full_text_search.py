@@ -0,0 +1,88 @@
+"""full-text search columns and GIN indexes on finance_transactions and notes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 17:00:00.000000
+
+search_vector is a stored generated tsvector using the 'simple' configuration
+(no stemming or stop words, so it works for any language the text is in).
+Transactions weight description (A) over notes (B) and payment_method (C).
+
+Adding a stored generated column rewrites the table under an exclusive lock;
+run this migration in a quiet window. The GIN indexes are then built without
+blocking writes: CONCURRENTLY on notes, and on finance_transactions one
+partition at a time (CONCURRENTLY) attached to an index created ON ONLY the
+parent. Partitions created later get the index automatically.
+
+The columns are not part of the table definitions in app/core/database.py
+and are not copied to the archive tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions of finance_transactions (attached ones only)
+LIST_PARTITIONS_SQL = """
+SELECT child.relname AS name
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE pg_inherits.inhparent = CAST('finance_transactions' AS regclass)
+ORDER BY child.relname
+"""
+
+TRANSACTION_DOCUMENT = """
+    setweight(to_tsvector('simple', coalesce(description, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(notes, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(payment_method, '')), 'C')
+"""
+NOTE_DOCUMENT = "to_tsvector('simple', notes)"
+
+TRANSACTION_INDEX = 'ix_finance_transactions_search_vector'
+NOTE_INDEX = 'ix_notes_search_vector'
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE finance_transactions "
+        f"ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({TRANSACTION_DOCUMENT}) STORED"
+    )
+    op.execute(f"ALTER TABLE notes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({NOTE_DOCUMENT}) STORED")
+    op.execute(
+        f"CREATE INDEX {TRANSACTION_INDEX} ON ONLY finance_transactions "
+        "USING gin (search_vector) WHERE deleted_at IS NULL"
+    )
+    partitions = [
+        row.name for row in op.get_bind().execute(sa.text(LIST_PARTITIONS_SQL))
+    ]
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_search_vector_idx ON {partition} "
+                "USING gin (search_vector) WHERE deleted_at IS NULL"
+            )
+            op.execute(f"ALTER INDEX {TRANSACTION_INDEX} ATTACH PARTITION {partition}_search_vector_idx")
+        op.create_index(
+            NOTE_INDEX,
+            'notes',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(NOTE_INDEX, table_name='notes', postgresql_concurrently=True, if_exists=True)
+    # Dropping the columns drops the indexes on them (and the partitions' indexes)
+    op.execute("ALTER TABLE notes DROP COLUMN search_vector")
+    op.execute("ALTER TABLE finance_transactions DROP COLUMN search_vector")
@@ -0,0 +1,55 @@
+"""trigram index on finance_transactions.description for autocomplete
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:00:00.000000
+
+A pg_trgm GIN index on lower(description) serves the prefix and substring
+LIKE lookups of GET /transactions/suggest. It is built one partition at a time
+(CONCURRENTLY) and attached to an index created ON ONLY the parent, like the
+search index in 0008; partitions created later get it automatically.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions of finance_transactions (attached ones only)
+LIST_PARTITIONS_SQL = """
+SELECT child.relname AS name
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE pg_inherits.inhparent = CAST('finance_transactions' AS regclass)
+ORDER BY child.relname
+"""
+
+INDEX = 'ix_finance_transactions_description_trgm'
+INDEX_DEFINITION = (
+    "USING gin (lower(description) gin_trgm_ops) WHERE deleted_at IS NULL AND description IS NOT NULL"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"CREATE INDEX {INDEX} ON ONLY finance_transactions {INDEX_DEFINITION}")
+    partitions = [
+        row.name for row in op.get_bind().execute(sa.text(LIST_PARTITIONS_SQL))
+    ]
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_description_trgm_idx ON {partition} {INDEX_DEFINITION}"
+            )
+            op.execute(f"ALTER INDEX {INDEX} ATTACH PARTITION {partition}_description_trgm_idx")
+
+
+def downgrade() -> None:
+    # Dropping the parent index drops the attached partition indexes; the extension is left installed
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
@@ -0,0 +1,51 @@
+"""GIN jsonb_path_ops index on finance_transactions.tags
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 19:00:00.000000
+
+jsonb_path_ops only supports containment (@>), which is all the tag filters
+use: all-of is one `tags @> '["a", "b"]'`, any-of an OR of single-tag
+containments (a BitmapOr of index scans). It is smaller and faster than the
+default jsonb_ops. Built per partition CONCURRENTLY and attached to an index
+created ON ONLY the parent, like 0008 and 0009.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions of finance_transactions (attached ones only)
+LIST_PARTITIONS_SQL = """
+SELECT child.relname AS name
+FROM pg_inherits
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE pg_inherits.inhparent = CAST('finance_transactions' AS regclass)
+ORDER BY child.relname
+"""
+
+INDEX = 'ix_finance_transactions_tags'
+INDEX_DEFINITION = "USING gin (tags jsonb_path_ops) WHERE deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE INDEX {INDEX} ON ONLY finance_transactions {INDEX_DEFINITION}")
+    partitions = [
+        row.name for row in op.get_bind().execute(sa.text(LIST_PARTITIONS_SQL))
+    ]
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_tags_idx ON {partition} {INDEX_DEFINITION}")
+            op.execute(f"ALTER INDEX {INDEX} ATTACH PARTITION {partition}_tags_idx")
+
+
+def downgrade() -> None:
+    # Dropping the parent index drops the attached partition indexes
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
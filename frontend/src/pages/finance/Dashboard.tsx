@@ -1,151 +1,81 @@
 import { createSignal, onMount, Show } from 'solid-js';
 import Layout from '../../components/Layout';
+import { dashboardService } from '../../services/finance/dashboardService';
+import type { DashboardSummary } from '../../services/finance/dashboardService';
 import { transactionService } from '../../services/finance/transactionService';
-import type { Transaction } from '../../services/finance/transactionService';
-import { categoryService } from '../../services/finance/categoryService';
-import type { Category } from '../../services/finance/categoryService';
-import { expenseService } from '../../services/finance/expenseService';
-import type { Expense } from '../../services/finance/expenseService';
-import { monthlyNoteService } from '../../services/finance/monthlyNoteService';
-import type { MonthlyNote } from '../../services/finance/monthlyNoteService';
+import type { TransactionSeriesPoint } from '../../services/finance/transactionService';
 import ExpenseByCategoryChart from './components/charts/ExpenseByCategoryChart';
 import MonthlyTrendChart from './components/charts/MonthlyTrendChart';
-import { format, startOfMonth, endOfMonth, subMonths } from 'date-fns';
+import { format, parseISO, startOfMonth, endOfMonth, subMonths } from 'date-fns';
 
 const Dashboard = () => {
-  const [transactions, setTransactions] = createSignal<Transaction[]>([]);
-  const [categories, setCategories] = createSignal<Category[]>([]);
-  const [expenses, setExpenses] = createSignal<Expense[]>([]);
-  const [monthlyNote, setMonthlyNote] = createSignal<MonthlyNote | null>(null);
+  const [dashboard, setDashboard] = createSignal<DashboardSummary | null>(null);
+  const [trend, setTrend] = createSignal<TransactionSeriesPoint[]>([]);
   const [loading, setLoading] = createSignal(true);
   const [monthFilter, setMonthFilter] = createSignal(format(new Date(), 'yyyy-MM'));
 
   onMount(async () => {
-    try {
-      await Promise.all([loadTransactions(), loadCategories(), loadExpenses(), loadMonthlyNote()]);
-    } catch (error) {
-      console.error('Error loading dashboard data:', error);
-      setLoading(false); // Ensure loading is set to false even on error
-    }
+    await Promise.all([loadDashboard(), loadTrend()]);
   });
 
-  const loadCategories = async () => {
-    try {
-      const data = await categoryService.getAll();
-      setCategories(data);
-    } catch (error) {
-      console.error('Failed to load categories:', error);
-    }
-  };
-
-  const loadExpenses = async () => {
+  const loadDashboard = async () => {
     try {
-      const data = await expenseService.getAll(true);
-      setExpenses(data);
-    } catch (error) {
-      console.error('Failed to load expenses:', error);
-    }
-  };
-
-  const loadMonthlyNote = async () => {
-    try {
-      const [year, month] = monthFilter().split('-');
-      const note = await monthlyNoteService.getByPeriod(parseInt(year), parseInt(month), 'finance');
-      setMonthlyNote(note);
+      setLoading(true);
+      const data = await dashboardService.get(monthFilter());
+      setDashboard(data);
     } catch (error) {
-      console.error('Failed to load monthly note:', error);
+      console.error('Failed to load dashboard:', error);
+      setDashboard(null);
+    } finally {
+      setLoading(false);
     }
   };
 
-  const loadTransactions = async () => {
+  const loadTrend = async () => {
     try {
-      setLoading(true);
       const [year, month] = monthFilter().split('-');
-      const start = startOfMonth(new Date(parseInt(year), parseInt(month) - 1));
-      const end = endOfMonth(new Date(parseInt(year), parseInt(month) - 1));
-      
-      const data = await transactionService.getAll({
-        start_date: format(start, 'yyyy-MM-dd'),
-        end_date: format(end, 'yyyy-MM-dd'),
+      const selected = new Date(parseInt(year), parseInt(month) - 1);
+      const data = await transactionService.getSeries({
+        start_date: format(startOfMonth(subMonths(selected, 5)), 'yyyy-MM-dd'),
+        end_date: format(endOfMonth(selected), 'yyyy-MM-dd'),
+        granularity: 'month',
       });
-      setTransactions(data);
+      setTrend(data);
     } catch (error) {
-      console.error('Failed to load transactions:', error);
-      setTransactions([]); // Set empty array on error
-    } finally {
-      setLoading(false);
+      console.error('Failed to load monthly trend:', error);
+      setTrend([]);
     }
   };
 
-  const getCategoryName = (categoryId: string) => {
-    const category = categories().find(c => c.id === categoryId);
-    return category?.name || 'Unknown';
-  };
-
-  const getCategoryType = (categoryId: string) => {
-    const category = categories().find(c => c.id === categoryId);
-    return category?.type || 'expense';
-  };
-
-  const calculateSummary = () => {
-    const monthTransactions = transactions();
-    let income = 0;
-    let expense = 0;
+  const getCategory = (categoryId: string) =>
+    dashboard()?.by_category.find(c => c.category_id === categoryId);
 
-    monthTransactions.forEach(tx => {
-      const type = getCategoryType(tx.category_id);
-      if (type === 'income') {
-        income += tx.amount;
-      } else {
-        expense += tx.amount;
-      }
-    });
+  const getCategoryName = (categoryId: string) => getCategory(categoryId)?.name || 'Unknown';
 
-    return { income, expense, net: income - expense };
-  };
+  const getCategoryType = (categoryId: string) => getCategory(categoryId)?.type || 'expense';
 
-  const getExpenseByCategory = () => {
-    const expenseCategories = new Map<string, number>();
-    transactions().forEach(tx => {
-      const type = getCategoryType(tx.category_id);
-      if (type === 'expense') {
-        const categoryName = getCategoryName(tx.category_id);
-        expenseCategories.set(categoryName, (expenseCategories.get(categoryName) || 0) + tx.amount);
-      }
-    });
-    return Array.from(expenseCategories.entries()).map(([category, amount]) => ({
-      category,
-      amount,
-    }));
-  };
+  const getExpenseByCategory = () =>
+    (dashboard()?.by_category ?? [])
+      .filter(c => c.type === 'expense')
+      .map(c => ({ category: c.name, amount: c.total }));
 
-  const getMonthlyTrend = () => {
-    const months = [];
-    for (let i = 5; i >= 0; i--) {
-      const month = subMonths(new Date(), i);
-      months.push(format(month, 'MMM yyyy'));
-    }
-    
-    // This is a simplified version - in production, you'd fetch data for each month
-    return months.map(month => ({
-      month,
-      income: Math.random() * 5000,
-      expense: Math.random() * 4000,
+  const getMonthlyTrend = () =>
+    trend().map(point => ({
+      month: format(parseISO(point.bucket), 'MMM yyyy'),
+      income: point.income,
+      expense: point.expense,
     }));
-  };
 
-  const summary = () => calculateSummary();
+  const summary = () => ({
+    income: dashboard()?.total_income ?? 0,
+    expense: dashboard()?.total_expense ?? 0,
+    net: dashboard()?.net ?? 0,
+  });
   const expenseByCategory = () => getExpenseByCategory();
   const monthlyTrend = () => getMonthlyTrend();
-  const recentTransactions = () => transactions().slice(0, 5);
-  const upcomingExpenses = () => {
-    const today = new Date();
-    const dayOfMonth = today.getDate();
-    return expenses()
-      .filter(exp => exp.is_active && exp.day_of_month >= dayOfMonth)
-      .sort((a, b) => a.day_of_month - b.day_of_month)
-      .slice(0, 5);
-  };
+  const recentTransactions = () => dashboard()?.recent_transactions ?? [];
+  const upcomingExpenses = () => dashboard()?.upcoming_expenses ?? [];
+  const monthlyNote = () => dashboard()?.monthly_note ?? null;
 
   return (
     <Layout>
@@ -158,8 +88,8 @@ const Dashboard = () => {
               value={monthFilter()}
               onInput={(e) => {
                 setMonthFilter(e.currentTarget.value);
-                loadTransactions();
-                loadMonthlyNote();
+                loadDashboard();
+                loadTrend();
               }}
               class="px-3 py-2 border border-gray-300 rounded-md"
             />
@@ -227,10 +157,10 @@ const Dashboard = () => {
                   <div class="flex justify-between items-center py-2 border-b">
                     <div class="flex-1">
                       <p class="text-sm font-medium">{exp.name}</p>
-                      <p class="text-xs text-gray-500">Day {exp.day_of_month}</p>
-                      {exp.notes && (
-                        <p class="text-xs text-gray-400 mt-1 italic">{exp.notes}</p>
-                      )}
+                      <p class={`text-xs ${exp.overdue ? 'text-red-600' : 'text-gray-500'}`}>
+                        {exp.overdue ? 'Overdue since' : 'Due'} {format(parseISO(exp.due_date), 'MMM d')}
+                        {exp.payment_number && ` · ${exp.payment_number}/${exp.total_payments}`}
+                      </p>
                     </div>
                     <p class="text-sm font-medium text-gray-900">
                       {exp.amount ? `$${exp.amount.toFixed(2)}` : 'N/A'}
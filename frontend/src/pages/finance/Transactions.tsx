@@ -9,6 +9,8 @@ import TransactionList from './components/TransactionList';
 import { format } from 'date-fns';
 import { toastStore } from '../../shared/stores/toastStore';
 
+const PAGE_SIZE = 50;
+
 const Transactions = () => {
   const [transactions, setTransactions] = createSignal<Transaction[]>([]);
   const [categories, setCategories] = createSignal<Category[]>([]);
@@ -18,6 +20,8 @@ const Transactions = () => {
   const [startDate, setStartDate] = createSignal('');
   const [endDate, setEndDate] = createSignal('');
   const [selectedCategory, setSelectedCategory] = createSignal<string>('');
+  const [nextCursor, setNextCursor] = createSignal<string | null>(null);
+  const [loadingMore, setLoadingMore] = createSignal(false);
 
   onMount(async () => {
     await Promise.all([loadTransactions(), loadCategories()]);
@@ -32,16 +36,20 @@ const Transactions = () => {
     }
   };
 
+  const filterParams = () => {
+    const params: any = { limit: PAGE_SIZE };
+    if (startDate()) params.start_date = startDate();
+    if (endDate()) params.end_date = endDate();
+    if (selectedCategory()) params.category_id = selectedCategory();
+    return params;
+  };
+
   const loadTransactions = async () => {
     try {
       setLoading(true);
-      const params: any = {};
-      if (startDate()) params.start_date = startDate();
-      if (endDate()) params.end_date = endDate();
-      if (selectedCategory()) params.category_id = selectedCategory();
-      
-      const data = await transactionService.getAll(params);
-      setTransactions(data);
+      const page = await transactionService.getPage(filterParams());
+      setTransactions(page.items);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error('Failed to load transactions:', error);
     } finally {
@@ -49,6 +57,22 @@ const Transactions = () => {
     }
   };
 
+  const loadMore = async () => {
+    const cursor = nextCursor();
+    if (!cursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await transactionService.getPage({ ...filterParams(), cursor });
+      setTransactions([...transactions(), ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to load more transactions:', error);
+      toastStore.error('Failed to load more transactions');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCreate = () => {
     setEditingTransaction(null);
     setShowForm(true);
@@ -152,12 +176,25 @@ const Transactions = () => {
         </Show>
 
         <Show when={loading()} fallback={
-          <TransactionList
-            transactions={transactions()}
-            categories={categories()}
-            onEdit={handleEdit}
-            onDelete={handleDelete}
-          />
+          <>
+            <TransactionList
+              transactions={transactions()}
+              categories={categories()}
+              onEdit={handleEdit}
+              onDelete={handleDelete}
+            />
+            <Show when={nextCursor()}>
+              <div class="text-center mt-4">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore()}
+                  class="bg-gray-600 hover:bg-gray-700 text-white px-4 py-2 rounded-md disabled:opacity-50"
+                >
+                  {loadingMore() ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            </Show>
+          </>
         }>
           <div class="text-center py-12">Loading...</div>
         </Show>
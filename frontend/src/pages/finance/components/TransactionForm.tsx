@@ -1,6 +1,6 @@
-import { createSignal, onMount, Show, createEffect } from 'solid-js';
+import { createSignal, onMount, onCleanup, Show, createEffect } from 'solid-js';
 import { transactionService } from '../../../services/finance/transactionService';
-import type { Transaction, TransactionCreate } from '../../../services/finance/transactionService';
+import type { Transaction, TransactionCreate, TransactionSuggestion } from '../../../services/finance/transactionService';
 import type { Category } from '../../../services/finance/categoryService';
 import type { Expense } from '../../../services/finance/expenseService';
 import { expenseService } from '../../../services/finance/expenseService';
@@ -8,6 +8,9 @@ import { propertyService } from '../../../services/finance/propertyService';
 import type { Property } from '../../../services/finance/propertyService';
 import { format } from 'date-fns';
 
+// Wait for a pause in typing before asking for suggestions
+const SUGGEST_DELAY_MS = 150;
+
 interface TransactionFormProps {
   transaction?: Transaction | null;
   categories: Category[];
@@ -32,6 +35,9 @@ const TransactionForm = (props: TransactionFormProps) => {
   const [loading, setLoading] = createSignal(false);
   const [error, setError] = createSignal('');
   const [expenses, setExpenses] = createSignal<Expense[]>(props.expenses || []);
+  const [suggestions, setSuggestions] = createSignal<TransactionSuggestion[]>([]);
+  let suggestTimer: ReturnType<typeof setTimeout> | undefined;
+  onCleanup(() => clearTimeout(suggestTimer));
 
   // Load expenses and houses if not provided
   onMount(async () => {
@@ -82,6 +88,36 @@ const TransactionForm = (props: TransactionFormProps) => {
     }
   });
 
+  // Autocomplete the description from past transactions
+  const handleDescriptionInput = (value: string) => {
+    setDescription(value);
+    const chosen = suggestions().find(s => s.description === value);
+    if (chosen) {
+      // Picked from the list: pre-fill what is still empty from its most recent use
+      if (!categoryId()) setCategoryId(chosen.category_id);
+      if (!propertyId()) setPropertyId(chosen.property_id);
+      if (!amount()) setAmount(chosen.amount.toString());
+      return;
+    }
+    clearTimeout(suggestTimer);
+    const prefix = value.trim();
+    if (!prefix) {
+      setSuggestions([]);
+      return;
+    }
+    suggestTimer = setTimeout(async () => {
+      try {
+        const data = await transactionService.suggest(prefix);
+        // Ignore responses for text that has changed since
+        if (description().trim() === prefix) {
+          setSuggestions(data);
+        }
+      } catch (error) {
+        console.error('Failed to load suggestions:', error);
+      }
+    }, SUGGEST_DELAY_MS);
+  };
+
   const handleSubmit = async (e: Event) => {
     e.preventDefault();
     setError('');
@@ -193,10 +229,17 @@ const TransactionForm = (props: TransactionFormProps) => {
             <label class="block text-sm font-medium text-gray-700 mb-1">Description</label>
             <input
               type="text"
+              list="transaction-description-suggestions"
+              autocomplete="off"
               value={description()}
-              onInput={(e) => setDescription(e.currentTarget.value)}
+              onInput={(e) => handleDescriptionInput(e.currentTarget.value)}
               class="w-full px-3 py-2 border border-gray-300 rounded-md"
             />
+            <datalist id="transaction-description-suggestions">
+              {suggestions().map((suggestion) => (
+                <option value={suggestion.description} />
+              ))}
+            </datalist>
           </div>
           <div class="mb-4">
             <label class="block text-sm font-medium text-gray-700 mb-1">Payment Method</label>
@@ -0,0 +1,34 @@
+import api from '../../shared/services/api';
+import type { Transaction } from './transactionService';
+import type { ExpenseScheduleItem } from './expenseService';
+import type { MonthlyNote } from './monthlyNoteService';
+
+export interface CategoryTotal {
+  category_id: string;
+  name: string;
+  type: 'income' | 'expense';
+  color?: string;
+  total: number;
+  count: number;
+}
+
+export interface DashboardSummary {
+  year: number;
+  month: number;
+  total_income: number;
+  total_expense: number;
+  net: number;
+  by_category: CategoryTotal[];
+  recent_transactions: Transaction[];
+  upcoming_expenses: ExpenseScheduleItem[];
+  monthly_note: MonthlyNote | null;
+}
+
+export const dashboardService = {
+  async get(month: string): Promise<DashboardSummary> {
+    const response = await api.get<DashboardSummary>('/finance/dashboard', {
+      params: { month },
+    });
+    return response.data;
+  },
+};
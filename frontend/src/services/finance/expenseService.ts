@@ -28,6 +28,8 @@ export interface ExpenseCreate {
   start_date: string;
   total_payments?: number;
   notes?: string;
+  // Create transactions for payments already due since start_date (otherwise they count as paid)
+  backfill?: boolean;
 }
 
 export interface ExpenseUpdate {
@@ -43,6 +45,34 @@ export interface ExpenseUpdate {
   notes?: string;
 }
 
+export interface ExpenseScheduleItem {
+  expense_id: string;
+  name: string;
+  category_id: string;
+  property_id: string;
+  expense_type: 'ongoing' | 'installment';
+  due_date: string;
+  amount?: number;
+  payment_number?: number;
+  total_payments?: number;
+  overdue: boolean;
+}
+
+export interface ExpenseForecastMonth {
+  month: string;
+  total: number;
+  count: number;
+  variable_count: number;
+}
+
+export interface ExpenseForecast {
+  start_date: string;
+  months: ExpenseForecastMonth[];
+  total: number;
+  overdue_total: number;
+  overdue_count: number;
+}
+
 export const expenseService = {
   async getAll(is_active?: boolean): Promise<Expense[]> {
     const response = await api.get<Expense[]>('/expenses', {
@@ -56,6 +86,20 @@ export const expenseService = {
     return response.data;
   },
 
+  async getSchedule(months = 12): Promise<ExpenseScheduleItem[]> {
+    const response = await api.get<ExpenseScheduleItem[]>('/expenses/schedule', {
+      params: { months },
+    });
+    return response.data;
+  },
+
+  async getForecast(months = 12): Promise<ExpenseForecast> {
+    const response = await api.get<ExpenseForecast>('/expenses/forecast', {
+      params: { months },
+    });
+    return response.data;
+  },
+
   async create(data: ExpenseCreate): Promise<Expense> {
     const response = await api.post<Expense>('/expenses', data);
     return response.data;
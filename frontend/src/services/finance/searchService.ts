@@ -0,0 +1,67 @@
+import api from '../../shared/services/api';
+
+export type SearchEntity = 'transactions' | 'notes';
+
+export interface SearchMatch {
+  start: number; // offset in the snippet, in code points (not UTF-16 units)
+  end: number; // exclusive
+}
+
+export interface SearchResult {
+  type: SearchEntity;
+  id: string;
+  rank: number;
+  snippet: string; // plain text, render it as text (never as HTML)
+  matches: SearchMatch[];
+  date?: string | null; // transactions
+  amount?: number | null; // transactions
+  year?: number | null; // notes
+  month?: number | null; // notes (null for yearly notes)
+}
+
+export interface SearchResponse {
+  query: string;
+  results: SearchResult[];
+  next_offset: number | null;
+}
+
+export interface SearchParams {
+  types?: SearchEntity[];
+  domain?: string;
+  limit?: number;
+  offset?: number;
+}
+
+export interface SnippetPart {
+  text: string;
+  match: boolean;
+}
+
+// Splits a snippet into plain and matched parts, e.g. to wrap matches in <mark>
+export function snippetParts(result: SearchResult): SnippetPart[] {
+  const chars = Array.from(result.snippet);
+  const parts: SnippetPart[] = [];
+  let position = 0;
+  for (const { start, end } of result.matches) {
+    if (start > position) {
+      parts.push({ text: chars.slice(position, start).join(''), match: false });
+    }
+    parts.push({ text: chars.slice(start, end).join(''), match: true });
+    position = end;
+  }
+  if (position < chars.length) {
+    parts.push({ text: chars.slice(position).join(''), match: false });
+  }
+  return parts;
+}
+
+export const searchService = {
+  async search(q: string, params: SearchParams = {}): Promise<SearchResponse> {
+    const response = await api.get<SearchResponse>('/search', {
+      params: { q, ...params },
+      // FastAPI reads repeated keys for lists: types=transactions&types=notes
+      paramsSerializer: { indexes: null },
+    });
+    return response.data;
+  },
+};
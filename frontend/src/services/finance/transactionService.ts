@@ -38,6 +38,45 @@ export interface TransactionUpdate {
   notes?: string;
 }
 
+export interface TransactionPage {
+  items: Transaction[];
+  nextCursor: string | null;
+}
+
+export type SeriesGranularity = 'day' | 'week' | 'month' | 'year';
+
+export interface TransactionSeriesPoint {
+  bucket: string;
+  income: number;
+  expense: number;
+  net: number;
+}
+
+export interface TransactionSuggestion {
+  description: string;
+  category_id: string;
+  property_id: string;
+  amount: number;
+  last_used: string;
+  uses: number;
+}
+
+export interface TransactionTagFacet {
+  tag: string;
+  count: number;
+  total: number;
+  income: number;
+  expense: number;
+}
+
+export interface TransactionTagFilters {
+  tags_any?: string[];
+  tags_all?: string[];
+}
+
+// Repeat array params (tags_any=a&tags_any=b) as FastAPI expects, instead of tags_any[]=a
+const paramsSerializer = { indexes: null };
+
 export const transactionService = {
   async getAll(params?: {
     start_date?: string;
@@ -45,8 +84,49 @@ export const transactionService = {
     category_id?: string;
     limit?: number;
     offset?: number;
-  }): Promise<Transaction[]> {
-    const response = await api.get<Transaction[]>('/transactions', { params });
+  } & TransactionTagFilters): Promise<Transaction[]> {
+    const response = await api.get<Transaction[]>('/transactions', { params, paramsSerializer });
+    return response.data;
+  },
+
+  async getPage(params: {
+    start_date?: string;
+    end_date?: string;
+    category_id?: string;
+    limit: number;
+    cursor?: string;
+  } & TransactionTagFilters): Promise<TransactionPage> {
+    const response = await api.get<Transaction[]>('/transactions', { params, paramsSerializer });
+    return {
+      items: response.data,
+      nextCursor: response.headers['x-next-cursor'] ?? null,
+    };
+  },
+
+  async getSeries(params: {
+    start_date: string;
+    end_date: string;
+    granularity?: SeriesGranularity;
+    property_id?: string;
+    category_id?: string;
+  }): Promise<TransactionSeriesPoint[]> {
+    const response = await api.get<TransactionSeriesPoint[]>('/transactions/series', { params });
+    return response.data;
+  },
+
+  async getTagFacets(params?: {
+    start_date?: string;
+    end_date?: string;
+    category_id?: string;
+  } & TransactionTagFilters): Promise<TransactionTagFacet[]> {
+    const response = await api.get<TransactionTagFacet[]>('/transactions/tags', { params, paramsSerializer });
+    return response.data;
+  },
+
+  async suggest(prefix: string, limit?: number): Promise<TransactionSuggestion[]> {
+    const response = await api.get<TransactionSuggestion[]>('/transactions/suggest', {
+      params: { prefix, limit },
+    });
     return response.data;
   },
 